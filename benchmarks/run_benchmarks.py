@@ -0,0 +1,310 @@
+"""
+Benchmark big-tool subsystems on synthetic archives.
+
+Usage:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --scale 4 --save baseline.json
+    python benchmarks/run_benchmarks.py --compare baseline.json
+
+Each benchmark reports the best wall time of several runs, throughput in
+MB/s and entries/s, and the peak traced Python memory of one extra run.
+With ``--compare``, benchmarks slower than the baseline by more than
+``--tolerance`` are reported and the exit code is 1.
+"""
+
+import argparse
+import json
+import logging
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable
+
+from big_tool.analysis.hash_cracker import crack_hashes, expand_template
+from big_tool.analysis.search import SearchOptions, search_path
+from big_tool.big_archive.archive_stats import inspect_archive
+from big_tool.big_archive.big_extractor import ArchiveExtractor, unpack_directory
+from big_tool.big_archive.big_format import BigArchive
+from big_tool.big_archive.big_writer import repack_archive
+from big_tool.big_archive.file_types import SIGNATURE_TABLE, detect_signature
+from big_tool.big_archive.package_index import EntryQuery, PackageIndex
+from big_tool.big_archive.synthetic import build_model, build_string_pack, generate_package
+from big_tool.logger import logger
+from big_tool.models.converter import convert_single_bin
+from big_tool.resources.string_extractor import ResourceStringExtractor
+
+
+@dataclass(frozen=True)
+class Workload:
+    """Amount of data handled by one benchmark run."""
+
+    byte_count: int
+    entry_count: int
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    """Measurements of one benchmark."""
+
+    name: str
+    seconds: float
+    mb_per_second: float
+    entries_per_second: float
+    peak_memory_kib: float
+
+
+class BenchmarkData:
+    """Synthetic inputs shared by all benchmarks."""
+
+    def __init__(self, root: Path, scale: int):
+        self.root = root
+        self.package_dir = root / "package"
+        self.output_dir = root / "package_out"
+        self.archives = generate_package(
+            self.package_dir,
+            archive_count=4,
+            entries_per_archive=500 * scale,
+            payload_size=4096,
+        )
+        self.archive_bytes = sum(path.stat().st_size for path in self.archives)
+        self.entry_count = 0
+        for archive_path in self.archives:
+            with BigArchive(archive_path) as archive:
+                self.entry_count += len(archive.parse().entries)
+
+        unpack_directory(self.package_dir, self.output_dir, assume_yes=True)
+        self.output_files = [path for path in self.output_dir.rglob("*") if path.is_file()]
+        self.output_bytes = sum(path.stat().st_size for path in self.output_files)
+
+        rng = random.Random(0)
+        self.string_packs: list[Path] = []
+        self.models: list[Path] = []
+        for number in range(20 * scale):
+            strings = [f"Localized text {number}-{item} {rng.random():.8f}" for item in range(800)]
+            string_path = root / "strings" / f"pack_{number}.bin"
+            string_path.parent.mkdir(parents=True, exist_ok=True)
+            string_path.write_bytes(build_string_pack(strings))
+            self.string_packs.append(string_path)
+
+            model_path = root / "models" / f"model_{number}.bin"
+            model_path.parent.mkdir(parents=True, exist_ok=True)
+            model_path.write_bytes(build_model(rng, vertex_count=400, index_count=600, frame_count=10))
+            self.models.append(model_path)
+
+
+def bench_parse(data: BenchmarkData) -> Workload:
+    toc_bytes = 0
+    for archive_path in data.archives:
+        with BigArchive(archive_path) as archive:
+            archive.parse()
+            toc_bytes += len(archive.entries) * BigArchive.ENTRY_SIZE
+    return Workload(toc_bytes, data.entry_count)
+
+
+def bench_inspect(data: BenchmarkData) -> Workload:
+    for archive_path in data.archives:
+        inspect_archive(archive_path)
+    return Workload(data.archive_bytes, data.entry_count)
+
+
+def bench_extract_all(data: BenchmarkData) -> Workload:
+    archive_path = data.archives[0]
+    with BigArchive(archive_path) as archive:
+        extractor = ArchiveExtractor(archive, data.root / "extract_all")
+        result = extractor.extract_all()
+    return Workload(archive_path.stat().st_size, result.extracted_count)
+
+
+def bench_detect_types(data: BenchmarkData) -> Workload:
+    for archive_path in data.archives:
+        with BigArchive(archive_path, use_mmap=True) as archive:
+            archive.parse()
+            for entry in archive.entries:
+                header = archive.read_entry_header(entry)
+                if not header.is_ref:
+                    detect_signature(archive.peek_entry(entry, SIGNATURE_TABLE.head_size))
+    return Workload(data.archive_bytes, data.entry_count)
+
+
+def bench_unpack_directory(data: BenchmarkData) -> Workload:
+    unpack_directory(data.package_dir, data.root / "unpack_directory", assume_yes=True)
+    return Workload(data.archive_bytes, data.entry_count)
+
+
+def bench_repack(data: BenchmarkData) -> Workload:
+    archive_path = data.archives[0]
+    replacements: dict[int, bytes] = {}
+    for index in range(0, data.entry_count // len(data.archives), 100):
+        replacements[index] = bytes(4096)
+    repack_archive(archive_path, data.root / "repacked.big", replacements)
+    return Workload(archive_path.stat().st_size, len(replacements))
+
+
+def bench_index(data: BenchmarkData) -> Workload:
+    index_path = data.root / "index.sqlite"
+    index_path.unlink(missing_ok=True)
+    with PackageIndex(index_path) as index:
+        index.update(data.package_dir)
+        index.query(EntryQuery(group_hash=0xB7178678, min_size=4096))
+    return Workload(data.archive_bytes, data.entry_count)
+
+
+def bench_search_path(data: BenchmarkData) -> Workload:
+    search_path(data.output_dir, SearchOptions("0x89504E47"))
+    return Workload(data.output_bytes, len(data.output_files))
+
+
+def bench_search_multi(data: BenchmarkData) -> Workload:
+    values: list[str] = []
+    for number in range(50):
+        values.append(str(0x10000 + number * 7919))
+    search_path(data.output_dir, SearchOptions(values, both_endian=True))
+    return Workload(data.output_bytes, len(data.output_files))
+
+
+def bench_search_typed(data: BenchmarkData) -> Workload:
+    options = SearchOptions("1.0", value_type="float32", tolerance=0.01, both_endian=True, alignment=4)
+    search_path(data.output_dir, options)
+    return Workload(data.output_bytes, len(data.output_files))
+
+
+def bench_crack_hashes(data: BenchmarkData) -> Workload:
+    words: list[str] = []
+    for number in range(2000):
+        words.append(f"resource_{number * 7919 % 100003:05x}")
+    pieces = expand_template("{word}/{word}.bin", {"word": words})
+    targets: set[int] = set()
+    for archive_path in data.archives:
+        with BigArchive(archive_path, use_mmap=True) as archive:
+            archive.parse()
+            targets.update(archive.entries.group_hashes)
+    crack_hashes([pieces], targets)
+    return Workload(0, len(words) ** 2)
+
+
+def bench_string_extract(data: BenchmarkData) -> Workload:
+    byte_count = 0
+    string_count = 0
+    for path in data.string_packs:
+        string_count += len(ResourceStringExtractor(path).extract())
+        byte_count += path.stat().st_size
+    return Workload(byte_count, string_count)
+
+
+def bench_convert_single_bin(data: BenchmarkData) -> Workload:
+    byte_count = 0
+    for path in data.models:
+        convert_single_bin(path, data.root / "converted" / path.stem)
+        byte_count += path.stat().st_size
+    return Workload(byte_count, len(data.models))
+
+
+BENCHMARKS: dict[str, Callable[[BenchmarkData], Workload]] = {
+    "parse": bench_parse,
+    "inspect": bench_inspect,
+    "extract_all": bench_extract_all,
+    "detect_types": bench_detect_types,
+    "unpack_directory": bench_unpack_directory,
+    "repack": bench_repack,
+    "index": bench_index,
+    "search_path": bench_search_path,
+    "search_multi": bench_search_multi,
+    "search_typed": bench_search_typed,
+    "crack_hashes": bench_crack_hashes,
+    "string_extract": bench_string_extract,
+    "convert_single_bin": bench_convert_single_bin,
+}
+
+
+def run_benchmark(name: str, data: BenchmarkData, repeat: int) -> BenchmarkResult:
+    """Time one benchmark and measure its peak traced memory."""
+    benchmark = BENCHMARKS[name]
+    best_seconds = float("inf")
+    workload = Workload(0, 0)
+    for _ in range(repeat):
+        start = time.perf_counter()
+        workload = benchmark(data)
+        best_seconds = min(best_seconds, time.perf_counter() - start)
+
+    tracemalloc.start()
+    benchmark(data)
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return BenchmarkResult(
+        name,
+        best_seconds,
+        workload.byte_count / best_seconds / (1024 * 1024),
+        workload.entry_count / best_seconds,
+        peak / 1024,
+    )
+
+
+def compare_results(
+    results: list[BenchmarkResult],
+    baseline: dict[str, dict[str, float]],
+    tolerance: float,
+) -> list[str]:
+    """Return the names of benchmarks that are slower than the baseline."""
+    regressions: list[str] = []
+    for result in results:
+        previous = baseline.get(result.name)
+        if previous is None:
+            continue
+
+        ratio = result.seconds / previous["seconds"]
+        marker = ""
+        if ratio > 1 + tolerance:
+            marker = "  REGRESSION"
+            regressions.append(result.name)
+        print(f"{result.name:<20} {ratio:>6.2f}x baseline time{marker}")
+    return regressions
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark big-tool on synthetic archives")
+    parser.add_argument("--scale", type=int, default=1, help="Multiply the synthetic data size")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", choices=sorted(BENCHMARKS), action="append")
+    parser.add_argument("--save", type=Path, help="Write results to a JSON baseline")
+    parser.add_argument("--compare", type=Path, help="Compare against a JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    logger.setLevel(logging.WARNING)
+
+    names = args.only or list(BENCHMARKS)
+    results: list[BenchmarkResult] = []
+    with tempfile.TemporaryDirectory(prefix="big-tool-bench-") as temp_dir:
+        data = BenchmarkData(Path(temp_dir), args.scale)
+        print(f"{'benchmark':<20} {'seconds':>9} {'MB/s':>9} {'entries/s':>11} {'peak KiB':>10}")
+        for name in names:
+            result = run_benchmark(name, data, args.repeat)
+            results.append(result)
+            print(
+                f"{result.name:<20} {result.seconds:>9.4f} {result.mb_per_second:>9.1f} "
+                f"{result.entries_per_second:>11.0f} {result.peak_memory_kib:>10.0f}"
+            )
+
+    if args.save is not None:
+        payload = {"scale": args.scale, "results": {result.name: asdict(result) for result in results}}
+        args.save.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        if baseline.get("scale") != args.scale:
+            print(f"Warning: baseline scale {baseline.get('scale')} differs from {args.scale}")
+        if compare_results(results, baseline["results"], args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,20 @@
 """Binary analysis and search tools."""
 
-from big_tool.analysis.hashing import cstring_to_key
-from big_tool.analysis.search import SearchOptions, SearchResult, search_path
+from big_tool.analysis.archive_search import ArchiveSearchOptions, clear_search_cache, search_archives
+from big_tool.analysis.hash_cracker import crack_hashes, expand_template
+from big_tool.analysis.hashing import cstring_to_key, cstring_to_keys
+from big_tool.analysis.search import SearchOptions, SearchResult, iter_search, search_path
 
-__all__ = ["SearchOptions", "SearchResult", "cstring_to_key", "search_path"]
+__all__ = [
+    "ArchiveSearchOptions",
+    "SearchOptions",
+    "SearchResult",
+    "clear_search_cache",
+    "crack_hashes",
+    "cstring_to_key",
+    "cstring_to_keys",
+    "expand_template",
+    "iter_search",
+    "search_archives",
+    "search_path",
+]
@@ -0,0 +1,291 @@
+"""Binary search inside BIG archives without extracting them."""
+
+import hashlib
+import os
+import re
+import shutil
+import zlib
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from big_tool.analysis.search import (
+    SearchOptions,
+    SearchPlan,
+    build_search_plan,
+    check_filters,
+    rank_results,
+    size_in_range,
+)
+from big_tool.big_archive.big_extractor import find_archives
+from big_tool.big_archive.big_format import ArchiveEntry, BigArchive, BigArchiveError, ResourceHeader
+from big_tool.big_archive.file_types import detect_entry_type
+from big_tool.logger import logger
+
+
+# Per-archive cache directories are named ``<stem>_<16 hex digits>``.
+_CACHE_DIR_PATTERN = re.compile(r".+_[0-9a-f]{16}")
+
+
+@dataclass(frozen=True)
+class ArchiveSearchOptions:
+    """
+    Entry filters and cache settings for searching inside archives.
+
+    Empty ``group_hashes`` or ``resource_types`` match every entry. Both
+    filters are checked before a payload is decompressed. ``cache_dir``
+    keeps decompressed payloads on disk for later searches; cached payloads
+    of older versions of an archive are deleted when it is searched again.
+    """
+
+    group_hashes: frozenset[int] = frozenset()
+    resource_types: frozenset[str] = frozenset()
+    cache_dir: Path | None = None
+
+
+@dataclass(frozen=True)
+class ArchiveSearchResult:
+    """Search results for one archive entry; offsets are within the decompressed resource."""
+
+    archive: Path
+    index: int
+    group_hash: int
+    resource_type: str
+    offsets: tuple[int, ...]
+    score: int
+    patterns: tuple[bytes, ...] = ()
+
+
+def search_archives(
+    root: Path,
+    options: SearchOptions,
+    archive_options: ArchiveSearchOptions = ArchiveSearchOptions(),
+    jobs: int = 1,
+) -> list[ArchiveSearchResult]:
+    """Search one archive or every archive in a package; fuzzy results are ranked."""
+    results = iter_archive_search(root, options, archive_options, jobs)
+    if options.mode != "fuzzy":
+        return list(results)
+    return rank_results(results, options.max_results)
+
+
+def iter_archive_search(
+    root: Path,
+    options: SearchOptions,
+    archive_options: ArchiveSearchOptions = ArchiveSearchOptions(),
+    jobs: int = 1,
+) -> Iterator[ArchiveSearchResult]:
+    """
+    Yield matching entries of one archive or of every archive in a package.
+
+    Size filters apply to the original resource size. With ``jobs`` greater
+    than one, archives are searched in worker processes and results keep
+    archive order. In exact mode the search stops after ``max_results``
+    results.
+    """
+    root = Path(root).resolve()
+    if options.mode not in {"exact", "fuzzy"}:
+        raise ValueError(f"Unsupported search mode: {options.mode}")
+    if jobs < 1:
+        raise ValueError(f"Invalid job count: {jobs}")
+    if root.is_file():
+        archives = [root]
+    else:
+        archives = find_archives(root)
+
+    plan = build_search_plan(options)
+    limit = options.max_results if options.mode == "exact" else None
+    if limit is not None and limit < 1:
+        return
+
+    count = 0
+    if jobs == 1 or len(archives) == 1:
+        for archive_path in archives:
+            for result in _iter_archive(archive_path, plan, options, archive_options):
+                yield result
+                count += 1
+                if count == limit:
+                    return
+        return
+
+    executor = ProcessPoolExecutor(max_workers=min(jobs, len(archives)))
+    try:
+        futures = []
+        for archive_path in archives:
+            futures.append(executor.submit(_search_archive, archive_path, plan, options, archive_options))
+        for future in futures:
+            for result in future.result():
+                yield result
+                count += 1
+                if count == limit:
+                    return
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _search_archive(
+    archive_path: Path,
+    plan: SearchPlan,
+    options: SearchOptions,
+    archive_options: ArchiveSearchOptions,
+) -> list[ArchiveSearchResult]:
+    """Search one archive in a worker process."""
+    return list(_iter_archive(archive_path, plan, options, archive_options))
+
+
+def _iter_archive(
+    archive_path: Path,
+    plan: SearchPlan,
+    options: SearchOptions,
+    archive_options: ArchiveSearchOptions,
+) -> Iterator[ArchiveSearchResult]:
+    try:
+        cache_dir = None
+        if archive_options.cache_dir is not None:
+            cache_dir = _archive_cache_dir(Path(archive_options.cache_dir), archive_path)
+            _remove_stale_versions(cache_dir)
+        with BigArchive(archive_path, use_mmap=True) as archive:
+            archive.parse()
+            for entry in archive.entries:
+                result = _search_entry(archive, entry, plan, options, archive_options, cache_dir)
+                if result is not None:
+                    yield result
+    except (OSError, ValueError, BigArchiveError) as error:
+        logger.error(f"Failed to search {archive_path.name}: {error}")
+
+
+def _search_entry(
+    archive: BigArchive,
+    entry: ArchiveEntry,
+    plan: SearchPlan,
+    options: SearchOptions,
+    archive_options: ArchiveSearchOptions,
+    cache_dir: Path | None,
+) -> ArchiveSearchResult | None:
+    """Search one entry, checking every filter that needs no decompression first."""
+    if archive_options.group_hashes and entry.group_hash not in archive_options.group_hashes:
+        return None
+    try:
+        header = archive.read_entry_header(entry)
+    except ValueError as error:
+        logger.debug(f"Skipping entry {entry.index} of {archive.filepath.name}: {error}")
+        return None
+    if header.is_ref:
+        return None
+    if options.mode == "exact" and not size_in_range(header.original_size, options):
+        return None
+
+    resource_type = detect_entry_type(archive, entry, header)
+    if archive_options.resource_types and resource_type not in archive_options.resource_types:
+        return None
+
+    try:
+        if options.mode == "exact" and options.start_offset is not None:
+            end = options.start_offset + plan.width
+            head = _entry_head(archive, entry, header, end)[options.start_offset:]
+            matches = plan.match_at(head, options.start_offset)
+        else:
+            payload = _entry_payload(archive, entry, header, cache_dir)
+            first_only = options.first_match and options.start_offset is None
+            matches = plan.find(payload, first_only)
+    except zlib.error as error:
+        logger.warning(f"Cannot decompress entry {entry.index} of {archive.filepath.name}: {error}")
+        return None
+    if not matches:
+        return None
+
+    offsets: list[int] = []
+    matched_patterns: list[bytes] = []
+    for offset, pattern in matches:
+        offsets.append(offset)
+        matched_patterns.append(pattern)
+
+    exact_match, score = check_filters(header.original_size, offsets, options)
+    if options.mode == "exact" and not exact_match:
+        return None
+    if options.first_match:
+        del offsets[1:]
+        del matched_patterns[1:]
+    return ArchiveSearchResult(
+        archive.filepath,
+        entry.index,
+        entry.group_hash,
+        resource_type,
+        tuple(offsets),
+        score,
+        tuple(matched_patterns),
+    )
+
+
+def _entry_payload(
+    archive: BigArchive,
+    entry: ArchiveEntry,
+    header: ResourceHeader,
+    cache_dir: Path | None,
+) -> bytes | memoryview:
+    """Return the decompressed payload; stored payloads are a view of the mapping."""
+    start = entry.offset + header.data_offset
+    if not header.is_compressed:
+        return archive.read_range(start, header.original_size)
+
+    cache_path = None
+    if cache_dir is not None:
+        cache_path = cache_dir / f"{entry.offset:x}.bin"
+        try:
+            if cache_path.stat().st_size == header.original_size:
+                return cache_path.read_bytes()
+        except FileNotFoundError:
+            pass
+
+    payload = zlib.decompress(archive.read_range(start, header.compressed_size))
+    if cache_path is not None:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        temp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        temp_path.write_bytes(payload)
+        os.replace(temp_path, cache_path)
+    return payload
+
+
+def _entry_head(archive: BigArchive, entry: ArchiveEntry, header: ResourceHeader, size: int) -> bytes | memoryview:
+    """Return the first ``size`` payload bytes, decompressing no further than needed."""
+    start = entry.offset + header.data_offset
+    if not header.is_compressed:
+        return archive.read_range(start, min(size, header.original_size))
+
+    return zlib.decompressobj().decompress(archive.read_range(start, header.compressed_size), size)
+
+
+def clear_search_cache(cache_root: Path) -> int:
+    """Delete the cached payloads of every archive under ``cache_root`` and return the freed bytes."""
+    cache_root = Path(cache_root)
+    if not cache_root.is_dir():
+        return 0
+
+    freed = 0
+    for archive_dir in cache_root.iterdir():
+        if not archive_dir.is_dir() or not _CACHE_DIR_PATTERN.fullmatch(archive_dir.name):
+            continue
+        for path in archive_dir.rglob("*"):
+            if path.is_file():
+                freed += path.stat().st_size
+        shutil.rmtree(archive_dir)
+    logger.info(f"Cleared {freed} bytes of cached payloads from {cache_root}")
+    return freed
+
+
+def _archive_cache_dir(cache_root: Path, archive_path: Path) -> Path:
+    """Return the cache directory of one version of an archive, inside the directory of its path."""
+    stat = archive_path.stat()
+    digest = hashlib.blake2b(str(archive_path.resolve()).encode("utf-8"), digest_size=8).hexdigest()
+    return cache_root / f"{archive_path.stem}_{digest}" / f"{stat.st_size}_{stat.st_mtime_ns}"
+
+
+def _remove_stale_versions(cache_dir: Path) -> None:
+    """Delete the cached payloads of other versions of the same archive."""
+    if not cache_dir.parent.is_dir():
+        return
+    for version_dir in cache_dir.parent.iterdir():
+        if version_dir != cache_dir:
+            logger.debug(f"Removing stale search cache {version_dir}")
+            shutil.rmtree(version_dir, ignore_errors=True)
@@ -0,0 +1,306 @@
+"""
+Recover resource names from the hashes in a package.
+
+Candidate names are expanded from templates such as ``ui/{word}_{n}.png``,
+where each ``{name}`` placeholder takes every entry of a word list. The
+hash is linear (see ``big_tool.analysis.hashing``), so the partial keys of
+the largest part are computed once, and each combination of the other parts
+XORs one constant into all of them with a single big-integer operation.
+Matching keys are then found with a set intersection.
+"""
+
+import json
+import os
+import string
+import sys
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import product
+from pathlib import Path
+
+from big_tool.analysis.hashing import partial_key, partial_keys, rotate_key
+from big_tool.big_archive.big_extractor import find_archives
+from big_tool.big_archive.big_format import BigArchive, BigArchiveError
+from big_tool.logger import logger
+from big_tool.typed_arrays import UINT32
+
+
+DICTIONARY_FILE_NAME = "big_tool_hashes.json"
+DICTIONARY_VERSION = 1
+SLOT_CHUNK_SIZE = 1 << 16
+UNITS_PER_JOB = 4
+
+Pieces = tuple[tuple[str, ...], ...]
+
+
+@dataclass(frozen=True)
+class CrackUnit:
+    """
+    One share of the candidates of a template.
+
+    ``pieces`` lists the choices for each part of a name; the choices of
+    part ``slot`` are hashed together.
+    """
+
+    pieces: Pieces
+    slot: int
+    ignore_case: bool = False
+
+    @property
+    def candidate_count(self) -> int:
+        count = 1
+        for piece in self.pieces:
+            count *= len(piece)
+        return count
+
+
+class _SlotGroup:
+    """Slot choices of one length, with their partial keys packed into one integer."""
+
+    def __init__(self, length: int, words: list[str], keys: list[int]):
+        self.length = length
+        self.count = len(words)
+        self.keys = keys
+        self.words_by_key: dict[int, list[str]] = {}
+        for word, key in zip(words, keys):
+            self.words_by_key.setdefault(key, []).append(word)
+        self.ones = _pack_keys([1] * self.count)
+        self._packed: dict[int, int] = {}
+
+    def matches(self, constant: int, suffix_length: int, targets: frozenset[int]) -> Iterator[tuple[int, str]]:
+        """Yield ``(key, word)`` for each word whose rotated key XOR ``constant`` is a target."""
+        rotation = suffix_length % 8
+        packed = self._packed.get(rotation)
+        if packed is None:
+            rotated: list[int] = []
+            for key in self.keys:
+                rotated.append(rotate_key(key, rotation))
+            packed = self._packed[rotation] = _pack_keys(rotated)
+
+        keys = array(UINT32)
+        keys.frombytes((packed ^ constant * self.ones).to_bytes(4 * self.count, sys.byteorder))
+        for key in targets.intersection(keys):
+            for word in self.words_by_key[rotate_key(key ^ constant, -rotation)]:
+                yield key, word
+
+
+def expand_template(template: str, word_lists: dict[str, Sequence[str]]) -> Pieces:
+    """
+    Split a template into the choices for each part of a name.
+
+    Literal text is a part with one choice. Braces are escaped by doubling
+    them, as in ``str.format``.
+    """
+    pieces: list[tuple[str, ...]] = []
+    for literal, field_name, _format_spec, _conversion in string.Formatter().parse(template):
+        if literal:
+            pieces.append((literal,))
+        if field_name is None:
+            continue
+        if field_name not in word_lists:
+            raise ValueError(f"Unknown word list in template {template!r}: {field_name}")
+        words = tuple(dict.fromkeys(word_lists[field_name]))
+        if not words:
+            raise ValueError(f"Word list is empty: {field_name}")
+        pieces.append(words)
+    if not pieces:
+        pieces.append(("",))
+    return tuple(pieces)
+
+
+def read_word_list(path: Path) -> list[str]:
+    """Read one word per line, skipping blank lines."""
+    words: list[str] = []
+    with Path(path).open(encoding="utf-8") as file:
+        for line in file:
+            word = line.strip()
+            if word:
+                words.append(word)
+    return words
+
+
+def package_hashes(root: Path) -> set[int]:
+    """Return the group hashes in the TOC of one archive or of every archive in a package."""
+    root = Path(root).resolve()
+    archives = [root] if root.is_file() else find_archives(root)
+    hashes: set[int] = set()
+    for archive_path in archives:
+        try:
+            with BigArchive(archive_path, use_mmap=True) as archive:
+                archive.parse()
+                hashes.update(archive.entries.group_hashes)
+        except (OSError, ValueError, BigArchiveError) as error:
+            logger.error(f"Failed to read {archive_path.name}: {error}")
+    return hashes
+
+
+def crack_hashes(
+    templates: Sequence[Pieces],
+    targets: Iterable[int],
+    ignore_case: bool = False,
+    jobs: int = 1,
+) -> dict[int, set[str]]:
+    """
+    Return the candidate names whose hash is one of ``targets``.
+
+    ``templates`` come from ``expand_template``. With ``jobs`` greater than
+    one, the candidates are split into units that worker processes hash.
+    """
+    if jobs < 1:
+        raise ValueError(f"Invalid job count: {jobs}")
+    target_set = frozenset(targets)
+    found: dict[int, set[str]] = {}
+    if not target_set:
+        return found
+
+    units: list[CrackUnit] = []
+    for pieces in templates:
+        units.extend(split_units(pieces, ignore_case, jobs))
+    candidate_count = 0
+    for unit in units:
+        candidate_count += unit.candidate_count
+
+    if jobs == 1 or len(units) == 1:
+        for unit in units:
+            _add_matches(found, crack_unit(unit, target_set))
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(units))) as executor:
+            futures = []
+            for unit in units:
+                futures.append(executor.submit(crack_unit, unit, target_set))
+            for future in futures:
+                _add_matches(found, future.result())
+
+    logger.info(f"Tried {candidate_count} candidates against {len(target_set)} hashes, matched {len(found)}")
+    return found
+
+
+def split_units(pieces: Pieces, ignore_case: bool = False, jobs: int = 1) -> list[CrackUnit]:
+    """
+    Split the candidates of a template into work units.
+
+    The part with the most choices becomes the slot and is cut into chunks
+    of at most ``SLOT_CHUNK_SIZE`` choices. If that leaves too few units for
+    ``jobs`` workers, the next largest part is cut as well.
+    """
+    sizes: list[int] = []
+    for piece in pieces:
+        sizes.append(len(piece))
+    slot = sizes.index(max(sizes))
+    slot_chunks = _chunks(pieces[slot], SLOT_CHUNK_SIZE)
+
+    other = None
+    other_chunks = [()]
+    wanted = jobs * UNITS_PER_JOB if jobs > 1 else 1
+    sizes[slot] = 0
+    if len(slot_chunks) < wanted and max(sizes) > 1:
+        other = sizes.index(max(sizes))
+        part_count = min(sizes[other], -(-wanted // len(slot_chunks)))
+        other_chunks = _chunks(pieces[other], -(-sizes[other] // part_count))
+
+    units: list[CrackUnit] = []
+    for slot_chunk in slot_chunks:
+        for other_chunk in other_chunks:
+            unit_pieces = list(pieces)
+            unit_pieces[slot] = slot_chunk
+            if other is not None:
+                unit_pieces[other] = other_chunk
+            units.append(CrackUnit(tuple(unit_pieces), slot, ignore_case))
+    return units
+
+
+def crack_unit(unit: CrackUnit, targets: frozenset[int]) -> list[tuple[int, str]]:
+    """Return ``(hash, name)`` for every candidate of one unit whose hash is a target."""
+    slot_words = unit.pieces[unit.slot]
+    slot_keys = partial_keys(slot_words, unit.ignore_case)
+    words_by_length: dict[int, list[str]] = {}
+    keys_by_length: dict[int, list[int]] = {}
+    for word, key in zip(slot_words, slot_keys):
+        words_by_length.setdefault(len(word), []).append(word)
+        keys_by_length.setdefault(len(word), []).append(key)
+    groups: list[_SlotGroup] = []
+    for length, words in words_by_length.items():
+        groups.append(_SlotGroup(length, words, keys_by_length[length]))
+
+    suffixes = _joined_parts(unit.pieces[unit.slot + 1:])
+    suffix_keys = partial_keys(suffixes, unit.ignore_case)
+    matches: list[tuple[int, str]] = []
+    for prefix in _joined_parts(unit.pieces[:unit.slot]):
+        prefix_key = partial_key(prefix, unit.ignore_case)
+        for suffix, suffix_key in zip(suffixes, suffix_keys):
+            for group in groups:
+                length = len(prefix) + group.length + len(suffix)
+                constant = rotate_key(length, length)
+                constant ^= rotate_key(prefix_key, group.length + len(suffix))
+                constant ^= suffix_key
+                for key, word in group.matches(constant, len(suffix), targets):
+                    matches.append((key, prefix + word + suffix))
+    return matches
+
+
+def default_dictionary_path(root: Path) -> Path:
+    """
+    Return the default hash dictionary location for a package directory or archive.
+
+    The dictionary goes to the ``<input>_out`` sibling of the package
+    directory (the directory of an archive), so the input stays unchanged.
+    """
+    root = Path(root).resolve()
+    if root.is_file():
+        root = root.parent
+    return root.with_name(f"{root.name}_out") / DICTIONARY_FILE_NAME
+
+
+def load_dictionary(path: Path) -> dict[int, set[str]]:
+    """Read a hash dictionary; a missing file is an empty dictionary."""
+    path = Path(path)
+    if not path.is_file():
+        return {}
+
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if data.get("version") != DICTIONARY_VERSION:
+        raise ValueError(f"Unsupported hash dictionary version in {path}: {data.get('version')}")
+    dictionary: dict[int, set[str]] = {}
+    for hash_text, names in data["hashes"].items():
+        dictionary[int(hash_text, 16)] = set(names)
+    return dictionary
+
+
+def save_dictionary(path: Path, dictionary: dict[int, set[str]]) -> Path:
+    """Write a hash dictionary atomically, with hashes and names sorted."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    hashes: dict[str, list[str]] = {}
+    for key in sorted(dictionary):
+        hashes[f"0x{key:08x}"] = sorted(dictionary[key])
+    data = {"version": DICTIONARY_VERSION, "hashes": hashes}
+    temp_path = path.with_name(f"{path.name}.tmp")
+    temp_path.write_text(json.dumps(data, indent=1, ensure_ascii=False), encoding="utf-8")
+    os.replace(temp_path, path)
+    return path
+
+
+def _joined_parts(pieces: Pieces) -> list[str]:
+    joined: list[str] = []
+    for parts in product(*pieces):
+        joined.append("".join(parts))
+    return joined
+
+
+def _chunks(words: tuple[str, ...], size: int) -> list[tuple[str, ...]]:
+    chunks: list[tuple[str, ...]] = []
+    for start in range(0, len(words), size):
+        chunks.append(words[start:start + size])
+    return chunks
+
+
+def _pack_keys(keys: list[int]) -> int:
+    """Pack 32-bit keys into one integer, one key per native four-byte slot."""
+    return int.from_bytes(array(UINT32, keys).tobytes(), sys.byteorder)
+
+
+def _add_matches(found: dict[int, set[str]], matches: list[tuple[int, str]]) -> None:
+    for key, name in matches:
+        found.setdefault(key, set()).add(name)
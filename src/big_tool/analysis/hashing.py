@@ -1,4 +1,31 @@
-"""Hashing for game resource names."""
+"""
+Hashing for game resource names.
+
+The hash starts from the string length and, for each character, rotates the
+state left by four bits and XORs in the sign-extended character. Rotation
+and XOR are both linear, so the hash of a concatenation can be combined
+from the partial keys of its parts:
+
+    partial_key(a + b) == rotate_key(partial_key(a), len(b)) ^ partial_key(b)
+    cstring_to_key(s) == partial_key(s) ^ rotate_key(len(s), len(s))
+
+A rotation by 32 bits is the identity, so every character only needs the
+position of its byte modulo eight.
+"""
+
+import string
+import sys
+from array import array
+from collections.abc import Sequence
+
+from big_tool.typed_arrays import UINT32
+
+
+KEY_MASK = 0xFFFFFFFF
+_LOWER_TABLE = bytes.maketrans(string.ascii_uppercase.encode("ascii"), string.ascii_lowercase.encode("ascii"))
+# Bytes of 0x80 and above are sign-extended: c | 0xFFFFFF00 == (c ^ 0xFF) ^ KEY_MASK.
+_HIGH_TABLE = bytes(0 if byte < 0x80 else 1 for byte in range(256))
+_SIGN_TABLE = bytes(byte if byte < 0x80 else byte ^ 0xFF for byte in range(256))
 
 
 def cstring_to_key(value: str, ignore_case: bool = False) -> int:
@@ -17,3 +44,85 @@ def cstring_to_key(value: str, ignore_case: bool = False) -> int:
         current_hash = (rotated ^ char_value) & 0xFFFFFFFF
 
     return current_hash
+
+
+def rotate_key(key: int, length: int) -> int:
+    """Return ``key`` rotated as if ``length`` more characters were hashed; negative lengths rotate back."""
+    shift = (4 * length) & 31
+    return ((key << shift) | (key >> (32 - shift))) & KEY_MASK
+
+
+def partial_key(value: str, ignore_case: bool = False) -> int:
+    """Return the hash of ``value`` without its length seed."""
+    return cstring_to_key(value, ignore_case) ^ rotate_key(len(value), len(value))
+
+
+def cstring_to_keys(values: Sequence[str], ignore_case: bool = False) -> list[int]:
+    """Return ``cstring_to_key`` of many strings, in order."""
+    keys = partial_keys(values, ignore_case)
+    for index, value in enumerate(values):
+        keys[index] ^= rotate_key(len(value), len(value))
+    return keys
+
+
+def partial_keys(values: Sequence[str], ignore_case: bool = False) -> list[int]:
+    """
+    Return ``partial_key`` of many strings, in order.
+
+    Strings of the same length are hashed together: their bytes are laid
+    out one string after another, so each character position is a strided
+    column that big-integer XORs combine for all strings at once.
+    """
+    by_length: dict[int, list[int]] = {}
+    for index, value in enumerate(values):
+        by_length.setdefault(len(value), []).append(index)
+
+    keys = [0] * len(values)
+    for length, indexes in by_length.items():
+        group: list[str] = []
+        for index in indexes:
+            group.append(values[index])
+        for index, key in zip(indexes, _same_length_keys(group, length, ignore_case)):
+            keys[index] = key
+    return keys
+
+
+def _same_length_keys(values: list[str], length: int, ignore_case: bool) -> array:
+    count = len(values)
+    if length == 0:
+        return array(UINT32, bytes(4 * count))
+
+    # The low byte of every code point, matching ``ord(character) & 0xFF``.
+    data = "".join(values).encode("utf-32-le")[::4]
+    if ignore_case:
+        data = data.translate(_LOWER_TABLE)
+    high = data.translate(_HIGH_TABLE)
+    data = data.translate(_SIGN_TABLE)
+
+    # columns[k] holds, per string, the XOR of the bytes that are rotated
+    # by 4 * k bits; sign_parity holds the parity of its high bytes.
+    columns = [0] * 8
+    sign_parity = 0
+    for position in range(length):
+        rotation = (length - 1 - position) % 8
+        columns[rotation] ^= int.from_bytes(data[position::length], "big")
+        sign_parity ^= int.from_bytes(high[position::length], "big")
+
+    ones = int.from_bytes(b"\x01" * count, "big")
+    low_nibbles = ones * 0x0F
+    high_nibbles = ones * 0xF0
+    sign = sign_parity * 0xFF
+    output = bytearray(4 * count)
+    for key_byte in range(4):
+        # Nibble m of the key is the low nibble of column m XOR the high
+        # nibble of column m - 1.
+        column = columns[2 * key_byte]
+        column ^= (columns[(2 * key_byte - 1) % 8] >> 4) & low_nibbles
+        column ^= (columns[2 * key_byte + 1] << 4) & high_nibbles
+        column ^= sign
+        output[key_byte::4] = column.to_bytes(count, "big")
+
+    keys = array(UINT32, bytes(output))
+    if sys.byteorder == "big":
+        keys.byteswap()
+    return keys
@@ -1,30 +1,138 @@
 """Binary file search tools."""
 
+import heapq
 import mmap
+import os
+import sys
+from collections import deque
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
 from dataclasses import dataclass
+from itertools import islice
 from pathlib import Path
+from stat import S_ISREG
+from typing import TypeVar
+
+from big_tool.analysis.typed_values import (
+    FLOAT_TYPES,
+    INTEGER_TYPES,
+    Body,
+    ValueMatcher,
+    compile_bodies,
+    float_value_bodies,
+    integer_value_bodies,
+    value_width,
+    wildcard_body,
+)
+from big_tool.logger import logger
+
+
+VALUE_WIDTHS = (2, 4, 8)
+VALUE_TYPES = ("bytes",) + tuple(INTEGER_TYPES) + tuple(FLOAT_TYPES)
+SCAN_WINDOW_SIZE = 1024 * 1024
+# Same-width groups at least this large are pre-filtered with a set lookup per
+# aligned word, which costs the same for any number of patterns.
+MULTI_PATTERN_THRESHOLD = 64
+SEARCH_BATCH_SIZE = 64
+_WORD_FORMATS = {2: "H", 4: "I", 8: "Q"}
+
+ResultT = TypeVar("ResultT")
 
 
 @dataclass(frozen=True)
 class SearchOptions:
-    """Options for a binary search."""
+    """
+    Options for a binary search.
+
+    ``target_value`` is one value or a sequence of values. ``both_endian``
+    searches each value in both byte orders, and ``all_widths`` searches
+    integers as 2, 4, and 8 byte fields where they fit. ``max_results``
+    limits the number of matching files, and ``first_match`` stops reading
+    a file at its first match. In exact mode ``start_offset`` only compares
+    the bytes at that offset, so it is the only offset reported.
 
-    target_value: str
+    ``value_type`` selects how values are read: ``bytes`` for integers and
+    hex strings (``?`` is a nibble wildcard), an integer type such as
+    ``int32`` for values or ``LOW..HIGH`` ranges, or ``float32``/``float64``
+    for values within ``tolerance``. Only matches at multiples of
+    ``alignment`` are reported.
+    """
+
+    target_value: str | Sequence[str]
     big_endian: bool = True
     file_extension: str | None = "*"
     mode: str = "exact"
     start_offset: int | None = None
     size_min: int | None = None
     size_max: int | None = None
+    both_endian: bool = False
+    all_widths: bool = False
+    max_results: int | None = None
+    first_match: bool = False
+    value_type: str = "bytes"
+    tolerance: float = 0.0
+    alignment: int = 1
+
+
+@dataclass(frozen=True)
+class SearchPlan:
+    """
+    Compiled form of the target values of a search.
+
+    Literal ``patterns`` are found with ``find_patterns``; typed values and
+    wildcards are found with byte-class ``matchers``. ``width`` is the
+    longest possible match.
+    """
+
+    patterns: tuple[bytes, ...] = ()
+    matchers: tuple[ValueMatcher, ...] = ()
+    alignment: int = 1
+    width: int = 0
+
+    def find(self, data: bytes | memoryview | mmap.mmap, first_only: bool = False) -> list[tuple[int, bytes]]:
+        """Return ``(offset, matched bytes)`` for every aligned match, ordered by offset."""
+        matches: list[tuple[int, bytes]] = []
+        if self.patterns:
+            literal_first_only = first_only and self.alignment == 1 and not self.matchers
+            for offset, pattern in find_patterns(data, self.patterns, literal_first_only):
+                if offset % self.alignment == 0:
+                    matches.append((offset, pattern))
+        for matcher in self.matchers:
+            for offset in matcher.finditer(data):
+                if offset % self.alignment == 0:
+                    matches.append((offset, bytes(data[offset:offset + matcher.width])))
+                    if first_only:
+                        break
+        matches.sort()
+        if first_only:
+            del matches[1:]
+        return matches
+
+    def match_at(self, head: bytes | memoryview, offset: int) -> list[tuple[int, bytes]]:
+        """Return the matches at ``offset``, given the data that starts there."""
+        if offset % self.alignment:
+            return []
+        head = bytes(head)
+        matches = patterns_at(head, offset, self.patterns)
+        for matcher in self.matchers:
+            if matcher.match(head):
+                matches.append((offset, head[:matcher.width]))
+        return matches
 
 
 @dataclass(frozen=True)
 class SearchResult:
-    """Search results for one file."""
+    """
+    Search results for one file.
+
+    ``patterns[i]`` is the byte pattern found at ``offsets[i]``. An offset
+    is listed once for each pattern that matches there.
+    """
 
     path: Path
     offsets: tuple[int, ...]
     score: int
+    patterns: tuple[bytes, ...] = ()
 
 
 def parse_value_to_bytes(value: str, big_endian: bool = False) -> bytes:
@@ -56,56 +164,372 @@ def parse_value_to_bytes(value: str, big_endian: bool = False) -> bytes:
     return target_bytes
 
 
+def parse_value_patterns(
+    value: str,
+    big_endian: bool = False,
+    both_endian: bool = False,
+    all_widths: bool = False,
+) -> list[bytes]:
+    """
+    Convert a value to the byte patterns to search for.
+
+    ``all_widths`` adds the value zero-extended to each of ``VALUE_WIDTHS``
+    that can hold it. ``both_endian`` adds the other byte order of each
+    pattern. Duplicates are removed.
+    """
+    base = parse_value_to_bytes(value, big_endian=True)
+    variants = [base]
+    if all_widths:
+        number = int.from_bytes(base, "big")
+        for width in VALUE_WIDTHS:
+            if width != len(base) and number.bit_length() <= width * 8:
+                variants.append(number.to_bytes(width, "big"))
+
+    byte_orders = [True, False] if both_endian else [big_endian]
+    patterns: list[bytes] = []
+    for variant in variants:
+        for order_is_big in byte_orders:
+            pattern = variant if order_is_big else variant[::-1]
+            if pattern not in patterns:
+                patterns.append(pattern)
+    return patterns
+
+
 def search_in_file(filepath: Path, target_bytes: bytes) -> list[int]:
     """Return all offsets of a byte sequence in a file."""
+    offsets: list[int] = []
+    for offset, _pattern in search_patterns_in_file(filepath, [target_bytes]):
+        offsets.append(offset)
+    return offsets
+
+
+def search_patterns_in_file(
+    filepath: Path,
+    patterns: Sequence[bytes],
+    first_only: bool = False,
+) -> list[tuple[int, bytes]]:
+    """Return ``(offset, pattern)`` for every match of any pattern in a file, in one pass."""
     if filepath.stat().st_size == 0:
         return []
 
-    offsets: list[int] = []
     with filepath.open("rb") as file:
         with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
-            offset = mapped_file.find(target_bytes)
-            while offset != -1:
-                offsets.append(offset)
-                offset = mapped_file.find(target_bytes, offset + 1)
-    return offsets
+            return find_patterns(mapped_file, patterns, first_only)
+
+
+def find_patterns(
+    data: bytes | memoryview | mmap.mmap,
+    patterns: Sequence[bytes],
+    first_only: bool = False,
+) -> list[tuple[int, bytes]]:
+    """
+    Return ``(offset, pattern)`` for every match of any pattern, ordered by offset.
+
+    The data is read once in cache-sized windows that overlap by the longest
+    pattern length, and all patterns are matched against each window before
+    moving on. Large groups of 2, 4, or 8 byte patterns are first reduced to
+    the ones present in the window by looking up every aligned word in a set.
+    ``first_only`` returns only the earliest match and stops reading there.
+    """
+    groups: dict[int, list[bytes]] = {}
+    for pattern in sorted(set(patterns)):
+        if not pattern:
+            raise ValueError("Search pattern cannot be empty")
+        groups.setdefault(len(pattern), []).append(pattern)
+    if not groups:
+        return []
+
+    words: dict[int, dict[int, bytes]] = {}
+    for width, group in groups.items():
+        if width in _WORD_FORMATS and len(group) >= MULTI_PATTERN_THRESHOLD:
+            words[width] = {}
+            for pattern in group:
+                words[width][int.from_bytes(pattern, sys.byteorder)] = pattern
+
+    overlap = max(groups) - 1
+    data_size = len(data)
+    matches: list[tuple[int, bytes]] = []
+    for start in range(0, data_size, SCAN_WINDOW_SIZE):
+        window = bytes(data[start:start + SCAN_WINDOW_SIZE + overlap])
+        for width, group in groups.items():
+            if width in words:
+                group = _present_words(window, words[width], width)
+            for pattern in group:
+                offset = window.find(pattern)
+                while offset != -1 and offset < SCAN_WINDOW_SIZE:
+                    matches.append((start + offset, pattern))
+                    if first_only:
+                        break
+                    offset = window.find(pattern, offset + 1)
+        if first_only and matches:
+            return [min(matches)]
+    matches.sort()
+    return matches
+
+
+def _present_words(window: bytes, words: dict[int, bytes], width: int) -> list[bytes]:
+    """Return the patterns of ``words`` that occur in a window at any alignment."""
+    view = memoryview(window)
+    found: set[int] = set()
+    for alignment in range(width):
+        count = (len(window) - alignment) // width
+        found.update(words.keys() & view[alignment:alignment + count * width].cast(_WORD_FORMATS[width]))
+    present: list[bytes] = []
+    for value in found:
+        present.append(words[value])
+    return present
+
+
+def search_path(root: Path, options: SearchOptions, jobs: int = 1) -> list[SearchResult]:
+    """
+    Search a directory recursively or search one file.
+
+    Fuzzy results are ranked by score. With ``max_results`` only the best
+    ones are kept in a bounded heap while the search runs.
+    """
+    results = iter_search(root, options, jobs)
+    if options.mode != "fuzzy":
+        return list(results)
+    return rank_results(results, options.max_results)
 
 
-def search_path(root: Path, options: SearchOptions) -> list[SearchResult]:
-    """Search a directory recursively or search one file."""
+def rank_results(results: Iterable[ResultT], limit: int | None = None) -> list[ResultT]:
+    """Return results by descending score, keeping path order for equal scores."""
+    if limit is None:
+        return sorted(results, key=_result_score, reverse=True)
+    return heapq.nlargest(limit, results, key=_result_score)
+
+
+def iter_search(root: Path, options: SearchOptions, jobs: int = 1) -> Iterator[SearchResult]:
+    """
+    Yield search results while files are still being searched.
+
+    Files are found while the search runs and results come in path order.
+    With ``jobs`` greater than one, batches of files are searched in worker
+    processes. In exact mode the search stops after ``max_results``
+    results. Fuzzy results are yielded unranked.
+    """
     root = Path(root).resolve()
+    if options.mode not in {"exact", "fuzzy"}:
+        raise ValueError(f"Unsupported search mode: {options.mode}")
+    if jobs < 1:
+        raise ValueError(f"Invalid job count: {jobs}")
     if root.is_file():
-        files = [root]
+        files: Iterator[tuple[Path, int]] = iter([(root, root.stat().st_size)])
     elif root.is_dir():
-        files = []
-        for path in root.rglob("*"):
-            if path.is_file():
-                files.append(path)
+        files = _iter_files(root, options.file_extension)
     else:
         raise FileNotFoundError(root)
 
-    target_bytes = parse_value_to_bytes(options.target_value, options.big_endian)
+    plan = build_search_plan(options)
+    limit = options.max_results if options.mode == "exact" else None
+    if limit is not None and limit < 1:
+        return
+
+    if jobs == 1:
+        results = _iter_serial(files, plan, options)
+    else:
+        results = _iter_parallel(files, plan, options, jobs)
+
+    count = 0
+    for result in results:
+        yield result
+        count += 1
+        if count == limit:
+            results.close()
+            return
+
+
+def _iter_serial(
+    files: Iterator[tuple[Path, int]],
+    plan: SearchPlan,
+    options: SearchOptions,
+) -> Iterator[SearchResult]:
+    for filepath, file_size in files:
+        result = _search_file(filepath, file_size, plan, options)
+        if result is not None:
+            yield result
+
+
+def _iter_parallel(
+    files: Iterator[tuple[Path, int]],
+    plan: SearchPlan,
+    options: SearchOptions,
+    jobs: int,
+) -> Iterator[SearchResult]:
+    """Search batches of files in a process pool and yield results in path order."""
+    pending: deque[Future] = deque()
+    executor = ProcessPoolExecutor(max_workers=jobs)
+    try:
+        while True:
+            batch = list(islice(files, SEARCH_BATCH_SIZE))
+            if batch:
+                pending.append(executor.submit(_search_files, batch, plan, options))
+            if pending and (not batch or len(pending) >= jobs * 2):
+                yield from pending.popleft().result()
+            elif not pending:
+                return
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _search_files(
+    files: list[tuple[Path, int]],
+    plan: SearchPlan,
+    options: SearchOptions,
+) -> list[SearchResult]:
+    """Search a batch of files in a worker process."""
     results: list[SearchResult] = []
-    for filepath in sorted(files):
-        if not _matches_extension(filepath, options.file_extension):
+    for filepath, file_size in files:
+        result = _search_file(filepath, file_size, plan, options)
+        if result is not None:
+            results.append(result)
+    return results
+
+
+def _search_file(
+    filepath: Path,
+    file_size: int,
+    plan: SearchPlan,
+    options: SearchOptions,
+) -> SearchResult | None:
+    """
+    Search one file and return its result if it matches.
+
+    In exact mode the size filters are checked before the file is opened,
+    and ``start_offset`` reads only the bytes at that offset.
+    """
+    anchored = options.mode == "exact" and options.start_offset is not None
+    if options.mode == "exact" and not size_in_range(file_size, options):
+        return None
+
+    try:
+        if anchored:
+            with filepath.open("rb") as file:
+                file.seek(options.start_offset)
+                head = file.read(plan.width)
+            matches = plan.match_at(head, options.start_offset)
+        elif file_size == 0:
+            matches = []
+        else:
+            first_only = options.first_match and options.start_offset is None
+            with filepath.open("rb") as file:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+                    matches = plan.find(mapped_file, first_only)
+    except OSError as error:
+        logger.warning(f"Cannot search {filepath}: {error}")
+        return None
+    if not matches:
+        return None
+
+    offsets: list[int] = []
+    matched_patterns: list[bytes] = []
+    for offset, pattern in matches:
+        offsets.append(offset)
+        matched_patterns.append(pattern)
+
+    exact_match, score = check_filters(file_size, offsets, options)
+    if options.mode == "exact" and not exact_match:
+        return None
+    if options.first_match:
+        del offsets[1:]
+        del matched_patterns[1:]
+    return SearchResult(filepath, tuple(offsets), score, tuple(matched_patterns))
+
+
+def _iter_files(directory: Path, extension: str | None) -> Iterator[tuple[Path, int]]:
+    """
+    Yield files below a directory and their sizes in sorted path order.
+
+    The tree is walked while the search runs. The extension is checked
+    before each file is stat'ed, and each file is stat'ed once.
+    """
+    with os.scandir(directory) as scanner:
+        entries = sorted(scanner, key=_entry_name)
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            yield from _iter_files(Path(entry.path), extension)
             continue
 
-        file_size = filepath.stat().st_size
-        offsets = search_in_file(filepath, target_bytes)
-        if not offsets:
+        path = Path(entry.path)
+        if not _matches_extension(path, extension):
+            continue
+        try:
+            stat = entry.stat()
+        except OSError as error:
+            logger.warning(f"Cannot search {path}: {error}")
             continue
+        if S_ISREG(stat.st_mode):
+            yield path, stat.st_size
+
 
-        exact_match, score = _check_filters(file_size, offsets, options)
-        if options.mode == "exact" and not exact_match:
+def _entry_name(entry: os.DirEntry) -> str:
+    return entry.name
+
+
+def size_in_range(size: int, options: SearchOptions) -> bool:
+    """Return whether a size passes the ``size_min`` and ``size_max`` filters."""
+    if options.size_min is not None and size < options.size_min:
+        return False
+    if options.size_max is not None and size > options.size_max:
+        return False
+    return True
+
+
+def patterns_at(head: bytes | memoryview, offset: int, patterns: Sequence[bytes]) -> list[tuple[int, bytes]]:
+    """Return ``(offset, pattern)`` for each pattern that ``head``, read at ``offset``, starts with."""
+    head = bytes(head)
+    matches: list[tuple[int, bytes]] = []
+    for pattern in sorted(set(patterns)):
+        if head.startswith(pattern):
+            matches.append((offset, pattern))
+    return matches
+
+
+def build_search_plan(options: SearchOptions) -> SearchPlan:
+    """Compile all target values of a search."""
+    values = options.target_value
+    if isinstance(values, str):
+        values = [values]
+    if not values:
+        raise ValueError("No search values given")
+    if options.alignment < 1:
+        raise ValueError(f"Invalid alignment: {options.alignment}")
+
+    byte_orders = [True, False] if options.both_endian else [options.big_endian]
+    patterns: list[bytes] = []
+    bodies: dict[bool, list[Body]] = {}
+    for big_endian in byte_orders:
+        bodies[big_endian] = []
+    width = 0
+    for value in values:
+        if options.value_type == "bytes" and "?" not in value:
+            for pattern in parse_value_patterns(value, options.big_endian, options.both_endian, options.all_widths):
+                if pattern not in patterns:
+                    patterns.append(pattern)
+                width = max(width, len(pattern))
             continue
-        if options.mode not in {"exact", "fuzzy"}:
-            raise ValueError(f"Unsupported search mode: {options.mode}")
 
-        results.append(SearchResult(filepath, tuple(offsets), score))
+        for big_endian in byte_orders:
+            if options.value_type == "bytes":
+                body = wildcard_body(value, big_endian)
+                bodies[big_endian].append(body)
+                width = max(width, len(body))
+            elif options.value_type in FLOAT_TYPES:
+                bodies[big_endian].extend(float_value_bodies(value, options.value_type, options.tolerance, big_endian))
+                width = max(width, value_width(options.value_type))
+            elif options.value_type in INTEGER_TYPES:
+                bodies[big_endian].extend(integer_value_bodies(value, options.value_type, big_endian))
+                width = max(width, value_width(options.value_type))
+            else:
+                raise ValueError(f"Unsupported value type: {options.value_type}")
 
-    if options.mode == "fuzzy":
-        results.sort(key=_result_score, reverse=True)
-    return results
+    # Each byte order gets its own matchers: the most significant byte
+    # column is narrow within one order but not across both.
+    matchers: list[ValueMatcher] = []
+    for order_bodies in bodies.values():
+        matchers.extend(compile_bodies(order_bodies))
+    return SearchPlan(tuple(patterns), tuple(matchers), options.alignment, width)
 
 
 def _matches_extension(filepath: Path, extension: str | None) -> bool:
@@ -116,7 +540,8 @@ def _matches_extension(filepath: Path, extension: str | None) -> bool:
     return filepath.name.lower().endswith(extension.lower())
 
 
-def _check_filters(file_size: int, offsets: list[int], options: SearchOptions) -> tuple[bool, int]:
+def check_filters(file_size: int, offsets: list[int], options: SearchOptions) -> tuple[bool, int]:
+    """Return whether all offset and size filters match, and how many of them match."""
     exact_match = True
     score = 0
 
@@ -0,0 +1,318 @@
+"""
+Byte-level matchers for typed search values.
+
+Integer ranges, float tolerances, and wildcard hex strings are compiled to
+byte-class regular expressions. Each value range becomes a short list of
+byte-class sequences (bodies), so the regex engine checks every offset of a
+buffer in C without decoding the data. A matcher starts at the byte column
+that admits the fewest values and checks the other columns around it, which
+lets the regex engine skip quickly to candidate offsets.
+"""
+
+import mmap
+import re
+import struct
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Callable, TypeVar
+
+
+INTEGER_TYPES = {
+    "int8": (1, True),
+    "uint8": (1, False),
+    "int16": (2, True),
+    "uint16": (2, False),
+    "int32": (4, True),
+    "uint32": (4, False),
+    "int64": (8, True),
+    "uint64": (8, False),
+}
+FLOAT_TYPES = {
+    "float32": ("f", "I", 4),
+    "float64": ("d", "Q", 8),
+}
+RANGE_SEPARATOR = ".."
+
+ALL_BYTES = bytes(range(256))
+
+NumberT = TypeVar("NumberT", int, float)
+Body = tuple[bytes, ...]
+
+
+@dataclass(frozen=True)
+class ValueMatcher:
+    """
+    Compiled regex for bodies of one width.
+
+    The expression consumes only the byte at column ``anchor``; lookbehind
+    and lookahead check the rest of the body, so matches may overlap.
+    """
+
+    expression: re.Pattern[bytes]
+    anchor: int
+    width: int
+
+    def finditer(self, data: bytes | memoryview | mmap.mmap) -> Iterator[int]:
+        """Yield the start offset of every match, in order."""
+        position = self.anchor
+        while True:
+            match = self.expression.search(data, position)
+            if match is None:
+                return
+            yield match.start() - self.anchor
+            position = match.start() + 1
+
+    def match(self, head: bytes) -> bool:
+        """Return whether a body matches at the start of ``head``."""
+        return len(head) >= self.width and self.expression.match(head, self.anchor) is not None
+
+
+def value_width(value_type: str) -> int:
+    """Return the field width in bytes of an integer or float type."""
+    if value_type in INTEGER_TYPES:
+        return INTEGER_TYPES[value_type][0]
+    if value_type in FLOAT_TYPES:
+        return FLOAT_TYPES[value_type][2]
+    raise ValueError(f"Unsupported value type: {value_type}")
+
+
+def integer_value_bodies(value: str, value_type: str, big_endian: bool) -> list[Body]:
+    """
+    Return regex bodies for an integer or an inclusive ``LOW..HIGH`` range.
+
+    Bounds may be decimal or ``0x`` hexadecimal. Signed types use two's
+    complement.
+    """
+    width, signed = INTEGER_TYPES[value_type]
+    low, high = _parse_bounds(value, _parse_integer)
+    bits = width * 8
+    minimum = -(1 << (bits - 1)) if signed else 0
+    maximum = (1 << (bits - 1)) - 1 if signed else (1 << bits) - 1
+    if low < minimum or high > maximum:
+        raise ValueError(f"Range {value} does not fit in {value_type}")
+
+    ranges: list[tuple[int, int]] = []
+    if low < 0:
+        ranges.append((low + (1 << bits), min(high, -1) + (1 << bits)))
+    if high >= 0:
+        ranges.append((max(low, 0), high))
+    return _range_bodies(ranges, width, big_endian)
+
+
+def float_value_bodies(value: str, value_type: str, tolerance: float, big_endian: bool) -> list[Body]:
+    """
+    Return regex bodies for floats within ``tolerance`` of a value, or in a ``LOW..HIGH`` range.
+
+    NaN never matches. Both signed zeros match a range that contains zero.
+    """
+    pack_format, bits_format, width = FLOAT_TYPES[value_type]
+    low, high = _parse_bounds(value, float)
+    if tolerance < 0:
+        raise ValueError("Tolerance cannot be negative")
+    low -= tolerance
+    high += tolerance
+
+    sign_bit = 1 << (width * 8 - 1)
+    ranges: list[tuple[int, int]] = []
+    if high >= 0:
+        lower = _float_bits_at_least(max(low, 0.0), pack_format, bits_format)
+        upper = _float_bits_at_most(high, pack_format, bits_format)
+        if lower <= upper:
+            ranges.append((lower, upper))
+    if low <= 0:
+        lower = _float_bits_at_least(max(-high, 0.0), pack_format, bits_format)
+        upper = _float_bits_at_most(-low, pack_format, bits_format)
+        if lower <= upper:
+            ranges.append((sign_bit | lower, sign_bit | upper))
+    return _range_bodies(ranges, width, big_endian)
+
+
+def wildcard_body(value: str, big_endian: bool) -> Body:
+    """
+    Return the body of a hex string with ``?`` nibble wildcards.
+
+    ``0x12??34`` matches any middle byte and ``0x1?`` matches 0x10 to 0x1F.
+    """
+    clean_value = str(value).strip()
+    if clean_value.lower().startswith("0x"):
+        clean_value = clean_value[2:]
+    clean_hex = clean_value.replace(" ", "").replace(",", "").replace("_", "")
+    if not clean_hex or len(clean_hex) % 2:
+        raise ValueError(f"Invalid wildcard hex value: {value}")
+
+    columns: list[bytes] = []
+    for position in range(0, len(clean_hex), 2):
+        columns.append(_nibble_values(clean_hex[position:position + 2], value))
+    if not big_endian:
+        columns.reverse()
+    return tuple(columns)
+
+
+def compile_bodies(bodies: list[Body]) -> list[ValueMatcher]:
+    """
+    Compile bodies into one matcher per body width.
+
+    Bodies compiled together should share a byte order, so that some column
+    is narrow for all of them.
+    """
+    by_width: dict[int, list[Body]] = {}
+    for body in bodies:
+        by_width.setdefault(len(body), []).append(body)
+
+    matchers: list[ValueMatcher] = []
+    for width, group in sorted(by_width.items()):
+        anchor = _anchor_column(group, width)
+        union = bytes(sorted(set(b"".join(body[anchor] for body in group))))
+        branches: list[bytes] = []
+        for body in group:
+            branch = b"(?<=" + _classes(body[: anchor + 1]) + b")"
+            if anchor + 1 < width:
+                branch += b"(?=" + _classes(body[anchor + 1:]) + b")"
+            branches.append(branch)
+        pattern = _byte_class(union) + b"(?:" + b"|".join(branches) + b")"
+        matchers.append(ValueMatcher(re.compile(pattern, re.DOTALL), anchor, width))
+    return matchers
+
+
+def _parse_bounds(value: str, parse: Callable[[str], NumberT]) -> tuple[NumberT, NumberT]:
+    text = str(value).strip()
+    if RANGE_SEPARATOR in text:
+        low_text, high_text = text.split(RANGE_SEPARATOR, 1)
+        low, high = parse(low_text.strip()), parse(high_text.strip())
+    else:
+        low = high = parse(text)
+    if low > high:
+        raise ValueError(f"Invalid range: {value}")
+    return low, high
+
+
+def _parse_integer(text: str) -> int:
+    return int(text, 0)
+
+
+def _float_bits(number: float, pack_format: str, bits_format: str) -> int:
+    try:
+        packed = struct.pack(f"<{pack_format}", number)
+    except OverflowError:
+        packed = struct.pack(f"<{pack_format}", float("inf"))
+    return struct.unpack(f"<{bits_format}", packed)[0]
+
+
+def _bits_float(bits: int, pack_format: str, bits_format: str) -> float:
+    return struct.unpack(f"<{pack_format}", struct.pack(f"<{bits_format}", bits))[0]
+
+
+def _float_bits_at_least(number: float, pack_format: str, bits_format: str) -> int:
+    """Return the bits of the smallest non-negative float not below ``number``."""
+    bits = _float_bits(number, pack_format, bits_format)
+    if _bits_float(bits, pack_format, bits_format) < number:
+        bits += 1
+    return bits
+
+
+def _float_bits_at_most(number: float, pack_format: str, bits_format: str) -> int:
+    """Return the bits of the largest non-negative float not above ``number``."""
+    bits = _float_bits(number, pack_format, bits_format)
+    if _bits_float(bits, pack_format, bits_format) > number:
+        bits -= 1
+    return bits
+
+
+def _range_bodies(ranges: list[tuple[int, int]], width: int, big_endian: bool) -> list[Body]:
+    bodies: list[Body] = []
+    for low, high in ranges:
+        for sequence in _range_sequences(low, high, width):
+            columns: list[bytes] = []
+            for byte_low, byte_high in sequence:
+                columns.append(bytes(range(byte_low, byte_high + 1)))
+            if not big_endian:
+                columns.reverse()
+            bodies.append(tuple(columns))
+    return bodies
+
+
+def _range_sequences(low: int, high: int, width: int) -> list[list[tuple[int, int]]]:
+    """
+    Split an unsigned range into sequences of per-byte ranges, most significant byte first.
+
+    A range of ``width`` bytes needs at most ``2 * width - 1`` sequences.
+    """
+    if width == 0:
+        return [[]]
+
+    shift = 8 * (width - 1)
+    full = (1 << shift) - 1
+    low_top, low_rest = divmod(low, 1 << shift)
+    high_top, high_rest = divmod(high, 1 << shift)
+    sequences: list[list[tuple[int, int]]] = []
+    if low_top == high_top:
+        for rest in _range_sequences(low_rest, high_rest, width - 1):
+            sequences.append([(low_top, low_top)] + rest)
+        return sequences
+
+    if low_rest != 0:
+        for rest in _range_sequences(low_rest, full, width - 1):
+            sequences.append([(low_top, low_top)] + rest)
+        low_top += 1
+    tail: list[list[tuple[int, int]]] = []
+    if high_rest != full:
+        for rest in _range_sequences(0, high_rest, width - 1):
+            tail.append([(high_top, high_top)] + rest)
+        high_top -= 1
+    if low_top <= high_top:
+        sequences.append([(low_top, high_top)] + [(0, 0xFF)] * (width - 1))
+    return sequences + tail
+
+
+def _anchor_column(bodies: list[Body], width: int) -> int:
+    """Return the column whose combined byte class admits the fewest values."""
+    best_column = 0
+    best_count = len(ALL_BYTES) + 1
+    for column in range(width):
+        values: set[int] = set()
+        for body in bodies:
+            values.update(body[column])
+        if len(values) < best_count:
+            best_column = column
+            best_count = len(values)
+    return best_column
+
+
+def _classes(columns: Body) -> bytes:
+    return b"".join(_byte_class(values) for values in columns)
+
+
+def _byte_class(values: bytes) -> bytes:
+    """Render sorted byte values as a regex class, collapsing runs into ranges."""
+    if values == ALL_BYTES:
+        return b"."
+    if len(values) == 1:
+        return b"\\x%02x" % values[0]
+
+    runs: list[list[int]] = []
+    for value in values:
+        if runs and runs[-1][1] + 1 == value:
+            runs[-1][1] = value
+        else:
+            runs.append([value, value])
+    members = b""
+    for start, end in runs:
+        if start == end:
+            members += b"\\x%02x" % start
+        else:
+            members += b"\\x%02x-\\x%02x" % (start, end)
+    return b"[" + members + b"]"
+
+
+def _nibble_values(pair: str, value: str) -> bytes:
+    """Return the byte values matched by two hex digits, either of which may be ``?``."""
+    try:
+        highs = range(16) if pair[0] == "?" else [int(pair[0], 16)]
+        lows = range(16) if pair[1] == "?" else [int(pair[1], 16)]
+    except ValueError as error:
+        raise ValueError(f"Invalid wildcard hex value: {value}") from error
+    values: list[int] = []
+    for high in highs:
+        for low in lows:
+            values.append(high << 4 | low)
+    return bytes(values)
@@ -1,12 +1,27 @@
 """BIG archive format and extraction tools."""
 
-from big_tool.big_archive.big_extractor import ArchiveExtractor, unpack_directory
-from big_tool.big_archive.big_format import ArchiveEntry, BigArchive, BigArchiveError
+from big_tool.big_archive.big_extractor import ArchiveExtractor, EntryFilter, unpack_directory
+from big_tool.big_archive.big_format import (
+    ArchiveEntry,
+    ArchiveToc,
+    BigArchive,
+    BigArchiveError,
+    ResourceHeader,
+)
+from big_tool.big_archive.big_writer import patch_archive, repack_archive
+from big_tool.big_archive.package_index import EntryQuery, PackageIndex
 
 __all__ = [
     "ArchiveEntry",
     "ArchiveExtractor",
+    "ArchiveToc",
     "BigArchive",
     "BigArchiveError",
+    "EntryFilter",
+    "EntryQuery",
+    "PackageIndex",
+    "ResourceHeader",
+    "patch_archive",
+    "repack_archive",
     "unpack_directory",
 ]
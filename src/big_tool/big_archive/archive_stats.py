@@ -0,0 +1,223 @@
+"""
+Archive summaries built from headers alone.
+
+Only the archive header, the TOC, and the 4- or 12-byte header of each
+resource block are read, so a summary costs a few bytes per entry however
+large the archive is.
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from big_tool.big_archive.big_format import BigArchive
+from big_tool.big_archive.file_types import TYPE_MAP
+
+
+@dataclass
+class GroupStats:
+    """Entry counts and sizes of one group hash."""
+
+    group_hash: int
+    name: str
+    entry_count: int = 0
+    compressed_count: int = 0
+    ref_count: int = 0
+    block_size: int = 0
+    original_size: int = 0
+    compressed_original_size: int = 0
+    compressed_size: int = 0
+
+    @property
+    def compression_ratio(self) -> float | None:
+        """Return compressed size over original size of the compressed entries."""
+        if not self.compressed_original_size:
+            return None
+        return self.compressed_size / self.compressed_original_size
+
+
+@dataclass(frozen=True)
+class LayoutIssue:
+    """One structural anomaly; ``offset`` is a file offset."""
+
+    kind: str
+    offset: int
+    size: int
+    message: str
+    index: int | None = None
+
+
+@dataclass
+class ArchiveStats:
+    """Header-level summary of one archive."""
+
+    path: str
+    file_size: int
+    version: int
+    flags: int
+    toc_offset: int
+    toc_count: int
+    data_offset: int
+    data_size: int
+    declared_file_size: int
+    totals: GroupStats
+    groups: list[GroupStats] = field(default_factory=list)
+    issues: list[LayoutIssue] = field(default_factory=list)
+
+
+def inspect_archive(archive_path: Path) -> ArchiveStats:
+    """
+    Summarise one archive from its header, TOC, and resource block headers.
+
+    Layout issues include a footer that does not end at the data start, a
+    wrong declared file or data size, gaps and overlaps between the data
+    start and the first block, block headers that cannot be read, and
+    compressed payloads that are shorter or longer than their block.
+    """
+    archive_path = Path(archive_path).resolve()
+    with BigArchive(archive_path, use_mmap=True) as archive:
+        archive.parse()
+        metadata = archive.metadata
+        file_size = archive_path.stat().st_size
+        stats = ArchiveStats(
+            str(archive_path),
+            file_size,
+            int(metadata["version"]),
+            int(metadata["flags"]),
+            int(metadata["toc_offset"]),
+            int(metadata["toc_count"]),
+            int(metadata["data_offset"]),
+            int(metadata["data_size"]),
+            int(metadata["total_file_size"]),
+            GroupStats(0, "total"),
+        )
+        _check_header(stats, metadata["magic"])
+
+        groups: dict[int, GroupStats] = {}
+        if archive.entries:
+            _check_data_start(stats, archive.entries.offsets[0])
+        for entry in archive.entries:
+            group = groups.get(entry.group_hash)
+            if group is None:
+                group = GroupStats(entry.group_hash, TYPE_MAP.get(entry.group_hash, ""))
+                groups[entry.group_hash] = group
+            group.entry_count += 1
+            group.block_size += entry.size
+            if entry.size == 0:
+                message = "Entry shares its offset with the next entry"
+                stats.issues.append(LayoutIssue("empty", entry.offset, 0, message, entry.index))
+                continue
+            try:
+                header = archive.read_entry_header(entry)
+            except ValueError as error:
+                stats.issues.append(LayoutIssue("bad_header", entry.offset, entry.size, str(error), entry.index))
+                continue
+
+            group.original_size += header.original_size
+            if not header.is_compressed:
+                continue
+            group.compressed_count += 1
+            if header.is_ref:
+                group.ref_count += 1
+                payload_end = header.data_offset
+            else:
+                group.compressed_original_size += header.original_size
+                group.compressed_size += header.compressed_size
+                payload_end = header.data_offset + header.compressed_size
+            _check_block_end(stats, entry.index, entry.offset, entry.size, payload_end)
+
+    stats.groups = sorted(groups.values(), key=_group_block_size, reverse=True)
+    for group in stats.groups:
+        _add_group(stats.totals, group)
+    return stats
+
+
+def _check_header(stats: ArchiveStats, magic: bytes) -> None:
+    if magic != b"FGIB":
+        stats.issues.append(LayoutIssue("magic", 0, 4, f"Invalid magic number: {magic!r}"))
+
+    footer_end = stats.toc_offset + stats.toc_count * BigArchive.ENTRY_SIZE + BigArchive.FOOTER_SIZE
+    if footer_end != stats.data_offset:
+        stats.issues.append(
+            LayoutIssue(
+                "footer",
+                min(footer_end, stats.data_offset),
+                abs(stats.data_offset - footer_end),
+                f"Footer end ({footer_end:#x}) does not match data start ({stats.data_offset:#x})",
+            )
+        )
+    if stats.declared_file_size != stats.file_size:
+        stats.issues.append(
+            LayoutIssue(
+                "file_size",
+                footer_end - 4,
+                4,
+                f"Declared file size {stats.declared_file_size} differs from actual size {stats.file_size}",
+            )
+        )
+    if stats.data_size != stats.file_size - stats.data_offset:
+        stats.issues.append(
+            LayoutIssue(
+                "data_size",
+                28,
+                4,
+                f"Declared data size {stats.data_size} differs from {stats.file_size - stats.data_offset}",
+            )
+        )
+
+
+def _check_data_start(stats: ArchiveStats, first_offset: int) -> None:
+    if first_offset > stats.data_offset:
+        stats.issues.append(
+            LayoutIssue(
+                "gap",
+                stats.data_offset,
+                first_offset - stats.data_offset,
+                "Unused bytes between the data start and the first block",
+            )
+        )
+    elif first_offset < stats.data_offset:
+        stats.issues.append(
+            LayoutIssue(
+                "overlap",
+                first_offset,
+                stats.data_offset - first_offset,
+                "First block starts before the data start",
+            )
+        )
+
+
+def _check_block_end(stats: ArchiveStats, index: int, offset: int, size: int, payload_end: int) -> None:
+    if payload_end > size:
+        stats.issues.append(
+            LayoutIssue(
+                "truncated",
+                offset,
+                size,
+                f"Compressed payload needs {payload_end} bytes but the block has {size}",
+                index,
+            )
+        )
+    elif payload_end < size:
+        stats.issues.append(
+            LayoutIssue(
+                "gap",
+                offset + payload_end,
+                size - payload_end,
+                "Unused bytes after a compressed payload",
+                index,
+            )
+        )
+
+
+def _add_group(totals: GroupStats, group: GroupStats) -> None:
+    totals.entry_count += group.entry_count
+    totals.compressed_count += group.compressed_count
+    totals.ref_count += group.ref_count
+    totals.block_size += group.block_size
+    totals.original_size += group.original_size
+    totals.compressed_original_size += group.compressed_original_size
+    totals.compressed_size += group.compressed_size
+
+
+def _group_block_size(group: GroupStats) -> int:
+    return group.block_size
@@ -1,17 +1,36 @@
 """BIG resource extraction service."""
 
-import csv
+import hashlib
+import os
 import shutil
-import struct
 import zlib
-from collections import defaultdict
-from dataclasses import dataclass
+from collections import defaultdict, deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Callable
-
-from big_tool.big_archive.big_format import ArchiveEntry, BigArchive
-from big_tool.big_archive.file_types import TYPE_MAP, guess_extension
+from typing import Callable, Iterable
+
+from big_tool.big_archive.big_format import (
+    ArchiveEntry,
+    BigArchive,
+    ResourceHeader,
+    parse_resource_header,
+)
+from big_tool.big_archive.blob_store import BLOB_DIR_NAME, BlobStore
+from big_tool.big_archive.file_types import TYPE_MAP, detect_entry_type, detect_signature
+from big_tool.big_archive.manifest import ManifestWriter, manifest_path, open_manifest_writer
+from big_tool.big_archive.unpack_state import (
+    ArchiveState,
+    entry_digest,
+    load_state,
+    save_state,
+    toc_digest,
+)
 from big_tool.logger import logger
+from big_tool.resources.string_extractor import ResourceStringExtractor, strings_csv_path
+
+
+_BLOB_STORES: dict[Path, BlobStore] = {}
 
 
 @dataclass(frozen=True)
@@ -22,6 +41,84 @@ class ExtractionResult:
     output_dir: Path
     extracted_count: int
     failed_count: int
+    skipped_count: int = 0
+    deduplicated_bytes: int = 0
+    string_pack_count: int = 0
+
+
+@dataclass(frozen=True)
+class EntryFilter:
+    """
+    Select the entries of an archive to extract.
+
+    Empty fields match every entry; index and offset ranges are inclusive.
+    Group hashes, ranges, and ``predicate`` are decided from the TOC before
+    anything is read. A ``predicate`` is usually a lambda or closure, which
+    worker processes cannot receive. ``resource_types`` then reads the block header and
+    decompresses only the first bytes of the remaining entries.
+    """
+
+    group_hashes: frozenset[int] = frozenset()
+    resource_types: frozenset[str] = frozenset()
+    index_ranges: tuple[tuple[int, int], ...] = ()
+    offset_ranges: tuple[tuple[int, int], ...] = ()
+    predicate: Callable[[ArchiveEntry], bool] | None = None
+
+    def matches_toc(self, entry: ArchiveEntry) -> bool:
+        """Return whether an entry passes every filter that needs only the TOC."""
+        if self.group_hashes and entry.group_hash not in self.group_hashes:
+            return False
+        if self.index_ranges and not _in_ranges(entry.index, self.index_ranges):
+            return False
+        if self.offset_ranges and not _in_ranges(entry.offset, self.offset_ranges):
+            return False
+        return self.predicate is None or self.predicate(entry)
+
+    def select(self, archive: BigArchive) -> list[ArchiveEntry]:
+        """Return the selected entries of a parsed archive in TOC order."""
+        entries: list[ArchiveEntry] = []
+        for entry in archive.entries:
+            if not self.matches_toc(entry):
+                continue
+            if self.resource_types and self._entry_type(archive, entry) not in self.resource_types:
+                continue
+            entries.append(entry)
+        return entries
+
+    @staticmethod
+    def _entry_type(archive: BigArchive, entry: ArchiveEntry) -> str:
+        try:
+            header = archive.read_entry_header(entry)
+        except ValueError as error:
+            # A block without a readable header has no type to match.
+            logger.debug(f"Cannot read the header of entry {entry.index}: {error}")
+            return ""
+        return detect_entry_type(archive, entry, header)
+
+
+@dataclass(frozen=True)
+class ExtractOptions:
+    """Per-archive extraction options shared by serial and parallel unpacking."""
+
+    threads: int = 1
+    use_mmap: bool = False
+    incremental: bool = False
+    manifest_format: str = "csv"
+    blob_store: Path | None = None
+    entry_filter: EntryFilter | None = None
+    extract_strings: bool = False
+
+
+@dataclass(frozen=True)
+class _EntryOutput:
+    """Manifest row and statistics for one written resource."""
+
+    row: dict[str, object]
+    extension: str
+    size: int
+    path: Path
+    deduplicated: bool = False
+    strings_path: Path | None = None
 
 
 def clear_directory(directory: Path) -> None:
@@ -32,55 +129,342 @@ def clear_directory(directory: Path) -> None:
 
 
 class ArchiveExtractor:
-    """Write all resources from one BIG file to an output directory."""
+    """
+    Write all resources from one BIG file to an output directory.
+
+    Manifest rows are streamed to ``<stem>_resources.csv`` (or ``.sqlite``
+    with ``manifest_format="sqlite"``) in entry order as entries finish.
+
+    With a ``blob_store``, each unique payload is written once to the store
+    and the resource paths become hard links to it. The manifest then gets
+    ``blob`` and ``deduplicated`` columns.
+
+    Resources larger than ``STREAM_THRESHOLD`` (stored or decompressed) are
+    decompressed in ``STREAM_CHUNK_SIZE`` pieces straight to the output file.
+
+    In incremental mode, resources whose stored block is unchanged since the
+    last run are kept (and renamed if their index or offset moved), changed
+    resources are rewritten, and files of removed resources are deleted.
+    Turning deduplication on or off rewrites every resource.
+
+    An ``entry_filter`` limits extraction to the selected entries; the other
+    entries are never read or decompressed. It cannot be combined with
+    incremental mode, which must see every entry to clean up old outputs.
+
+    With ``extract_strings``, string packs are decoded from the in-memory
+    payload as they are written, and their strings go to a
+    ``<resource>_Strings.csv`` file next to the resource.
+    """
+
+    MAX_INFLIGHT_BYTES = 256 * 1024 * 1024
+    STREAM_THRESHOLD = 16 * 1024 * 1024
+    STREAM_CHUNK_SIZE = 1024 * 1024
+
+    def __init__(
+        self,
+        archive: BigArchive,
+        output_dir: Path,
+        threads: int = 1,
+        incremental: bool = False,
+        manifest_format: str = "csv",
+        blob_store: BlobStore | None = None,
+        entry_filter: EntryFilter | None = None,
+        extract_strings: bool = False,
+    ):
+        if threads < 1:
+            raise ValueError(f"Invalid thread count: {threads}")
+        if incremental and entry_filter is not None:
+            raise ValueError("Entry filters cannot be combined with incremental extraction")
 
-    def __init__(self, archive: BigArchive, output_dir: Path):
         self.archive = archive
         self.output_dir = Path(output_dir).resolve()
+        self.threads = threads
+        self.incremental = incremental
+        self.manifest_format = manifest_format
+        self.blob_store = blob_store
+        self.entry_filter = entry_filter
+        self.extract_strings = extract_strings
+        self.deduplicated_bytes = 0
+        self.string_pack_count = 0
         self.stats: defaultdict[str, dict[str, int]] = defaultdict(_new_stats)
-        self.csv_data: list[dict[str, object]] = []
+        self.manifest: ManifestWriter | None = None
+        self._previous_state: ArchiveState | None = None
+        self._digests: dict[int, str] = {}
+        self._reused: dict[int, _EntryOutput] = {}
+        self._outputs: list[_EntryOutput] = []
 
     def extract_all(self) -> ExtractionResult:
-        """Extract all resources and write a CSV manifest."""
+        """Extract all selected resources and stream the manifest."""
         self.archive.parse()
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        entries = self._selected_entries()
+        if self.incremental:
+            self._prepare_incremental()
 
-        failed_count = 0
-        for entry in self.archive.entries:
-            try:
-                self._extract_entry(entry)
-            except Exception as error:
-                failed_count += 1
-                logger.error(f"Failed to process entry {entry.index}: {error}")
-                self._append_error_row(entry, str(error))
-
-        self._write_manifest()
-        extracted_count = len(self.csv_data) - failed_count
+        self.manifest = open_manifest_writer(
+            self.manifest_format,
+            self.output_dir,
+            self.archive.filepath,
+            dedup=self.blob_store is not None,
+        )
+        with self.manifest:
+            if self.threads > 1:
+                failed_count = self._extract_parallel(entries)
+            else:
+                failed_count = 0
+                for entry in entries:
+                    try:
+                        reused = self._reused.get(entry.index)
+                        if reused is not None:
+                            self._record(reused)
+                        else:
+                            self._extract_entry(entry)
+                    except Exception as error:
+                        failed_count += 1
+                        logger.error(f"Failed to process entry {entry.index}: {error}")
+                        self._append_error_row(entry, str(error))
+
+        if self.incremental:
+            self._finish_incremental()
+
+        skipped_count = len(self._reused)
+        extracted_count = self.manifest.row_count - failed_count - skipped_count
         logger.info(
             f"Extracted {extracted_count} resources from {self.archive.filepath.name}"
         )
+        if skipped_count:
+            logger.info(f"Kept {skipped_count} unchanged resources")
+        if self.deduplicated_bytes:
+            logger.info(f"Deduplication saved {self.deduplicated_bytes} bytes")
+        if self.string_pack_count:
+            logger.info(f"Decoded {self.string_pack_count} string packs")
         return ExtractionResult(
             self.archive.filepath,
             self.output_dir,
             extracted_count,
             failed_count,
+            skipped_count,
+            self.deduplicated_bytes,
+            self.string_pack_count,
+        )
+
+    def _selected_entries(self) -> Iterable[ArchiveEntry]:
+        if self.entry_filter is None:
+            return self.archive.entries
+
+        entries = self.entry_filter.select(self.archive)
+        logger.info(f"Selected {len(entries)} of {len(self.archive.entries)} entries in {self.archive.filepath.name}")
+        return entries
+
+    def _prepare_incremental(self) -> None:
+        """Hash every stored block and keep outputs that are still up to date."""
+        self._previous_state = load_state(self.output_dir)
+        recorded = self._recorded_digests()
+        for entry in self.archive.entries:
+            digest = recorded.get(entry.index)
+            if digest is not None:
+                self._digests[entry.index] = digest
+                continue
+            try:
+                self._digests[entry.index] = entry_digest(self.archive, entry, self.STREAM_CHUNK_SIZE)
+            except Exception as error:
+                # The entry is extracted normally and reports its own error.
+                logger.debug(f"Cannot hash entry {entry.index}: {error}")
+
+        if self._previous_state is None:
+            return
+        if self._previous_state.dedup != (self.blob_store is not None):
+            # Reused rows would lack or carry the blob columns of the other mode.
+            logger.info(f"Deduplication setting changed; rewriting all resources of {self.archive.filepath.name}")
+            return
+
+        available: dict[tuple[int, str], list[dict[str, object]]] = defaultdict(list)
+        for item in self._previous_state.entries:
+            if (self.output_dir / str(item["path"])).is_file():
+                available[(int(item["group_hash"]), str(item["digest"]))].append(item)
+
+        moves: list[tuple[Path, Path]] = []
+        for entry in self.archive.entries:
+            digest = self._digests.get(entry.index)
+            candidates = available.get((entry.group_hash, digest))
+            if not candidates:
+                continue
+
+            item = candidates.pop()
+            old_path = self.output_dir / str(item["path"])
+            new_path = self._output_path(entry, old_path.suffix)
+            row = dict(item["row"])
+            row["id"] = entry.index
+            row["Offset"] = hex(entry.offset)
+            self._reused[entry.index] = _EntryOutput(row, old_path.suffix, int(item["size"]), new_path)
+            if old_path != new_path:
+                moves.append((old_path, new_path))
+                if strings_csv_path(old_path).is_file():
+                    moves.append((strings_csv_path(old_path), strings_csv_path(new_path)))
+
+        # Move through temporary names so a kept file never overwrites another kept file.
+        temp_moves: list[tuple[Path, Path]] = []
+        for old_path, new_path in moves:
+            temp_path = old_path.with_name(f"{old_path.name}.moving")
+            os.replace(old_path, temp_path)
+            temp_moves.append((temp_path, new_path))
+        for temp_path, new_path in temp_moves:
+            new_path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(temp_path, new_path)
+
+        if self.extract_strings:
+            for index, output in self._reused.items():
+                if _has_strings(output.row):
+                    strings_path = strings_csv_path(output.path)
+                    if not strings_path.is_file():
+                        strings_path = self._write_strings(output.path)
+                    self._reused[index] = replace(output, strings_path=strings_path)
+
+    def _recorded_digests(self) -> dict[int, str]:
+        """
+        Return the saved block digests by entry index when the archive cannot have changed.
+
+        That needs the recorded archive size, modification time, and TOC
+        digest to match; otherwise nothing is returned and every block is hashed.
+        """
+        state = self._previous_state
+        if (
+            state is None
+            or not state.matches_archive(self.archive.filepath)
+            or state.toc_digest != toc_digest(self.archive.toc)
+        ):
+            return {}
+
+        digests: dict[int, str] = {}
+        for item in state.entries:
+            digests[int(item["row"]["id"])] = str(item["digest"])
+        logger.debug(f"Reusing {len(digests)} block digests of unchanged {self.archive.filepath.name}")
+        return digests
+
+    def _finish_incremental(self) -> None:
+        """Delete outputs of removed resources and save the new state."""
+        current_paths: set[Path] = set()
+        for output in self._outputs:
+            current_paths.add(output.path)
+        if self._previous_state is not None:
+            for item in self._previous_state.entries:
+                old_path = self.output_dir / str(item["path"])
+                if old_path in current_paths or not old_path.is_file():
+                    continue
+                old_path.unlink()
+                strings_csv_path(old_path).unlink(missing_ok=True)
+                try:
+                    old_path.parent.rmdir()
+                except OSError:
+                    pass
+
+        entries: list[dict[str, object]] = []
+        for output in self._outputs:
+            digest = self._digests.get(int(output.row["id"]))
+            if digest is None:
+                continue
+            entries.append(
+                {
+                    "group_hash": int(str(output.row["sub_group"]), 16),
+                    "digest": digest,
+                    "path": output.path.relative_to(self.output_dir).as_posix(),
+                    "size": output.size,
+                    "row": output.row,
+                }
+            )
+
+        archive_stat = self.archive.filepath.stat()
+        state = ArchiveState(
+            archive_stat.st_size,
+            archive_stat.st_mtime_ns,
+            toc_digest(self.archive.toc),
+            entries,
+            self.blob_store is not None,
+            self.manifest_format,
         )
+        save_state(self.output_dir, state)
+
+    def _extract_parallel(self, entries: Iterable[ArchiveEntry]) -> int:
+        """
+        Read blocks serially and decompress them in a thread pool.
+
+        Results are collected oldest first, so manifest rows stay in entry order.
+        The total size of blocks waiting for a worker is capped by
+        ``MAX_INFLIGHT_BYTES``. Streamed entries are read by their worker and
+        do not count towards the cap.
+        """
+        failed_count = 0
+        inflight_bytes = 0
+        pending: deque[tuple[ArchiveEntry, Future, int]] = deque()
+        with ThreadPoolExecutor(max_workers=self.threads) as executor:
+            for entry in entries:
+                reused = self._reused.get(entry.index)
+                if reused is not None:
+                    future = Future()
+                    future.set_result(reused)
+                    pending.append((entry, future, 0))
+                    continue
+
+                block_bytes = 0 if entry.size > self.STREAM_THRESHOLD else entry.size
+                while pending and (
+                    inflight_bytes + block_bytes > self.MAX_INFLIGHT_BYTES
+                    or len(pending) >= self.threads * 4
+                ):
+                    done_entry, future, done_bytes = pending.popleft()
+                    inflight_bytes -= done_bytes
+                    failed_count += self._collect(done_entry, future)
+
+                if not block_bytes:
+                    future = executor.submit(self._stream_entry, entry)
+                else:
+                    try:
+                        block = self.archive.read_entry(entry)
+                    except Exception as error:
+                        future = Future()
+                        future.set_exception(error)
+                    else:
+                        future = executor.submit(self._write_block, entry, block)
+                pending.append((entry, future, block_bytes))
+                inflight_bytes += block_bytes
+
+            while pending:
+                done_entry, future, _done_bytes = pending.popleft()
+                failed_count += self._collect(done_entry, future)
+        return failed_count
+
+    def _collect(self, entry: ArchiveEntry, future: Future) -> int:
+        """Record a finished entry and return 1 when it failed."""
+        try:
+            self._record(future.result())
+        except Exception as error:
+            logger.error(f"Failed to process entry {entry.index}: {error}")
+            self._append_error_row(entry, str(error))
+            return 1
+        return 0
 
     def _extract_entry(self, entry: ArchiveEntry) -> None:
+        if entry.size > self.STREAM_THRESHOLD:
+            self._record(self._stream_entry(entry))
+            return
+
         block = self.archive.read_entry(entry)
-        if len(block) < 4:
-            raise ValueError("resource header is truncated")
+        self._record(self._write_block(entry, block))
+
+    def _write_block(self, entry: ArchiveEntry, block: bytes | memoryview) -> _EntryOutput:
+        """Decode one resource block and write it. Safe to call from worker threads."""
+        # Slices of the view share the block buffer instead of copying it.
+        block = memoryview(block)
+        header = parse_resource_header(block, len(block))
+        if header.original_size > self.STREAM_THRESHOLD:
+            return self._stream_entry(entry)
 
         resource_hash = entry.group_hash
-        header = block[:4]
-        is_compressed = bool(header[2] & 0x80)
-        compressed_size = 0
+        is_compressed = header.is_compressed
+        original_size = header.original_size
+        compressed_size = header.compressed_size
 
         if is_compressed:
-            if len(block) < 12:
-                raise ValueError("compressed resource header is truncated")
-            original_size, compressed_size = struct.unpack("<II", block[4:12])
-            if original_size == 0:
+            if header.is_ref:
                 final_data = block[4:12]
                 extension = ".bin"
                 resource_type = "ref"
@@ -92,44 +476,155 @@ class ArchiveExtractor:
                         f"Resource {entry.index} size mismatch: "
                         f"declared {original_size}, actual {len(final_data)}"
                     )
-                extension = guess_extension(final_data, resource_hash)
-                resource_type = extension.lstrip(".")
+                signature = detect_signature(final_data, resource_hash)
+                extension = signature.extension
+                resource_type = signature.name
         else:
             final_data = block[4:]
-            original_size = len(final_data)
-            extension = guess_extension(final_data, resource_hash)
-            resource_type = extension.lstrip(".")
+            signature = detect_signature(final_data, resource_hash)
+            extension = signature.extension
+            resource_type = signature.name
+
+        output_path = self._output_path(entry, extension)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        deduplicated = False
+        blob_path = None
+        if self.blob_store is not None:
+            blob_path, deduplicated = self.blob_store.put(final_data)
+            self.blob_store.link(blob_path, output_path)
+        else:
+            # Never write through an existing file; it may be a hard link to a blob.
+            output_path.unlink(missing_ok=True)
+            output_path.write_bytes(final_data)
+
+        row = self._make_row(entry, header, resource_type, blob_path, deduplicated)
+        strings_path = None
+        if self.extract_strings and _has_strings(row):
+            strings_path = self._write_strings(output_path, final_data)
+        return _EntryOutput(row, extension, len(final_data), output_path, deduplicated, strings_path)
+
+    def _stream_entry(self, entry: ArchiveEntry) -> _EntryOutput:
+        """
+        Decompress one large resource to disk in fixed-size chunks.
+
+        The type is guessed from the first chunk and the declared size is
+        checked against the running total. Safe to call from worker threads.
+        """
+        with self.archive.open_entry(entry.index) as stream:
+            header = stream.raw.header
+            chunk = stream.read(self.STREAM_CHUNK_SIZE)
+            if header.is_ref:
+                extension = ".bin"
+                resource_type = "ref"
+            else:
+                signature = detect_signature(chunk, entry.group_hash)
+                extension = signature.extension
+                resource_type = signature.name
+            output_path = self._output_path(entry, extension)
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            if self.blob_store is not None:
+                target_path = self.blob_store.temp_path()
+            else:
+                output_path.unlink(missing_ok=True)
+                target_path = output_path
 
-        mapped_type = TYPE_MAP.get(resource_hash)
+            digest = hashlib.blake2b(digest_size=16)
+            total_size = 0
+            try:
+                with target_path.open("wb") as output:
+                    while chunk:
+                        output.write(chunk)
+                        if self.blob_store is not None:
+                            digest.update(chunk)
+                        total_size += len(chunk)
+                        chunk = stream.read(self.STREAM_CHUNK_SIZE)
+            except Exception:
+                target_path.unlink(missing_ok=True)
+                raise
+
+        if header.is_compressed and not header.is_ref and total_size != header.original_size:
+            logger.warning(
+                f"Resource {entry.index} size mismatch: "
+                f"declared {header.original_size}, actual {total_size}"
+            )
+
+        deduplicated = False
+        blob_path = None
+        if self.blob_store is not None:
+            blob_path, deduplicated = self.blob_store.adopt(target_path, digest.hexdigest())
+            self.blob_store.link(blob_path, output_path)
+
+        row = self._make_row(entry, header, resource_type, blob_path, deduplicated)
+        strings_path = None
+        if self.extract_strings and _has_strings(row):
+            strings_path = self._write_strings(output_path)
+        return _EntryOutput(row, extension, total_size, output_path, deduplicated, strings_path)
+
+    def _write_strings(self, output_path: Path, data: bytes | memoryview | None = None) -> Path | None:
+        """
+        Write the strings CSV of one string pack and return its path.
+
+        ``data`` is the payload already in memory; without it the written
+        resource file is read back. Safe to call from worker threads.
+        """
+        extractor = ResourceStringExtractor(output_path)
+        try:
+            if data is None:
+                extractor.extract()
+            else:
+                extractor.parse(data)
+        except ValueError as error:
+            logger.warning(f"Skipping strings of {output_path.name}: {error}")
+            return None
+        return extractor.write_csv(strings_csv_path(output_path))
+
+    def _make_row(
+        self,
+        entry: ArchiveEntry,
+        header: ResourceHeader,
+        resource_type: str,
+        blob_path: Path | None,
+        deduplicated: bool,
+    ) -> dict[str, object]:
+        mapped_type = TYPE_MAP.get(entry.group_hash)
         if mapped_type is not None:
             resource_type = mapped_type
 
-        group_dir = self.output_dir / hex(resource_hash)
-        group_dir.mkdir(parents=True, exist_ok=True)
+        row: dict[str, object] = {
+            "id": entry.index,
+            "section": "",
+            "sub_group": hex(entry.group_hash),
+            "type": resource_type,
+            "Offset": hex(entry.offset),
+            "compressed?": "T" if header.is_compressed else "F",
+            "compressed size": header.compressed_size,
+            "original size": header.original_size,
+        }
+        if blob_path is not None:
+            row["blob"] = os.path.relpath(blob_path, self.output_dir.parent)
+            row["deduplicated"] = "T" if deduplicated else "F"
+        return row
+
+    def _output_path(self, entry: ArchiveEntry, extension: str) -> Path:
         filename = (
             f"{self.archive.filepath.stem}_{entry.index:04d}_"
             f"{hex(entry.offset)}{extension}"
         )
-        output_path = group_dir / filename
-        output_path.write_bytes(final_data)
-
-        self.csv_data.append(
-            {
-                "id": entry.index,
-                "section": "",
-                "sub_group": hex(resource_hash),
-                "type": resource_type,
-                "Offset": hex(entry.offset),
-                "compressed?": "T" if is_compressed else "F",
-                "compressed size": compressed_size,
-                "original size": original_size,
-            }
-        )
-        self.stats[extension]["count"] += 1
-        self.stats[extension]["size"] += len(final_data)
+        return self.output_dir / hex(entry.group_hash) / filename
+
+    def _record(self, output: _EntryOutput) -> None:
+        self.manifest.write_row(output.row)
+        if output.deduplicated:
+            self.deduplicated_bytes += output.size
+        if output.strings_path is not None:
+            self.string_pack_count += 1
+        if self.incremental:
+            self._outputs.append(output)
+        self.stats[output.extension]["count"] += 1
+        self.stats[output.extension]["size"] += output.size
 
     def _append_error_row(self, entry: ArchiveEntry, message: str) -> None:
-        self.csv_data.append(
+        self.manifest.write_row(
             {
                 "id": entry.index,
                 "section": "",
@@ -143,27 +638,6 @@ class ArchiveExtractor:
             }
         )
 
-    def _write_manifest(self) -> None:
-        if not self.csv_data:
-            return
-
-        manifest_path = self.output_dir / f"{self.archive.filepath.stem}_resources.csv"
-        headers = [
-            "id",
-            "section",
-            "sub_group",
-            "type",
-            "Offset",
-            "compressed?",
-            "compressed size",
-            "original size",
-            "error",
-        ]
-        with manifest_path.open("w", newline="", encoding="utf-8-sig") as file:
-            writer = csv.DictWriter(file, fieldnames=headers)
-            writer.writeheader()
-            writer.writerows(self.csv_data)
-
 
 def _natural_sort_key(path: Path) -> list[object]:
     """Build a natural sort key from a file name."""
@@ -207,14 +681,53 @@ def unpack_directory(
     clean: bool = True,
     assume_yes: bool = False,
     confirm: Callable[[list[Path]], bool] | None = None,
+    jobs: int = 1,
+    threads: int = 1,
+    use_mmap: bool = False,
+    incremental: bool = False,
+    manifest_format: str = "csv",
+    dedup: bool = False,
+    entry_filter: EntryFilter | None = None,
+    extract_strings: bool = False,
 ) -> list[ExtractionResult]:
-    """Extract all BIG files in an asset package directory."""
+    """
+    Extract all BIG files in an asset package directory.
+
+    With ``jobs`` greater than one, archives are extracted in worker processes,
+    largest first. Results keep the same order as a serial run. ``threads``
+    sets the number of decompression threads used inside each archive, and
+    ``use_mmap`` reads archives through a memory mapping.
+
+    ``incremental`` never clears output directories. Archives whose size and
+    modification time match the saved state are skipped while their manifest
+    and resource files are all still there, and only new, changed, or missing
+    resources of other archives are written. ``manifest_format``
+    selects a ``csv`` or ``sqlite`` resource manifest.
+
+    ``dedup`` writes each unique payload once into ``<output>/_blobs`` and
+    hard-links the per-archive resource files to it.
+
+    ``entry_filter`` extracts only the selected entries of each archive and
+    cannot be combined with ``incremental``; a filter with a ``predicate``
+    also needs ``jobs`` of one. ``extract_strings`` writes the strings CSV of
+    every string pack during the same pass.
+    """
     input_dir = Path(input_dir).resolve()
     if output_dir is None:
         output_dir = input_dir.with_name(f"{input_dir.name}_out")
     output_dir = Path(output_dir).resolve()
     if output_dir == input_dir:
         raise ValueError("Output directory must be different from input directory")
+    if incremental and entry_filter is not None:
+        raise ValueError("Entry filters cannot be combined with incremental extraction")
+    if jobs > 1 and entry_filter is not None and entry_filter.predicate is not None:
+        raise ValueError("Entry filter predicates cannot be sent to worker processes; use jobs=1")
+    if jobs < 1:
+        raise ValueError(f"Invalid job count: {jobs}")
+    if threads < 1:
+        raise ValueError(f"Invalid thread count: {threads}")
+    if incremental:
+        clean = False
 
     archives = find_archives(input_dir, recursive=recursive)
     if not archives:
@@ -225,31 +738,164 @@ def unpack_directory(
     for archive_path in archives:
         target_dirs.append(output_dir / archive_path.stem)
 
+    blob_store = None
+    if dedup:
+        blob_store = output_dir / BLOB_DIR_NAME
+
     existing_targets: list[Path] = []
     for target_dir in target_dirs:
         if target_dir.exists():
             existing_targets.append(target_dir)
+    if blob_store is not None and blob_store.exists():
+        existing_targets.append(blob_store)
 
     if clean and existing_targets and not assume_yes:
         if confirm is None or not confirm(existing_targets):
             logger.info("Cleanup cancelled by user.")
             return []
 
+    if clean and blob_store is not None:
+        clear_directory(blob_store)
+
+    options = ExtractOptions(
+        threads=threads,
+        use_mmap=use_mmap,
+        incremental=incremental,
+        manifest_format=manifest_format,
+        blob_store=blob_store,
+        entry_filter=entry_filter,
+        extract_strings=extract_strings,
+    )
+    if jobs == 1 or len(archives) == 1:
+        slots: list[ExtractionResult | None] = []
+        for archive_path, target_dir in zip(archives, target_dirs):
+            slots.append(_unpack_archive(archive_path, target_dir, clean, options))
+    else:
+        slots = _unpack_parallel(archives, target_dirs, clean, jobs, options)
+
     results: list[ExtractionResult] = []
-    for archive_path, target_dir in zip(archives, target_dirs):
-        if clean:
-            clear_directory(target_dir)
-        else:
-            target_dir.mkdir(parents=True, exist_ok=True)
+    for result in slots:
+        if result is not None:
+            results.append(result)
+    return results
 
-        try:
-            with BigArchive(archive_path) as archive:
-                extractor = ArchiveExtractor(archive, target_dir)
-                results.append(extractor.extract_all())
-        except Exception as error:
-            logger.error(f"Failed to unpack {archive_path.name}: {error}")
 
-    return results
+def _unpack_archive(
+    archive_path: Path,
+    target_dir: Path,
+    clean: bool,
+    options: ExtractOptions,
+) -> ExtractionResult | None:
+    """Extract one BIG file and return None when the archive cannot be read."""
+    if options.incremental:
+        state = load_state(target_dir)
+        if (
+            state is not None
+            and state.matches_archive(archive_path)
+            and state.dedup == (options.blob_store is not None)
+            and _outputs_complete(archive_path, target_dir, state, options.manifest_format)
+            and (not options.extract_strings or _strings_written(target_dir, state))
+        ):
+            logger.info(f"Skipping unchanged archive {archive_path.name}")
+            return ExtractionResult(archive_path, target_dir, 0, 0, len(state.entries))
+
+    if clean:
+        clear_directory(target_dir)
+    else:
+        target_dir.mkdir(parents=True, exist_ok=True)
+
+    try:
+        with BigArchive(archive_path, use_mmap=options.use_mmap) as archive:
+            extractor = ArchiveExtractor(
+                archive,
+                target_dir,
+                threads=options.threads,
+                incremental=options.incremental,
+                manifest_format=options.manifest_format,
+                blob_store=_open_blob_store(options.blob_store),
+                entry_filter=options.entry_filter,
+                extract_strings=options.extract_strings,
+            )
+            return extractor.extract_all()
+    except Exception as error:
+        logger.error(f"Failed to unpack {archive_path.name}: {error}")
+        return None
+
+
+def _open_blob_store(root: Path | None) -> BlobStore | None:
+    """Return the blob store shared by the archives of this process."""
+    if root is None:
+        return None
+
+    store = _BLOB_STORES.get(root)
+    if store is None:
+        store = BlobStore(root)
+        _BLOB_STORES[root] = store
+    return store
+
+
+def _unpack_parallel(
+    archives: list[Path],
+    target_dirs: list[Path],
+    clean: bool,
+    jobs: int,
+    options: ExtractOptions,
+) -> list[ExtractionResult | None]:
+    """Extract archives in a process pool and return results in input order."""
+    sizes: list[int] = []
+    for archive_path in archives:
+        sizes.append(archive_path.stat().st_size)
+    schedule = list(range(len(archives)))
+    schedule.sort(key=sizes.__getitem__, reverse=True)
+
+    slots: list[ExtractionResult | None] = [None] * len(archives)
+    with ProcessPoolExecutor(max_workers=min(jobs, len(archives))) as executor:
+        futures = {}
+        for index in schedule:
+            future = executor.submit(
+                _unpack_archive,
+                archives[index],
+                target_dirs[index],
+                clean,
+                options,
+            )
+            futures[index] = future
+
+        for index, future in futures.items():
+            try:
+                slots[index] = future.result()
+            except Exception as error:
+                logger.error(f"Failed to unpack {archives[index].name}: {error}")
+    return slots
+
+
+def _outputs_complete(archive_path: Path, target_dir: Path, state: ArchiveState, manifest_format: str) -> bool:
+    """Return whether the manifest and every resource file recorded in a state are still on disk."""
+    if state.manifest_format != manifest_format:
+        return False
+    if state.entries and not manifest_path(manifest_format, target_dir, archive_path).is_file():
+        return False
+    return state.outputs_exist(target_dir)
+
+
+def _strings_written(target_dir: Path, state: ArchiveState) -> bool:
+    """Return whether every string pack recorded in a state has its strings CSV."""
+    for item in state.entries:
+        if _has_strings(item["row"]) and not strings_csv_path(target_dir / str(item["path"])).is_file():
+            return False
+    return True
+
+
+def _has_strings(row: dict[str, object]) -> bool:
+    """Return whether a manifest row is a string pack with a payload; references have none."""
+    return row["type"] == "string_pack" and row["original size"] != 0
+
+
+def _in_ranges(value: int, ranges: tuple[tuple[int, int], ...]) -> bool:
+    for first, last in ranges:
+        if first <= value <= last:
+            return True
+    return False
 
 
 def _new_stats() -> dict[str, int]:
@@ -1,11 +1,21 @@
 """Parser for FGIB/BIG archives."""
 
+import bisect
+import io
+import mmap
+import operator
 import struct
+import sys
+import threading
+import zlib
+from array import array
+from collections.abc import Iterator, Sequence
 from dataclasses import dataclass
 from pathlib import Path
 from typing import BinaryIO
 
 from big_tool.logger import logger
+from big_tool.typed_arrays import UINT32
 
 
 class BigArchiveError(ValueError):
@@ -22,8 +32,105 @@ class ArchiveEntry:
     size: int
 
 
+@dataclass(frozen=True)
+class ResourceHeader:
+    """
+    Header at the start of a resource block.
+
+    Compressed blocks have a 12-byte header ending with the original and
+    compressed sizes. Other blocks have a 4-byte header. A compressed block
+    with an original size of 0 is a reference and stores no payload.
+    """
+
+    is_compressed: bool
+    original_size: int
+    compressed_size: int
+    data_offset: int
+
+    @property
+    def is_ref(self) -> bool:
+        """Return whether the block is a reference entry."""
+        return self.is_compressed and self.original_size == 0
+
+
+RESOURCE_HEADER_SIZE = 4
+COMPRESSED_HEADER_SIZE = 12
+# Compressed bytes read at a time when only the start of a payload is needed.
+PEEK_CHUNK_SIZE = 256
+
+
+def parse_resource_header(data: bytes | memoryview, block_size: int) -> ResourceHeader:
+    """Parse the header of a resource block from its first bytes."""
+    if len(data) < RESOURCE_HEADER_SIZE or block_size < RESOURCE_HEADER_SIZE:
+        raise ValueError("resource header is truncated")
+
+    if not data[2] & 0x80:
+        return ResourceHeader(False, block_size - RESOURCE_HEADER_SIZE, 0, RESOURCE_HEADER_SIZE)
+
+    if len(data) < COMPRESSED_HEADER_SIZE or block_size < COMPRESSED_HEADER_SIZE:
+        raise ValueError("compressed resource header is truncated")
+    original_size, compressed_size = struct.unpack_from("<II", data, RESOURCE_HEADER_SIZE)
+    return ResourceHeader(True, original_size, compressed_size, COMPRESSED_HEADER_SIZE)
+
+
+class ArchiveToc(Sequence[ArchiveEntry]):
+    """
+    Column-oriented table of contents sorted by resource offset.
+
+    Group hashes, offsets, physical sizes, and the row of each entry in the
+    stored TOC are kept in typed arrays. Rows that share an offset point to
+    one block; all but the last of them have a size of 0. ``ArchiveEntry``
+    objects are only created when an item is accessed.
+    """
+
+    def __init__(self, group_hashes: array, offsets: array, sizes: array, rows: array, first_index: int = 0):
+        self.group_hashes = group_hashes
+        self.offsets = offsets
+        self.sizes = sizes
+        self.rows = rows
+        self._first_index = first_index
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, _stop, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError("ArchiveToc slices do not support a step")
+            return ArchiveToc(
+                self.group_hashes[index],
+                self.offsets[index],
+                self.sizes[index],
+                self.rows[index],
+                self._first_index + start,
+            )
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("ArchiveToc index out of range")
+        return ArchiveEntry(
+            self._first_index + index,
+            self.group_hashes[index],
+            self.offsets[index],
+            self.sizes[index],
+        )
+
+    def __iter__(self) -> Iterator[ArchiveEntry]:
+        columns = zip(self.group_hashes, self.offsets, self.sizes)
+        for index, (group_hash, offset, size) in enumerate(columns, self._first_index):
+            yield ArchiveEntry(index, group_hash, offset, size)
+
+
 class BigArchive:
-    """Read BIG headers, tables, and resource data."""
+    """
+    Read BIG headers, tables, and resource data.
+
+    With ``use_mmap`` the file is memory-mapped and ``read_entry`` returns
+    ``memoryview`` slices of the mapping instead of copied ``bytes``.
+    Reads are safe to run from several threads in both modes.
+    """
 
     HEADER_FORMAT = "<4sHHIIIIII"
     HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
@@ -31,23 +138,40 @@ class BigArchive:
     ENTRY_SIZE = struct.calcsize(ENTRY_FORMAT)
     FOOTER_SIZE = 8
 
-    def __init__(self, filepath: Path):
+    def __init__(self, filepath: Path, use_mmap: bool = False):
         self.filepath = Path(filepath).resolve()
+        self.use_mmap = use_mmap
         self.file_handle: BinaryIO | None = None
+        self._mapped_file: mmap.mmap | None = None
+        self._mapped_view: memoryview | None = None
+        self._read_lock = threading.Lock()
         self.metadata: dict[str, int | bytes] = {}
-        self.entries: list[ArchiveEntry] = []
+        self.entries = ArchiveToc(array(UINT32), array(UINT32), array("Q"), array(UINT32))
         self._is_parsed = False
 
     @property
-    def toc(self) -> list[ArchiveEntry]:
+    def toc(self) -> ArchiveToc:
         """Return the table of contents."""
         return self.entries
 
     def __enter__(self) -> "BigArchive":
         self.file_handle = self.filepath.open("rb")
+        if self.use_mmap and self.filepath.stat().st_size > 0:
+            self._mapped_file = mmap.mmap(self.file_handle.fileno(), 0, access=mmap.ACCESS_READ)
+            self._mapped_view = memoryview(self._mapped_file)
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if self._mapped_view is not None:
+            self._mapped_view.release()
+            self._mapped_view = None
+        if self._mapped_file is not None:
+            try:
+                self._mapped_file.close()
+            except BufferError:
+                # Entry views are still alive; the mapping closes when they are released.
+                logger.debug(f"Deferred unmapping of {self.filepath.name}")
+            self._mapped_file = None
         if self.file_handle is not None:
             self.file_handle.close()
             self.file_handle = None
@@ -122,25 +246,31 @@ class BigArchive:
             raise BigArchiveError("BIG main TOC is outside the file")
 
         self.file_handle.seek(toc_offset)
-        raw_entries: list[tuple[int, int]] = []
-        for _ in range(toc_count):
-            entry_data = self.file_handle.read(self.ENTRY_SIZE)
-            if len(entry_data) != self.ENTRY_SIZE:
-                raise BigArchiveError("BIG main TOC is truncated")
-            raw_entries.append(struct.unpack(self.ENTRY_FORMAT, entry_data))
-
-        raw_entries.sort(key=_resource_offset)
-        self.entries = []
-        for index, item in enumerate(raw_entries):
-            group_hash, offset = item
-            next_offset = file_size
-            if index + 1 < len(raw_entries):
-                next_offset = raw_entries[index + 1][1]
-
-            if offset < 0 or offset > next_offset or next_offset > file_size:
-                raise BigArchiveError(f"Invalid resource offset at entry {index}")
-
-            self.entries.append(ArchiveEntry(index, group_hash, offset, next_offset - offset))
+        table_data = self.file_handle.read(toc_count * self.ENTRY_SIZE)
+        if len(table_data) != toc_count * self.ENTRY_SIZE:
+            raise BigArchiveError("BIG main TOC is truncated")
+
+        # Each entry is a little-endian (group_hash, offset) pair of uint32 values.
+        raw_table = array(UINT32)
+        raw_table.frombytes(table_data)
+        if sys.byteorder != "little":
+            raw_table.byteswap()
+
+        raw_hashes = raw_table[0::2]
+        raw_offsets = raw_table[1::2]
+        order = sorted(range(toc_count), key=raw_offsets.__getitem__)
+        group_hashes = array(UINT32, map(raw_hashes.__getitem__, order))
+        offsets = array(UINT32, map(raw_offsets.__getitem__, order))
+
+        # Offsets are sorted, so only entries past the end of the file can be invalid.
+        first_invalid = bisect.bisect_right(offsets, file_size)
+        if first_invalid < toc_count:
+            raise BigArchiveError(f"Invalid resource offset at entry {max(first_invalid - 1, 0)}")
+
+        next_offsets = offsets[1:]
+        next_offsets.append(file_size)
+        sizes = array("Q", map(operator.sub, next_offsets, offsets))
+        self.entries = ArchiveToc(group_hashes, offsets, sizes, array(UINT32, order))
 
     def get_entry_data_info(self, index: int) -> tuple[int, int]:
         """Return a resource offset and its physical size."""
@@ -150,18 +280,120 @@ class BigArchive:
         entry = self.entries[index]
         return entry.offset, entry.size
 
-    def read_entry(self, entry: ArchiveEntry) -> bytes:
+    def read_entry(self, entry: ArchiveEntry) -> bytes | memoryview:
         """Read the complete data block for one resource."""
-        if self.file_handle is None:
-            raise RuntimeError("BigArchive must be used as a context manager")
-
-        self.file_handle.seek(entry.offset)
-        data = self.file_handle.read(entry.size)
+        data = self.read_range(entry.offset, entry.size)
         if len(data) != entry.size:
             raise BigArchiveError(f"Resource {entry.index} is truncated")
         return data
 
+    def read_range(self, offset: int, size: int) -> bytes | memoryview:
+        """Read up to ``size`` bytes at a file offset."""
+        if self.file_handle is None:
+            raise RuntimeError("BigArchive must be used as a context manager")
+
+        if self._mapped_view is not None:
+            return self._mapped_view[offset:offset + size]
+
+        with self._read_lock:
+            self.file_handle.seek(offset)
+            return self.file_handle.read(size)
+
+    def read_entry_header(self, entry: ArchiveEntry) -> ResourceHeader:
+        """Read only the 4- or 12-byte header of a resource block."""
+        head = self.read_range(entry.offset, min(entry.size, COMPRESSED_HEADER_SIZE))
+        return parse_resource_header(head, entry.size)
+
+    def open_entry(self, index: int) -> io.BufferedReader:
+        """
+        Open one resource as a read-only binary stream.
+
+        Compressed data is read and decompressed in chunks as the caller reads,
+        so the whole resource is never held in memory.
+        """
+        if not self._is_parsed:
+            self.parse()
+
+        entry = self.entries[index]
+        return io.BufferedReader(EntryReader(self, entry))
+
+    def peek_entry(self, entry: ArchiveEntry, size: int) -> bytes:
+        """
+        Return the first ``size`` payload bytes of a resource.
+
+        Compressed data is read in small chunks and inflated only until
+        ``size`` bytes are available. Reference entries return no bytes.
+        """
+        reader = EntryReader(self, entry, chunk_size=PEEK_CHUNK_SIZE)
+        if reader.header.is_ref:
+            return b""
+
+        head = bytearray()
+        while len(head) < size:
+            data = reader.read(size - len(head))
+            if not data:
+                break
+            head += data
+        return bytes(head)
+
+
+class EntryReader(io.RawIOBase):
+    """Raw stream over the payload of one resource, decompressing lazily."""
+
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, archive: BigArchive, entry: ArchiveEntry, chunk_size: int = CHUNK_SIZE):
+        super().__init__()
+        self.archive = archive
+        self.entry = entry
+        self.chunk_size = chunk_size
+        self.header = archive.read_entry_header(entry)
+        self._position = entry.offset + self.header.data_offset
+        self._end = entry.offset + entry.size
+        self._decompressor = None
+        if self.header.is_ref:
+            # Reference entries expose their two size fields, as extraction does.
+            self._position = entry.offset + RESOURCE_HEADER_SIZE
+            self._end = entry.offset + COMPRESSED_HEADER_SIZE
+        elif self.header.is_compressed:
+            self._end = min(self._end, self._position + self.header.compressed_size)
+            self._decompressor = zlib.decompressobj()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        target = memoryview(buffer).cast("B")
+        if not len(target):
+            return 0
+        if self._decompressor is None:
+            data = self._read_stored(len(target))
+        else:
+            data = self._read_decompressed(len(target))
+        target[:len(data)] = data
+        return len(data)
+
+    def _read_stored(self, size: int) -> bytes | memoryview:
+        size = min(size, self._end - self._position)
+        if size <= 0:
+            return b""
+        data = self.archive.read_range(self._position, size)
+        self._position += len(data)
+        return data
 
-def _resource_offset(item: tuple[int, int]) -> int:
-    """Return the resource offset from a table entry."""
-    return item[1]
+    def _read_decompressed(self, size: int) -> bytes:
+        decompressor = self._decompressor
+        while not decompressor.eof:
+            if decompressor.unconsumed_tail:
+                data = decompressor.decompress(decompressor.unconsumed_tail, size)
+            else:
+                chunk = self._read_stored(self.chunk_size)
+                if not chunk:
+                    data = decompressor.flush()
+                    if not data:
+                        raise BigArchiveError(f"Resource {self.entry.index} is truncated")
+                    return data
+                data = decompressor.decompress(chunk, size)
+            if data:
+                return data
+        return b""
@@ -0,0 +1,292 @@
+"""
+Writer for FGIB/BIG archives.
+
+``repack_archive`` writes a new archive in which only replaced resources are
+re-encoded; all other blocks are copied byte for byte. ``patch_archive``
+changes an archive in place: replacements are appended to the end of the
+file, and only the main TOC, footer, and header sizes are rewritten. When an
+appended block would leave a gap that an uncompressed block absorbs, it
+repacks the archive instead.
+
+TOC rows that share an offset share one block. The writers address rows by
+entry index rather than by old offset, so replacing one of them moves only
+that row and the others keep a single copy of the original block.
+"""
+
+import bisect
+import os
+import struct
+import zlib
+from pathlib import Path
+from typing import BinaryIO
+
+from big_tool.big_archive.big_format import (
+    RESOURCE_HEADER_SIZE,
+    ArchiveEntry,
+    BigArchive,
+    BigArchiveError,
+)
+from big_tool.logger import logger
+
+
+COMPRESSED_FLAG = 0x80
+DATA_SIZE_FIELD_OFFSET = 28
+COPY_CHUNK_SIZE = 1024 * 1024
+
+
+def encode_block(
+    payload: bytes,
+    compressed: bool,
+    header: bytes = bytes(RESOURCE_HEADER_SIZE),
+    level: int = zlib.Z_DEFAULT_COMPRESSION,
+) -> bytes:
+    """
+    Return a stored resource block for a payload.
+
+    ``header`` supplies the first four header bytes; only the compression
+    flag in byte 2 is changed.
+    """
+    flags = bytearray(header[:RESOURCE_HEADER_SIZE])
+    if compressed:
+        flags[2] |= COMPRESSED_FLAG
+        data = zlib.compress(payload, level)
+        return bytes(flags) + struct.pack("<II", len(payload), len(data)) + data
+
+    flags[2] &= ~COMPRESSED_FLAG & 0xFF
+    return bytes(flags) + payload
+
+
+def encode_ref_block(header: bytes = bytes(RESOURCE_HEADER_SIZE)) -> bytes:
+    """Return the stored block of a reference entry."""
+    flags = bytearray(header[:RESOURCE_HEADER_SIZE])
+    flags[2] |= COMPRESSED_FLAG
+    return bytes(flags) + struct.pack("<II", 0, 0)
+
+
+def pack_header(
+    toc_count: int,
+    data_offset: int,
+    data_size: int,
+    toc_offset: int = BigArchive.HEADER_SIZE,
+    version: int = 1,
+    flags: int = 0,
+) -> bytes:
+    """Return a BIG file header without a secondary table."""
+    return struct.pack(
+        BigArchive.HEADER_FORMAT,
+        b"FGIB",
+        version,
+        flags,
+        0,
+        0,
+        toc_offset,
+        toc_count,
+        data_offset,
+        data_size,
+    )
+
+
+def repack_archive(
+    source: Path,
+    output: Path,
+    replacements: dict[int, bytes],
+    level: int = zlib.Z_DEFAULT_COMPRESSION,
+) -> Path:
+    """
+    Write a copy of an archive with some resources replaced.
+
+    ``replacements`` maps entry indexes (in offset order, as used by
+    extraction) to new decompressed payloads. A replaced entry keeps its
+    header bytes and compression mode; every other block is copied unchanged.
+    """
+    source = Path(source).resolve()
+    output = Path(output).resolve()
+    if source == output:
+        raise ValueError("Output archive must be different from the source; use patch_archive")
+
+    with BigArchive(source) as archive:
+        archive.parse()
+        _check_replacements(archive, replacements)
+        prefix_size = _prefix_size(archive)
+        output.parent.mkdir(parents=True, exist_ok=True)
+
+        new_offsets: dict[int, int] = {}
+        # New offset of each original block, so rows that share it keep sharing one copy.
+        copied_blocks: dict[int, int] = {}
+        with output.open("wb") as file:
+            _copy_range(archive, file, 0, prefix_size)
+            for entry in archive.entries:
+                if entry.index in replacements:
+                    new_offsets[entry.index] = file.tell()
+                    file.write(_replacement_block(archive, entry, replacements[entry.index], level))
+                    continue
+
+                new_offset = copied_blocks.get(entry.offset)
+                if new_offset is None:
+                    new_offset = copied_blocks[entry.offset] = file.tell()
+                    _copy_range(archive, file, entry.offset, _block_entry(archive, entry).size)
+                new_offsets[entry.index] = new_offset
+            _write_tables(archive, file, new_offsets, file.tell() - source.stat().st_size)
+
+    logger.info(f"Repacked {len(replacements)} resources into {output.name}")
+    return output
+
+
+def patch_archive(
+    archive_path: Path,
+    replacements: dict[int, bytes],
+    level: int = zlib.Z_DEFAULT_COMPRESSION,
+) -> list[int]:
+    """
+    Replace resources by appending them and return the moved entry indexes.
+
+    Replaced blocks are written at the end of the file and only the TOC rows
+    that point to them, the footer, and the header data size are rewritten.
+    The old blocks stay in the file as unused space.
+
+    An uncompressed block has no stored size and ends where the next block
+    starts, so one just before a replaced block would absorb the old slot.
+    Such archives are rewritten by ``repack_archive`` through a temporary
+    file instead, and no entry moves.
+
+    Entry indexes follow offset order, so moved entries get new indexes at
+    the end of the archive.
+    """
+    archive_path = Path(archive_path).resolve()
+    with BigArchive(archive_path) as archive:
+        archive.parse()
+        _check_replacements(archive, replacements)
+        absorbing_index = _absorbing_entry(archive, replacements)
+        if absorbing_index is None:
+            _append_blocks(archive, replacements, level)
+
+    if absorbing_index is not None:
+        logger.info(
+            f"Uncompressed entry {absorbing_index} of {archive_path.name} precedes a replaced block; "
+            "repacking the archive"
+        )
+        _repack_in_place(archive_path, replacements, level)
+        return []
+
+    logger.info(f"Patched {archive_path.name}: appended {len(replacements)} resources")
+    return sorted(replacements)
+
+
+def _append_blocks(archive: BigArchive, replacements: dict[int, bytes], level: int) -> None:
+    """Append the replacement blocks and point the TOC at them."""
+    entries = archive.entries
+    archive_path = archive.filepath
+    old_file_size = archive_path.stat().st_size
+    blocks: dict[int, bytes] = {}
+    for index, payload in replacements.items():
+        blocks[index] = _replacement_block(archive, entries[index], payload, level)
+
+    new_offsets: dict[int, int] = {}
+    with archive_path.open("r+b") as file:
+        file.seek(old_file_size)
+        for index in sorted(blocks):
+            new_offsets[index] = file.tell()
+            file.write(blocks[index])
+        # The TOC is rewritten last so an interrupted write leaves the old entries valid.
+        _write_tables(archive, file, new_offsets, file.tell() - old_file_size)
+
+
+def _repack_in_place(archive_path: Path, replacements: dict[int, bytes], level: int) -> None:
+    temp_path = archive_path.with_name(f"{archive_path.name}.tmp")
+    try:
+        repack_archive(archive_path, temp_path, replacements, level)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+    os.replace(temp_path, archive_path)
+
+
+def _absorbing_entry(archive: BigArchive, replacements: dict[int, bytes]) -> int | None:
+    """Return an uncompressed entry that would grow over the old slot of a replaced block, or None."""
+    offsets = archive.entries.offsets
+    for index in sorted(replacements):
+        offset = offsets[index]
+        if _block_is_kept(archive, offset, replacements):
+            continue
+        previous = bisect.bisect_left(offsets, offset) - 1
+        if previous < 0 or not _block_is_kept(archive, offsets[previous], replacements):
+            continue
+        if not archive.read_entry_header(archive.entries[previous]).is_compressed:
+            return previous
+    return None
+
+
+def _block_is_kept(archive: BigArchive, offset: int, replacements: dict[int, bytes]) -> bool:
+    """Return whether a row that is not replaced still points to the block at ``offset``."""
+    offsets = archive.entries.offsets
+    for index in range(bisect.bisect_left(offsets, offset), bisect.bisect_right(offsets, offset)):
+        if index not in replacements:
+            return True
+    return False
+
+
+def _block_entry(archive: BigArchive, entry: ArchiveEntry) -> ArchiveEntry:
+    """Return the last entry at the offset of ``entry``, the one whose size covers the shared block."""
+    return archive.entries[bisect.bisect_right(archive.entries.offsets, entry.offset) - 1]
+
+
+def _check_replacements(archive: BigArchive, replacements: dict[int, bytes]) -> None:
+    for index in replacements:
+        if not 0 <= index < len(archive.entries):
+            raise IndexError(f"Resource index {index} is outside the archive")
+
+
+def _prefix_size(archive: BigArchive) -> int:
+    """Return the size of the region before the first resource block."""
+    footer_end = int(archive.metadata["toc_offset"]) + int(archive.metadata["toc_count"]) * BigArchive.ENTRY_SIZE
+    footer_end += BigArchive.FOOTER_SIZE
+    if not archive.entries:
+        return footer_end
+
+    first_offset = archive.entries[0].offset
+    if first_offset < footer_end:
+        raise BigArchiveError("BIG main TOC overlaps resource data")
+    return first_offset
+
+
+def _replacement_block(archive: BigArchive, entry: ArchiveEntry, payload: bytes, level: int) -> bytes:
+    """Encode a payload like the block it replaces; a non-empty payload turns a ref into data."""
+    head = bytes(archive.read_range(entry.offset, RESOURCE_HEADER_SIZE))
+    header = archive.read_entry_header(_block_entry(archive, entry))
+    if header.is_ref and not payload:
+        return encode_ref_block(head)
+    return encode_block(payload, header.is_compressed, head, level)
+
+
+def _copy_range(archive: BigArchive, file: BinaryIO, offset: int, size: int) -> None:
+    end = offset + size
+    while offset < end:
+        chunk = archive.read_range(offset, min(COPY_CHUNK_SIZE, end - offset))
+        if not chunk:
+            raise BigArchiveError("Unexpected end of archive while copying")
+        file.write(chunk)
+        offset += len(chunk)
+
+
+def _write_tables(archive: BigArchive, file: BinaryIO, new_offsets: dict[int, int], size_delta: int) -> None:
+    """Rewrite the TOC offsets of the given entry indexes in their stored rows, then the footer and header sizes."""
+    toc_offset = int(archive.metadata["toc_offset"])
+    toc_count = int(archive.metadata["toc_count"])
+    raw_table = archive.read_range(toc_offset, toc_count * BigArchive.ENTRY_SIZE)
+    table = list(struct.unpack(f"<{toc_count * 2}I", raw_table))
+    rows = archive.entries.rows
+    for index, new_offset in new_offsets.items():
+        table[2 * rows[index] + 1] = new_offset
+
+    file.seek(0, 2)
+    file_size = file.tell()
+    if file_size > 0xFFFFFFFF:
+        raise BigArchiveError("BIG archives cannot exceed 4 GiB")
+    data_size = int(archive.metadata["data_size"]) + size_delta
+
+    file.seek(toc_offset)
+    file.write(struct.pack(f"<{len(table)}I", *table))
+    file.seek(toc_offset + toc_count * BigArchive.ENTRY_SIZE + 4)
+    file.write(struct.pack("<I", file_size))
+    file.seek(DATA_SIZE_FIELD_OFFSET)
+    file.write(struct.pack("<I", max(data_size, 0)))
@@ -0,0 +1,102 @@
+"""Content-addressed store for deduplicated resource data."""
+
+import hashlib
+import itertools
+import os
+import shutil
+import threading
+from pathlib import Path
+
+from big_tool.logger import logger
+
+
+BLOB_DIR_NAME = "_blobs"
+
+
+class BlobStore:
+    """
+    Keep one file per unique resource payload, named by its digest.
+
+    Extracted resources become hard links to the stored blob. When the file
+    system cannot link, the resource is written as a normal copy instead.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root).resolve()
+        self._lock = threading.Lock()
+        self._writing: dict[str, threading.Event] = {}
+        self._temp_counter = itertools.count()
+
+    def blob_path(self, digest: str) -> Path:
+        """Return the store location of a digest."""
+        return self.root / digest[:2] / digest
+
+    def put(self, data: bytes | memoryview) -> tuple[Path, bool]:
+        """
+        Store a payload and return its blob path and whether it already existed.
+
+        Safe to call from several threads. Concurrent processes may write the
+        same blob twice; each write replaces the file atomically.
+        """
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        blob_path = self.blob_path(digest)
+        with self._lock:
+            writing = self._writing.get(digest)
+            if writing is None:
+                if blob_path.is_file():
+                    return blob_path, True
+                writing = threading.Event()
+                self._writing[digest] = writing
+                is_owner = True
+            else:
+                is_owner = False
+
+        if not is_owner:
+            writing.wait()
+            return blob_path, True
+
+        try:
+            temp_path = self.temp_path()
+            temp_path.write_bytes(data)
+            blob_path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(temp_path, blob_path)
+        finally:
+            with self._lock:
+                del self._writing[digest]
+            writing.set()
+        return blob_path, False
+
+    def temp_path(self) -> Path:
+        """Return a unique path inside the store for writing a blob in pieces."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        return self.root / f"{os.getpid()}.{next(self._temp_counter)}.tmp"
+
+    def adopt(self, temp_path: Path, digest: str) -> tuple[Path, bool]:
+        """
+        Move a fully written temporary file into the store.
+
+        Returns the blob path and whether the blob already existed, in which
+        case the temporary file is deleted.
+        """
+        blob_path = self.blob_path(digest)
+        with self._lock:
+            writing = self._writing.get(digest)
+        if writing is not None:
+            writing.wait()
+
+        with self._lock:
+            if blob_path.is_file():
+                temp_path.unlink()
+                return blob_path, True
+            blob_path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(temp_path, blob_path)
+        return blob_path, False
+
+    def link(self, blob_path: Path, output_path: Path) -> None:
+        """Create ``output_path`` as a hard link to a blob, or as a copy of it."""
+        output_path.unlink(missing_ok=True)
+        try:
+            os.link(blob_path, output_path)
+        except OSError as error:
+            logger.debug(f"Cannot link {output_path.name}, writing a copy: {error}")
+            shutil.copyfile(blob_path, output_path)
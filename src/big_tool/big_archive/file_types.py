@@ -1,4 +1,19 @@
-"""Resource type detection."""
+"""
+Resource type detection.
+
+Types are recognised from the first bytes of a resource through a table of
+signatures. Each signature has a magic byte string at a fixed offset and
+optional extra checks; magic strings are matched through a prefix trie, so
+the cost of a lookup does not grow with the size of the table. Signatures
+without magic, such as models, are tried last.
+"""
+
+import struct
+import zlib
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from big_tool.big_archive.big_format import ArchiveEntry, BigArchive, BigArchiveError, ResourceHeader
 
 
 TYPE_MAP = {
@@ -9,17 +24,214 @@ TYPE_MAP = {
     0xF686AADC: "manifest",
     0xFD8A7754: "wav",
 }
+# Leading payload bytes that model detection looks at.
+PEEK_SIZE = 256
+# Version, index count, bone count, frame count, and vertex count.
+MODEL_HEADER_SIZE = 10
+# Flag bits in the second magic byte of a string pack.
+STRING_PACK_SEQUENTIAL_IDS = 0x80
+STRING_PACK_WIDE_OFFSETS = 0x40
+
+
+@dataclass(frozen=True)
+class Signature:
+    """
+    How to recognise one resource type from its first bytes.
+
+    ``magic`` must appear at ``offset``; every ``(offset, bytes)`` pair in
+    ``checks`` must match too, and ``validate`` receives the whole head.
+    ``head_size`` is the number of bytes ``validate`` needs.
+    """
+
+    name: str
+    extension: str
+    magic: bytes = b""
+    offset: int = 0
+    checks: tuple[tuple[int, bytes], ...] = ()
+    validate: Callable[[bytes], bool] | None = None
+    head_size: int = 0
+
+    @property
+    def required_size(self) -> int:
+        """Return the number of leading bytes needed to match this signature."""
+        size = max(self.offset + len(self.magic), self.head_size)
+        for check_offset, expected in self.checks:
+            size = max(size, check_offset + len(expected))
+        return size
+
+    def matches(self, head: bytes) -> bool:
+        """Return whether ``head`` has this signature."""
+        if head[self.offset:self.offset + len(self.magic)] != self.magic:
+            return False
+        for check_offset, expected in self.checks:
+            if head[check_offset:check_offset + len(expected)] != expected:
+                return False
+        return self.validate is None or self.validate(head)
+
+
+class SignatureTable:
+    """Signatures indexed by a prefix trie of their magic bytes at each offset."""
+
+    def __init__(self, signatures: list[Signature] | None = None):
+        self._tries: dict[int, dict] = {}
+        self._fallbacks: list[Signature] = []
+        self.head_size = 0
+        for signature in signatures or []:
+            self.add(signature)
+
+    def add(self, signature: Signature) -> None:
+        """Add a signature; on a tie in magic length, the signature added first wins."""
+        self.head_size = max(self.head_size, signature.required_size)
+        if not signature.magic:
+            self._fallbacks.append(signature)
+            return
+
+        node = self._tries.setdefault(signature.offset, {})
+        for byte in signature.magic:
+            node = node.setdefault(byte, {})
+        node.setdefault(None, []).append(signature)
+
+    def match(self, head: bytes | memoryview) -> Signature | None:
+        """Return the signature with the longest matching magic, or None."""
+        head = bytes(head[:self.head_size])
+        candidates: list[Signature] = []
+        for offset, node in self._tries.items():
+            for byte in head[offset:]:
+                node = node.get(byte)
+                if node is None:
+                    break
+                candidates.extend(node.get(None, ()))
+        candidates.sort(key=_magic_length, reverse=True)
+
+        for signature in candidates:
+            if signature.matches(head):
+                return signature
+        for signature in self._fallbacks:
+            if signature.matches(head):
+                return signature
+        return None
+
+
+def _magic_length(signature: Signature) -> int:
+    return len(signature.magic)
+
+
+def _is_string_pack(head: bytes) -> bool:
+    """
+    Check that the first string offset lies past the tables of the pack variant.
+
+    The second magic byte selects the variant: 0x80 means sequential IDs and
+    0x40 adds a reserved 16-bit value after each offset. Either way the
+    first 16-bit offset is at byte 6.
+    """
+    if len(head) < 8:
+        return False
+    count, first_offset = struct.unpack_from("<H2xH", head, 2)
+    if count == 0:
+        return False
+    flags = head[1]
+    if flags & STRING_PACK_WIDE_OFFSETS:
+        tables_end = 6 + 4 * count + 4
+    elif flags & STRING_PACK_SEQUENTIAL_IDS:
+        tables_end = 6 + 2 * count + 4
+    else:
+        tables_end = 4 + 4 * count + 4
+    return first_offset >= tables_end + 4 * count
+
+
+def _is_model(head: bytes) -> bool:
+    """
+    Check the model header against the layout that ``convert_single_bin`` reads.
+
+    Models have no magic, so every bone name must fit in ``head`` and look
+    like an identifier, every index in ``head`` must name a vertex, and a
+    payload shorter than ``head`` must hold the whole declared model.
+    """
+    if len(head) < MODEL_HEADER_SIZE:
+        return False
+    _version, index_count, bone_count, frame_count, vertex_count = struct.unpack_from("<BIBHH", head)
+    if not 0 < index_count < 1 << 24 or bone_count == 0 or frame_count == 0 or vertex_count == 0:
+        return False
+
+    position = MODEL_HEADER_SIZE
+    for _ in range(bone_count):
+        if position >= len(head):
+            return False
+        name_length = head[position]
+        name = head[position + 1:position + 1 + name_length]
+        if len(name) != name_length or name_length == 0:
+            return False
+        if not name.isascii() or not name.replace(b"_", b"").isalnum():
+            return False
+        position += 1 + name_length
+
+    index_end = position + 2 * index_count
+    model_size = index_end + 8 * vertex_count + frame_count * (4 + bone_count * 28 + vertex_count * 12)
+    if len(head) < min(model_size, PEEK_SIZE):
+        return False
+    index_bytes = head[position:min(index_end, len(head))]
+    indices = struct.unpack_from(f"<{len(index_bytes) // 2}H", index_bytes)
+    return not indices or max(indices) < vertex_count
+
+
+SIGNATURES = [
+    Signature("png", ".png", b"\x89PNG\r\n\x1a\n"),
+    Signature("wav", ".wav", b"RIFF", checks=((8, b"WAVE"),)),
+    Signature("webp", ".webp", b"RIFF", checks=((8, b"WEBP"),)),
+    Signature("ogg", ".ogg", b"OggS"),
+    Signature("mp3", ".mp3", b"ID3"),
+    Signature("mp4", ".mp4", b"ftyp", offset=4),
+    Signature("jpg", ".jpg", b"\xff\xd8\xff"),
+    Signature("gif", ".gif", b"GIF87a"),
+    Signature("gif", ".gif", b"GIF89a"),
+    Signature("dds", ".dds", b"DDS |"),
+    Signature("ktx", ".ktx", b"\xabKTX 11\xbb\r\n\x1a\n"),
+    Signature("ktx2", ".ktx2", b"\xabKTX 20\xbb\r\n\x1a\n"),
+    Signature("pkm", ".pkm", b"PKM 10"),
+    Signature("pkm", ".pkm", b"PKM 20"),
+    Signature("pvr", ".pvr", b"PVR\x03"),
+    Signature("astc", ".astc", b"\x13\xab\xa1\x5c"),
+    Signature("zip", ".zip", b"PK\x03\x04"),
+    Signature("xml", ".xml", b"<?xml"),
+    Signature("string_pack", ".bin", b"\x00\x20", validate=_is_string_pack, head_size=8),
+    Signature("string_pack", ".bin", b"\x00\xa0", validate=_is_string_pack, head_size=8),
+    Signature("string_pack", ".bin", b"\x00\xe0", validate=_is_string_pack, head_size=8),
+    # Models have no magic; converter.convert_directory expects them as .bin.
+    Signature("model", ".bin", validate=_is_model, head_size=PEEK_SIZE),
+]
+SIGNATURE_TABLE = SignatureTable(SIGNATURES)
+GROUP_SIGNATURES = {
+    0xF686AADC: Signature("manifest", ".txt"),
+}
+UNKNOWN_SIGNATURE = Signature("bin", ".bin")
+
+
+def detect_signature(data: bytes | memoryview, group_hash: int | None = None) -> Signature:
+    """Return the signature of a resource from its first bytes and group hash."""
+    group_signature = GROUP_SIGNATURES.get(group_hash)
+    if group_signature is not None:
+        return group_signature
+    signature = SIGNATURE_TABLE.match(data)
+    if signature is None:
+        return UNKNOWN_SIGNATURE
+    return signature
 
 
-def guess_extension(data: bytes, group_hash: int | None = None) -> str:
+def guess_extension(data: bytes | memoryview, group_hash: int | None = None) -> str:
     """Guess an output extension from data and group hash."""
-    if group_hash == 0xF686AADC:
-        return ".txt"
+    return detect_signature(data, group_hash).extension
 
-    if data.startswith(b"\x89PNG"):
-        return ".png"
 
-    if data.startswith(b"RIFF") and data[8:12] == b"WAVE":
-        return ".wav"
+def detect_entry_type(archive: BigArchive, entry: ArchiveEntry, header: ResourceHeader) -> str:
+    """Return the manifest type, decompressing only the first bytes of the payload."""
+    mapped_type = TYPE_MAP.get(entry.group_hash)
+    if mapped_type is not None:
+        return mapped_type
+    if header.is_ref:
+        return "ref"
 
-    return ".bin"
+    try:
+        head = archive.peek_entry(entry, SIGNATURE_TABLE.head_size)
+    except (zlib.error, BigArchiveError):
+        head = b""
+    return detect_signature(head, entry.group_hash).name
@@ -0,0 +1,190 @@
+"""Streaming resource manifest writers."""
+
+import csv
+import sqlite3
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import TextIO
+
+
+MANIFEST_HEADERS = [
+    "id",
+    "section",
+    "sub_group",
+    "type",
+    "Offset",
+    "compressed?",
+    "compressed size",
+    "original size",
+    "error",
+]
+DEDUP_HEADERS = ["blob", "deduplicated"]
+MANIFEST_FORMATS = ("csv", "sqlite")
+
+
+class ManifestWriter(ABC):
+    """
+    Write manifest rows to disk as soon as they are produced.
+
+    The output file is created on the first row, so archives without
+    entries do not leave an empty manifest behind.
+    """
+
+    def __init__(self, path: Path, archive_name: str, headers: list[str] = MANIFEST_HEADERS):
+        self.path = Path(path)
+        self.archive_name = archive_name
+        self.headers = headers
+        self.row_count = 0
+
+    def __enter__(self) -> "ManifestWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def write_row(self, row: dict[str, object]) -> None:
+        """Append one manifest row."""
+        if self.row_count == 0:
+            self._open()
+        self._write(row)
+        self.row_count += 1
+
+    def close(self) -> None:
+        """Flush and close the manifest file."""
+
+    @abstractmethod
+    def _open(self) -> None:
+        """Create the output file and write its header."""
+
+    @abstractmethod
+    def _write(self, row: dict[str, object]) -> None:
+        """Write one row to the open output."""
+
+
+class CsvManifestWriter(ManifestWriter):
+    """Write ``<stem>_resources.csv``."""
+
+    def __init__(self, path: Path, archive_name: str, headers: list[str] = MANIFEST_HEADERS):
+        super().__init__(path, archive_name, headers)
+        self._file: TextIO | None = None
+        self._writer: csv.DictWriter | None = None
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _open(self) -> None:
+        self._file = self.path.open("w", newline="", encoding="utf-8-sig")
+        self._writer = csv.DictWriter(self._file, fieldnames=self.headers)
+        self._writer.writeheader()
+
+    def _write(self, row: dict[str, object]) -> None:
+        self._writer.writerow(row)
+
+
+class SqliteManifestWriter(ManifestWriter):
+    """
+    Write ``<stem>_resources.sqlite`` with an indexed ``resources`` table.
+
+    Columns follow the CSV manifest plus the archive name. ``offset`` is
+    stored as an integer so it can be range-queried. The deduplication
+    columns stay empty unless deduplication is enabled.
+    """
+
+    BATCH_SIZE = 1000
+    CREATE_SQL = (
+        "CREATE TABLE resources ("
+        "archive TEXT NOT NULL, "
+        "id INTEGER NOT NULL, "
+        "section TEXT, "
+        "sub_group TEXT NOT NULL, "
+        "type TEXT NOT NULL, "
+        "offset INTEGER NOT NULL, "
+        "compressed TEXT, "
+        "compressed_size INTEGER, "
+        "original_size INTEGER, "
+        "error TEXT, "
+        "blob TEXT, "
+        "deduplicated TEXT)"
+    )
+    INDEX_SQL = (
+        "CREATE INDEX resources_sub_group ON resources (sub_group)",
+        "CREATE INDEX resources_type ON resources (type)",
+        "CREATE INDEX resources_offset ON resources (offset)",
+    )
+    INSERT_SQL = "INSERT INTO resources VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+
+    def __init__(self, path: Path, archive_name: str, headers: list[str] = MANIFEST_HEADERS):
+        super().__init__(path, archive_name, headers)
+        self._connection: sqlite3.Connection | None = None
+        self._batch: list[tuple[object, ...]] = []
+
+    def close(self) -> None:
+        if self._connection is None:
+            return
+
+        self._flush()
+        self._connection.close()
+        self._connection = None
+
+    def _open(self) -> None:
+        self.path.unlink(missing_ok=True)
+        self._connection = sqlite3.connect(self.path)
+        self._connection.execute(self.CREATE_SQL)
+        for statement in self.INDEX_SQL:
+            self._connection.execute(statement)
+        self._connection.commit()
+
+    def _write(self, row: dict[str, object]) -> None:
+        self._batch.append(
+            (
+                self.archive_name,
+                row["id"],
+                row["section"],
+                row["sub_group"],
+                row["type"],
+                int(str(row["Offset"]), 16),
+                row["compressed?"],
+                row["compressed size"],
+                row["original size"],
+                row.get("error"),
+                row.get("blob"),
+                row.get("deduplicated"),
+            )
+        )
+        if len(self._batch) >= self.BATCH_SIZE:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._batch:
+            return
+
+        self._connection.executemany(self.INSERT_SQL, self._batch)
+        self._connection.commit()
+        self._batch = []
+
+
+def open_manifest_writer(
+    manifest_format: str,
+    output_dir: Path,
+    archive_path: Path,
+    dedup: bool = False,
+) -> ManifestWriter:
+    """Create the manifest writer for one archive output directory."""
+    archive_path = Path(archive_path)
+    headers = MANIFEST_HEADERS
+    if dedup:
+        headers = MANIFEST_HEADERS + DEDUP_HEADERS
+
+    path = manifest_path(manifest_format, output_dir, archive_path)
+    if manifest_format == "csv":
+        return CsvManifestWriter(path, archive_path.name, headers)
+    return SqliteManifestWriter(path, archive_path.name, headers)
+
+
+def manifest_path(manifest_format: str, output_dir: Path, archive_path: Path) -> Path:
+    """Return the manifest file of one archive output directory."""
+    if manifest_format not in MANIFEST_FORMATS:
+        raise ValueError(f"Unsupported manifest format: {manifest_format}")
+    return Path(output_dir) / f"{Path(archive_path).stem}_resources.{manifest_format}"
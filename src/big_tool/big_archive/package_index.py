@@ -0,0 +1,325 @@
+"""
+Persistent SQLite index of the resources in an asset package.
+
+The index stores one row per archive entry. It is built from the TOC, the
+resource block headers, the first decompressed bytes of each payload for
+type detection, and a digest of each stored (possibly compressed) block.
+Archives whose size and modification time are unchanged are not read again
+on update, unless they failed to index last time.
+"""
+
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from big_tool.big_archive.big_extractor import find_archives
+from big_tool.big_archive.big_format import ArchiveEntry, BigArchive, BigArchiveError
+from big_tool.big_archive.file_types import detect_entry_type
+from big_tool.big_archive.unpack_state import entry_digest
+from big_tool.logger import logger
+
+
+INDEX_FILE_NAME = "big_tool_index.sqlite"
+INDEX_VERSION = 3
+
+
+@dataclass(frozen=True)
+class IndexedEntry:
+    """One archive entry as stored in the package index."""
+
+    archive: str
+    index: int
+    group_hash: int
+    offset: int
+    size: int
+    compressed: bool
+    original_size: int
+    resource_type: str
+    block_digest: str
+    error: str | None = None
+
+
+@dataclass(frozen=True)
+class EntryQuery:
+    """
+    Filters for ``PackageIndex.query``; unset fields match everything.
+
+    ``archive`` is a glob pattern matched against the archive path relative
+    to the package. Size limits apply to the original (decompressed) size.
+    ``block_digest`` matches the digest of the stored block, not of the
+    decompressed payload.
+    """
+
+    group_hash: int | None = None
+    resource_type: str | None = None
+    archive: str | None = None
+    min_size: int | None = None
+    max_size: int | None = None
+    compressed: bool | None = None
+    block_digest: str | None = None
+    limit: int | None = None
+
+
+@dataclass(frozen=True)
+class IndexUpdate:
+    """Counts from one index update."""
+
+    indexed_archives: int
+    unchanged_archives: int
+    removed_archives: int
+    entry_count: int
+
+
+@dataclass(frozen=True)
+class _ArchiveRows:
+    """Index rows read from one archive by a worker."""
+
+    size: int
+    mtime_ns: int
+    rows: list[tuple[object, ...]]
+    error: str | None = None
+
+
+class PackageIndex:
+    """Read and update the SQLite resource index of an asset package."""
+
+    CREATE_SQL = (
+        "CREATE TABLE IF NOT EXISTS archives ("
+        "id INTEGER PRIMARY KEY, "
+        "path TEXT NOT NULL UNIQUE, "
+        "size INTEGER NOT NULL, "
+        "mtime_ns INTEGER NOT NULL, "
+        "entry_count INTEGER NOT NULL, "
+        "error TEXT)",
+        "CREATE TABLE IF NOT EXISTS entries ("
+        "archive_id INTEGER NOT NULL, "
+        "idx INTEGER NOT NULL, "
+        "group_hash INTEGER NOT NULL, "
+        "offset INTEGER NOT NULL, "
+        "size INTEGER NOT NULL, "
+        "compressed INTEGER NOT NULL, "
+        "original_size INTEGER NOT NULL, "
+        "type TEXT NOT NULL, "
+        "block_digest TEXT NOT NULL, "
+        "error TEXT, "
+        "PRIMARY KEY (archive_id, idx)) WITHOUT ROWID",
+        "CREATE INDEX IF NOT EXISTS entries_group_size ON entries (group_hash, original_size)",
+        "CREATE INDEX IF NOT EXISTS entries_type_size ON entries (type, original_size)",
+        "CREATE INDEX IF NOT EXISTS entries_original_size ON entries (original_size)",
+        "CREATE INDEX IF NOT EXISTS entries_block_digest ON entries (block_digest)",
+    )
+    INSERT_SQL = "INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+    SELECT_SQL = (
+        "SELECT archives.path, entries.idx, entries.group_hash, entries.offset, entries.size, "
+        "entries.compressed, entries.original_size, entries.type, entries.block_digest, entries.error "
+        "FROM entries JOIN archives ON archives.id = entries.archive_id"
+    )
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(self.path)
+        self._create_schema()
+
+    def __enter__(self) -> "PackageIndex":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the index database."""
+        self._connection.close()
+
+    def update(self, package_dir: Path, recursive: bool = True, jobs: int = 1) -> IndexUpdate:
+        """
+        Bring the index up to date with the archives of a package directory.
+
+        New archives, archives whose size or modification time changed, and
+        archives that failed last time are read again; entries of deleted
+        archives are removed. With ``jobs`` greater than one, archives are
+        read in worker processes.
+        """
+        package_dir = Path(package_dir).resolve()
+        if jobs < 1:
+            raise ValueError(f"Invalid job count: {jobs}")
+
+        known: dict[str, tuple[int, int, int]] = {}
+        failed: set[str] = set()
+        for archive_id, path, size, mtime_ns, error in self._connection.execute(
+            "SELECT id, path, size, mtime_ns, error FROM archives"
+        ):
+            known[path] = (archive_id, size, mtime_ns)
+            if error is not None:
+                failed.add(path)
+
+        changed: list[Path] = []
+        unchanged_count = 0
+        for archive_path in find_archives(package_dir, recursive=recursive):
+            key = archive_path.relative_to(package_dir).as_posix()
+            record = known.pop(key, None)
+            stat = archive_path.stat()
+            if record is not None and record[1:] == (stat.st_size, stat.st_mtime_ns) and key not in failed:
+                unchanged_count += 1
+            else:
+                changed.append(archive_path)
+
+        with self._connection:
+            for archive_id, _size, _mtime_ns in known.values():
+                self._delete_archive(archive_id)
+
+        entry_count = 0
+        if jobs == 1 or len(changed) <= 1:
+            for archive_path in changed:
+                entry_count += self._store(package_dir, archive_path, _read_archive_rows(archive_path))
+        else:
+            changed.sort(key=_file_size, reverse=True)
+            with ProcessPoolExecutor(max_workers=min(jobs, len(changed))) as executor:
+                futures = {}
+                for archive_path in changed:
+                    futures[archive_path] = executor.submit(_read_archive_rows, archive_path)
+                for archive_path, future in futures.items():
+                    entry_count += self._store(package_dir, archive_path, future.result())
+
+        logger.info(
+            f"Indexed {len(changed)} archives ({entry_count} entries), "
+            f"{unchanged_count} unchanged, {len(known)} removed"
+        )
+        return IndexUpdate(len(changed), unchanged_count, len(known), entry_count)
+
+    def query(self, query: EntryQuery) -> list[IndexedEntry]:
+        """Return indexed entries matching all filters, ordered by archive and index."""
+        conditions: list[str] = []
+        parameters: list[object] = []
+        if query.group_hash is not None:
+            conditions.append("entries.group_hash = ?")
+            parameters.append(query.group_hash)
+        if query.resource_type is not None:
+            conditions.append("entries.type = ?")
+            parameters.append(query.resource_type)
+        if query.archive is not None:
+            conditions.append("archives.path GLOB ?")
+            parameters.append(query.archive)
+        if query.min_size is not None:
+            conditions.append("entries.original_size >= ?")
+            parameters.append(query.min_size)
+        if query.max_size is not None:
+            conditions.append("entries.original_size <= ?")
+            parameters.append(query.max_size)
+        if query.compressed is not None:
+            conditions.append("entries.compressed = ?")
+            parameters.append(int(query.compressed))
+        if query.block_digest is not None:
+            conditions.append("entries.block_digest = ?")
+            parameters.append(query.block_digest)
+
+        sql = self.SELECT_SQL
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY archives.path, entries.idx"
+        if query.limit is not None:
+            sql += " LIMIT ?"
+            parameters.append(query.limit)
+
+        results: list[IndexedEntry] = []
+        for row in self._connection.execute(sql, parameters):
+            archive, index, group_hash, offset, size, compressed, original_size, resource_type, digest, error = row
+            results.append(
+                IndexedEntry(
+                    archive,
+                    index,
+                    group_hash,
+                    offset,
+                    size,
+                    bool(compressed),
+                    original_size,
+                    resource_type,
+                    digest,
+                    error,
+                )
+            )
+        return results
+
+    def _create_schema(self) -> None:
+        version = self._connection.execute("PRAGMA user_version").fetchone()[0]
+        if version not in {0, INDEX_VERSION}:
+            logger.warning(f"Rebuilding package index {self.path.name} with format version {INDEX_VERSION}")
+            with self._connection:
+                self._connection.execute("DROP TABLE IF EXISTS entries")
+                self._connection.execute("DROP TABLE IF EXISTS archives")
+
+        with self._connection:
+            for statement in self.CREATE_SQL:
+                self._connection.execute(statement)
+            self._connection.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+
+    def _delete_archive(self, archive_id: int) -> None:
+        self._connection.execute("DELETE FROM entries WHERE archive_id = ?", (archive_id,))
+        self._connection.execute("DELETE FROM archives WHERE id = ?", (archive_id,))
+
+    def _store(self, package_dir: Path, archive_path: Path, archive_rows: _ArchiveRows) -> int:
+        """Replace the rows of one archive in a single transaction."""
+        key = archive_path.relative_to(package_dir).as_posix()
+        if archive_rows.error is not None:
+            logger.error(f"Failed to index {archive_path.name}: {archive_rows.error}")
+
+        with self._connection:
+            existing = self._connection.execute("SELECT id FROM archives WHERE path = ?", (key,)).fetchone()
+            if existing is not None:
+                self._delete_archive(existing[0])
+            cursor = self._connection.execute(
+                "INSERT INTO archives (path, size, mtime_ns, entry_count, error) VALUES (?, ?, ?, ?, ?)",
+                (key, archive_rows.size, archive_rows.mtime_ns, len(archive_rows.rows), archive_rows.error),
+            )
+            archive_id = cursor.lastrowid
+            rows: list[tuple[object, ...]] = []
+            for row in archive_rows.rows:
+                rows.append((archive_id,) + row)
+            self._connection.executemany(self.INSERT_SQL, rows)
+        return len(rows)
+
+
+def default_index_path(package_dir: Path) -> Path:
+    """Return the default index location of a package: its ``<input>_out`` sibling, so the input stays unchanged."""
+    package_dir = Path(package_dir).resolve()
+    return package_dir.with_name(f"{package_dir.name}_out") / INDEX_FILE_NAME
+
+
+def _read_archive_rows(archive_path: Path) -> _ArchiveRows:
+    """Read the index rows of one archive; errors are returned, not raised."""
+    stat = Path(archive_path).stat()
+    rows: list[tuple[object, ...]] = []
+    try:
+        with BigArchive(archive_path, use_mmap=True) as archive:
+            archive.parse()
+            for entry in archive.entries:
+                rows.append(_entry_row(archive, entry))
+    except (OSError, ValueError, BigArchiveError) as error:
+        return _ArchiveRows(stat.st_size, stat.st_mtime_ns, rows, str(error))
+    return _ArchiveRows(stat.st_size, stat.st_mtime_ns, rows)
+
+
+def _entry_row(archive: BigArchive, entry: ArchiveEntry) -> tuple[object, ...]:
+    digest = entry_digest(archive, entry)
+    try:
+        header = archive.read_entry_header(entry)
+    except ValueError as error:
+        return (entry.index, entry.group_hash, entry.offset, entry.size, 0, 0, "error", digest, str(error))
+
+    resource_type = detect_entry_type(archive, entry, header)
+    return (
+        entry.index,
+        entry.group_hash,
+        entry.offset,
+        entry.size,
+        int(header.is_compressed),
+        header.original_size,
+        resource_type,
+        digest,
+        None,
+    )
+
+
+def _file_size(path: Path) -> int:
+    return path.stat().st_size
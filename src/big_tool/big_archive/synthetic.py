@@ -0,0 +1,219 @@
+"""
+Synthetic FGIB/BIG archive generator.
+
+The generated archives follow the layout read by ``BigArchive``:
+header, main TOC, footer, then resource blocks. Payloads are valid PNG/WAV
+signatures, string packs readable by ``ResourceStringExtractor``, and models
+readable by ``convert_single_bin``. Output is deterministic for a given seed.
+"""
+
+import random
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+
+from big_tool.big_archive.big_format import BigArchive
+from big_tool.big_archive.big_writer import encode_block, encode_ref_block, pack_header
+
+
+STRING_PACK_GROUP = 0x69E4C505
+PNG_GROUP = 0xB7178678
+BIN_GROUP = 0xF4E02223
+MANIFEST_GROUP = 0xF686AADC
+WAV_GROUP = 0xFD8A7754
+
+STRING_RESOURCE_TYPE = 0xF686AADC
+
+
+@dataclass(frozen=True)
+class SyntheticResource:
+    """One resource to store in a synthetic archive."""
+
+    group_hash: int
+    payload: bytes
+    compressed: bool = True
+    is_ref: bool = False
+
+
+def build_png(size: int, rng: random.Random) -> bytes:
+    """Return PNG-signed data of roughly ``size`` bytes."""
+    signature = b"\x89PNG\r\n\x1a\n"
+    return signature + rng.randbytes(max(size - len(signature), 0))
+
+
+def build_wav(size: int, rng: random.Random) -> bytes:
+    """Return a RIFF/WAVE header followed by low-entropy sample data."""
+    sample_count = max(size - 44, 0) // 2
+    period: list[int] = []
+    value = 0
+    for _ in range(min(sample_count, 2048)):
+        value = (value + rng.randrange(-64, 65)) & 0xFFFF
+        period.append(value)
+    cycle = struct.pack(f"<{len(period)}H", *period)
+    samples = (cycle * (sample_count // max(len(period), 1) + 1))[:sample_count * 2]
+    header = struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF",
+        36 + len(samples),
+        b"WAVE",
+        b"fmt ",
+        16,
+        1,
+        1,
+        22050,
+        44100,
+        2,
+        16,
+        b"data",
+        len(samples),
+    )
+    return header + samples
+
+
+def build_string_pack(strings: list[str]) -> bytes:
+    """Return a ``00 a0`` string pack containing the given strings."""
+    count = len(strings)
+    if not 0 < count < 0x10000:
+        raise ValueError(f"Invalid string count: {count}")
+
+    bodies: list[bytes] = []
+    for text in strings:
+        bodies.append(b"\x00\x00\x00\x00" + text.encode("utf-8") + b"\x00")
+
+    data_start = 8 + count * 2 + 2 + count * 4
+    end_offsets: list[int] = []
+    position = data_start
+    for body in bodies:
+        position += len(body)
+        end_offsets.append(position)
+    if position > 0xFFFF:
+        raise ValueError("String pack is too large for 16-bit offsets")
+
+    header = b"\x00\xa0" + struct.pack("<HHH", count, 0, data_start)
+    offsets = struct.pack(f"<{count}H", *end_offsets)
+    types = struct.pack(f"<{count}I", *([STRING_RESOURCE_TYPE] * count))
+    return header + offsets + b"\x00\x00" + types + b"".join(bodies)
+
+
+def build_model(
+    rng: random.Random,
+    vertex_count: int = 64,
+    index_count: int = 96,
+    frame_count: int = 4,
+    bone_count: int = 2,
+) -> bytes:
+    """Return an animated model readable by ``convert_single_bin``."""
+    parts = [struct.pack("<BIBHH", 1, index_count, bone_count, frame_count, vertex_count)]
+    for bone in range(bone_count):
+        name = f"bone{bone}".encode("ascii")
+        parts.append(struct.pack("B", len(name)) + name)
+    for _ in range(index_count):
+        parts.append(struct.pack("<H", rng.randrange(vertex_count)))
+    for _ in range(vertex_count):
+        parts.append(struct.pack("<ff", rng.random(), rng.random()))
+    for frame in range(frame_count):
+        parts.append(struct.pack("<I", frame * 33))
+        parts.append(bytes(bone_count * 28))
+        for _ in range(vertex_count):
+            parts.append(struct.pack("<fff", rng.random(), rng.random(), rng.random()))
+    return b"".join(parts)
+
+
+def build_binary(size: int, rng: random.Random) -> bytes:
+    """Return compressible binary data with some random content."""
+    words = [rng.randbytes(8) for _ in range(16)]
+    parts: list[bytes] = []
+    length = 0
+    while length < size:
+        word = rng.choice(words)
+        parts.append(word)
+        length += len(word)
+    return b"".join(parts)[:size]
+
+
+def generate_resources(count: int, seed: int = 0, payload_size: int = 4096) -> list[SyntheticResource]:
+    """Return a deterministic mix of resource types around ``payload_size`` bytes."""
+    rng = random.Random(seed)
+    resources: list[SyntheticResource] = []
+    for index in range(count):
+        size = max(16, int(rng.uniform(0.25, 1.75) * payload_size))
+        kind = index % 10
+        if kind == 9:
+            resources.append(SyntheticResource(MANIFEST_GROUP, b"", is_ref=True))
+            continue
+
+        if kind in {0, 1}:
+            group_hash, payload = PNG_GROUP, build_png(size, rng)
+        elif kind == 2:
+            group_hash, payload = WAV_GROUP, build_wav(size, rng)
+        elif kind == 3:
+            strings = [f"String {index}-{number} {rng.random():.6f}" for number in range(max(1, size // 48))]
+            group_hash, payload = STRING_PACK_GROUP, build_string_pack(strings[:1000])
+        elif kind == 4:
+            vertex_count = max(4, size // 64)
+            group_hash, payload = BIN_GROUP, build_model(rng, vertex_count, vertex_count * 3 // 2)
+        elif kind == 5:
+            group_hash, payload = MANIFEST_GROUP, f"manifest {index}\n".encode("utf-8") * (size // 16)
+        else:
+            group_hash, payload = BIN_GROUP, build_binary(size, rng)
+
+        resources.append(SyntheticResource(group_hash, payload, compressed=rng.random() < 0.7))
+    return resources
+
+
+def encode_resource(resource: SyntheticResource) -> bytes:
+    """Return the stored block for one resource."""
+    if resource.is_ref:
+        return encode_ref_block()
+    return encode_block(resource.payload, resource.compressed)
+
+
+def write_archive(path: Path, resources: list[SyntheticResource]) -> Path:
+    """Write resources to a BIG archive and return its path."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    count = len(resources)
+    toc_offset = BigArchive.HEADER_SIZE
+    data_offset = toc_offset + count * BigArchive.ENTRY_SIZE + BigArchive.FOOTER_SIZE
+
+    blocks: list[bytes] = []
+    table: list[tuple[int, int]] = []
+    position = data_offset
+    for resource in resources:
+        block = encode_resource(resource)
+        blocks.append(block)
+        table.append((resource.group_hash, position))
+        position += len(block)
+    file_size = position
+
+    # The TOC is grouped by hash; the parser orders entries by offset again.
+    table.sort(key=_table_group)
+    with path.open("wb") as file:
+        file.write(pack_header(count, data_offset, file_size - data_offset, toc_offset))
+        for group_hash, offset in table:
+            file.write(struct.pack(BigArchive.ENTRY_FORMAT, group_hash, offset))
+        file.write(struct.pack("<II", 0, file_size))
+        for block in blocks:
+            file.write(block)
+    return path
+
+
+def generate_package(
+    directory: Path,
+    archive_count: int = 4,
+    entries_per_archive: int = 1000,
+    payload_size: int = 4096,
+    seed: int = 0,
+) -> list[Path]:
+    """Write an asset package of synthetic archives and return their paths."""
+    directory = Path(directory)
+    archives: list[Path] = []
+    for number in range(archive_count):
+        resources = generate_resources(entries_per_archive, seed + number, payload_size)
+        archives.append(write_archive(directory / f"synthetic_{number}.big", resources))
+    return archives
+
+
+def _table_group(item: tuple[int, int]) -> int:
+    """Return the group hash of a table entry."""
+    return item[0]
@@ -0,0 +1,116 @@
+"""Saved extraction state for incremental unpacking."""
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from big_tool.big_archive.big_format import ArchiveEntry, ArchiveToc, BigArchive, BigArchiveError
+from big_tool.logger import logger
+
+
+STATE_FILE_NAME = ".big_tool_state.json"
+STATE_VERSION = 3
+DIGEST_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class ArchiveState:
+    """
+    What an output directory was last extracted from.
+
+    Each item in ``entries`` describes one written resource:
+    ``group_hash``, ``digest``, ``path`` (relative to the output directory),
+    ``size``, and its manifest ``row``. ``dedup`` records whether resources
+    were hard links into a blob store, which changes their manifest columns,
+    and ``manifest_format`` which manifest file was written.
+    """
+
+    archive_size: int
+    archive_mtime_ns: int
+    toc_digest: str
+    entries: list[dict[str, object]] = field(default_factory=list)
+    dedup: bool = False
+    manifest_format: str = "csv"
+
+    def matches_archive(self, archive_path: Path) -> bool:
+        """Return whether an archive file still has the recorded size and mtime."""
+        stat = Path(archive_path).stat()
+        return stat.st_size == self.archive_size and stat.st_mtime_ns == self.archive_mtime_ns
+
+    def outputs_exist(self, output_dir: Path) -> bool:
+        """Return whether every recorded resource file is still in the output directory."""
+        output_dir = Path(output_dir)
+        for item in self.entries:
+            if not (output_dir / str(item["path"])).is_file():
+                return False
+        return True
+
+
+def block_digest(block: bytes | memoryview) -> str:
+    """Return the content digest of a stored resource block."""
+    return hashlib.blake2b(block, digest_size=16).hexdigest()
+
+
+def entry_digest(archive: BigArchive, entry: ArchiveEntry, chunk_size: int = DIGEST_CHUNK_SIZE) -> str:
+    """Return the ``block_digest`` of a stored block, reading it in chunks."""
+    digest = hashlib.blake2b(digest_size=16)
+    offset = entry.offset
+    end = entry.offset + entry.size
+    while offset < end:
+        chunk = archive.read_range(offset, min(chunk_size, end - offset))
+        if not chunk:
+            raise BigArchiveError(f"Resource {entry.index} is truncated")
+        digest.update(chunk)
+        offset += len(chunk)
+    return digest.hexdigest()
+
+
+def toc_digest(toc: ArchiveToc) -> str:
+    """Return a digest of the group hashes and offsets in a table of contents."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(toc.group_hashes.tobytes())
+    digest.update(toc.offsets.tobytes())
+    return digest.hexdigest()
+
+
+def load_state(output_dir: Path) -> ArchiveState | None:
+    """Read the state file of an output directory, or None if it is missing or invalid."""
+    state_path = Path(output_dir) / STATE_FILE_NAME
+    if not state_path.is_file():
+        return None
+
+    try:
+        data = json.loads(state_path.read_text(encoding="utf-8"))
+        if data.get("version") != STATE_VERSION:
+            return None
+        return ArchiveState(
+            int(data["archive_size"]),
+            int(data["archive_mtime_ns"]),
+            str(data["toc_digest"]),
+            list(data["entries"]),
+            bool(data["dedup"]),
+            str(data["manifest_format"]),
+        )
+    except (OSError, ValueError, KeyError, TypeError) as error:
+        logger.warning(f"Ignoring unreadable state file {state_path}: {error}")
+        return None
+
+
+def save_state(output_dir: Path, state: ArchiveState) -> Path:
+    """Write the state file of an output directory atomically."""
+    state_path = Path(output_dir) / STATE_FILE_NAME
+    temp_path = state_path.with_name(f"{STATE_FILE_NAME}.tmp")
+    data = {
+        "version": STATE_VERSION,
+        "archive_size": state.archive_size,
+        "archive_mtime_ns": state.archive_mtime_ns,
+        "toc_digest": state.toc_digest,
+        "entries": state.entries,
+        "dedup": state.dedup,
+        "manifest_format": state.manifest_format,
+    }
+    temp_path.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+    os.replace(temp_path, state_path)
+    return state_path
@@ -1,17 +1,55 @@
 """Command-line entry point for big-tool."""
 
 import argparse
+import json
+import shutil
+import sys
+import time
+import zlib
+from dataclasses import asdict
 from pathlib import Path
 
-from big_tool.analysis.search import SearchOptions, search_path
-from big_tool.big_archive.big_extractor import unpack_directory
+from big_tool.analysis.archive_search import (
+    ArchiveSearchOptions,
+    clear_search_cache,
+    iter_archive_search,
+    search_archives,
+)
+from big_tool.analysis.hash_cracker import (
+    DICTIONARY_FILE_NAME,
+    crack_hashes,
+    default_dictionary_path,
+    expand_template,
+    load_dictionary,
+    package_hashes,
+    read_word_list,
+    save_dictionary,
+)
+from big_tool.analysis.search import VALUE_TYPES, SearchOptions, build_search_plan, iter_search, search_path
+from big_tool.big_archive.archive_stats import ArchiveStats, inspect_archive
+from big_tool.big_archive.big_extractor import EntryFilter, find_archives, unpack_directory
+from big_tool.big_archive.big_format import BigArchive, BigArchiveError
+from big_tool.big_archive.big_writer import patch_archive, repack_archive
+from big_tool.big_archive.file_types import detect_entry_type
+from big_tool.big_archive.manifest import MANIFEST_FORMATS
+from big_tool.big_archive.package_index import INDEX_FILE_NAME, EntryQuery, PackageIndex, default_index_path
 from big_tool.config import get_output_dir, init_app_env
-from big_tool.logger import logger
+from big_tool.logger import logger, route_console_to_stderr
 from big_tool.models.converter import convert_directory
 from big_tool.resources.string_extractor import ResourceStringExtractor, extract_strings_from_directory
+from big_tool.resources.string_index import (
+    SEARCH_MODES,
+    STRING_INDEX_FILE_NAME,
+    StringIndex,
+    default_string_index_path,
+)
+from big_tool.resources.string_table import MERGED_FORMATS
 from big_tool.version import __version__
 
 
+MAX_PRINTED_ISSUES = 20
+
+
 def build_parser() -> argparse.ArgumentParser:
     """Build the command-line parser."""
     parser = argparse.ArgumentParser(prog="big-tool", description="Glu asset analysis toolkit")
@@ -24,20 +62,190 @@ def build_parser() -> argparse.ArgumentParser:
     unpack_parser.add_argument("--no-recursive", action="store_true")
     unpack_parser.add_argument("--no-clean", action="store_true")
     unpack_parser.add_argument("--yes", action="store_true", help="Skip cleanup confirmation")
+    unpack_parser.add_argument("--jobs", type=_parse_count, default=1, help="Number of worker processes")
+    unpack_parser.add_argument("--threads", type=_parse_count, default=1, help="Decompression threads per archive")
+    unpack_parser.add_argument("--mmap", action="store_true", help="Read archives through a memory mapping")
+    unpack_parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only rewrite resources that changed since the last unpack",
+    )
+    unpack_parser.add_argument("--manifest", choices=MANIFEST_FORMATS, default="csv")
+    unpack_parser.add_argument(
+        "--dedup",
+        action="store_true",
+        help="Store identical resources once and hard-link them",
+    )
+    unpack_parser.add_argument(
+        "--strings",
+        action="store_true",
+        help="Write the strings of each string pack to a CSV while unpacking",
+    )
+    unpack_parser.add_argument("--group", type=_parse_int, action="append", help="Only extract this group hash")
+    unpack_parser.add_argument("--type", dest="resource_type", action="append", help="Only extract this resource type")
+    unpack_parser.add_argument(
+        "--index",
+        type=_parse_range,
+        action="append",
+        metavar="FIRST-LAST",
+        help="Only extract entries in this inclusive index range",
+    )
+    unpack_parser.add_argument(
+        "--offset",
+        type=_parse_range,
+        action="append",
+        metavar="FIRST-LAST",
+        help="Only extract entries whose block starts in this inclusive offset range",
+    )
+
+    ls_parser = subparsers.add_parser("ls", help="List the resources of one .big file")
+    ls_parser.add_argument("archive", type=Path)
+
+    inspect_parser = subparsers.add_parser("inspect", help="Summarise .big files from their headers and TOC")
+    inspect_parser.add_argument("input", type=Path, help="A .big file or a directory of them")
+    inspect_parser.add_argument("--json", action="store_true", help="Print JSON instead of tables")
+    inspect_parser.add_argument("--no-recursive", action="store_true")
+
+    cat_parser = subparsers.add_parser("cat", help="Write one resource of a .big file")
+    cat_parser.add_argument("archive", type=Path)
+    cat_parser.add_argument("index", type=_parse_int)
+    cat_parser.add_argument("--output", type=Path, help="Write to a file instead of standard output")
+
+    repack_parser = subparsers.add_parser("repack", help="Replace resources of one .big file")
+    repack_parser.add_argument("archive", type=Path)
+    repack_parser.add_argument(
+        "--replace",
+        type=_parse_replacement,
+        action="append",
+        required=True,
+        metavar="INDEX=FILE",
+        help="Resource index and the file holding its new content",
+    )
+    repack_target = repack_parser.add_mutually_exclusive_group(required=True)
+    repack_target.add_argument("--output", type=Path, help="Write a new archive")
+    repack_target.add_argument(
+        "--in-place",
+        action="store_true",
+        help="Append the new resources to the archive and rewrite its TOC, or repack it when that is not possible",
+    )
+
+    index_parser = subparsers.add_parser("index", help="Build or update the resource index of a package")
+    index_parser.add_argument("input", type=Path)
+    index_parser.add_argument("--index", type=Path, help=f"Index file (default: <input>_out/{INDEX_FILE_NAME})")
+    index_parser.add_argument("--no-recursive", action="store_true")
+    index_parser.add_argument("--jobs", type=_parse_count, default=1, help="Number of worker processes")
+
+    query_parser = subparsers.add_parser("query", help="Look up resources in a package index")
+    query_parser.add_argument("index", type=Path, help="Package directory (its <input>_out index) or index file")
+    query_parser.add_argument("--group", type=_parse_int)
+    query_parser.add_argument("--type", dest="resource_type")
+    query_parser.add_argument("--archive", help="Glob pattern for the archive path")
+    query_parser.add_argument("--size-min", type=_parse_int, help="Minimum original size")
+    query_parser.add_argument("--size-max", type=_parse_int, help="Maximum original size")
+    compression_group = query_parser.add_mutually_exclusive_group()
+    compression_group.add_argument("--compressed", action="store_true", default=None)
+    compression_group.add_argument("--stored", dest="compressed", action="store_false")
+    query_parser.add_argument("--block-digest", help="Digest of the stored block, as listed by the index")
+    query_parser.add_argument("--limit", type=int)
+
+    crack_parser = subparsers.add_parser("crack-hashes", help="Recover resource names from package hashes")
+    crack_parser.add_argument("input", type=Path, help="Package directory or .big file")
+    crack_parser.add_argument("--words", type=Path, action="append", default=[], help="Word list for {word}")
+    crack_parser.add_argument(
+        "--list",
+        dest="word_lists",
+        type=_parse_word_list,
+        action="append",
+        default=[],
+        metavar="NAME=FILE",
+        help="Word list for {NAME}",
+    )
+    crack_parser.add_argument(
+        "--template",
+        action="append",
+        help="Candidate name with {NAME} placeholders; repeat for several (default: {word})",
+    )
+    crack_parser.add_argument("--hash", type=_parse_int, action="append", default=[], help="Also crack this hash")
+    crack_parser.add_argument("--ignore-case", action="store_true")
+    crack_parser.add_argument(
+        "--dictionary",
+        type=Path,
+        help=f"Hash dictionary to update (default: <input>_out/{DICTIONARY_FILE_NAME})",
+    )
+    crack_parser.add_argument("--jobs", type=_parse_count, default=1, help="Number of worker processes")
 
     strings_parser = subparsers.add_parser("strings", help="Extract string resources")
     strings_parser.add_argument("input", type=Path)
     strings_parser.add_argument("--output", type=Path)
+    strings_parser.add_argument("--jobs", type=_parse_count, default=1, help="Number of worker processes")
+    strings_parser.add_argument(
+        "--merged",
+        type=Path,
+        help="Also write every string of a directory to one deduplicated CSV or SQLite table",
+    )
+    strings_parser.add_argument(
+        "--merged-format",
+        choices=MERGED_FORMATS,
+        help="Format of --merged (default: sqlite for .sqlite or .db paths, else csv)",
+    )
+    strings_parser.add_argument("--index", action="store_true", help="Update the full-text string index")
+    strings_parser.add_argument(
+        "--index-file",
+        type=Path,
+        help=f"String index file (default: <input>/{STRING_INDEX_FILE_NAME})",
+    )
+
+    strings_search_parser = subparsers.add_parser("strings-search", help="Search the full-text string index")
+    strings_search_parser.add_argument("index", type=Path, help="Directory passed to strings --index, or index file")
+    strings_search_parser.add_argument("query")
+    strings_search_parser.add_argument(
+        "--mode",
+        choices=SEARCH_MODES,
+        default="substring",
+        help="Match whole words, words with a prefix last word, or any substring",
+    )
+    strings_search_parser.add_argument("--limit", type=int)
 
     search_parser = subparsers.add_parser("search", help="Search binary content")
     search_parser.add_argument("input", type=Path)
-    search_parser.add_argument("--value", required=True)
+    search_parser.add_argument(
+        "--value",
+        action="append",
+        required=True,
+        help="Value to search for; repeat to search several values in one pass",
+    )
     search_parser.add_argument("--mode", choices=["exact", "fuzzy"], default="exact")
     search_parser.add_argument("--little-endian", action="store_true")
+    search_parser.add_argument("--both-endian", action="store_true", help="Search both byte orders")
+    search_parser.add_argument("--all-widths", action="store_true", help="Search integers as 2, 4, and 8 byte fields")
+    search_parser.add_argument(
+        "--value-type",
+        choices=VALUE_TYPES,
+        default="bytes",
+        help="Read values as typed numbers; integer types accept LOW..HIGH ranges",
+    )
+    search_parser.add_argument("--tolerance", type=float, default=0.0, help="Allowed difference for float values")
+    search_parser.add_argument("--align", type=int, default=1, help="Only report matches at multiples of this offset")
     search_parser.add_argument("--extension", default="*")
     search_parser.add_argument("--start-offset", type=_parse_int)
     search_parser.add_argument("--size-min", type=_parse_int)
     search_parser.add_argument("--size-max", type=_parse_int)
+    search_parser.add_argument("--jobs", type=_parse_count, default=1, help="Number of worker processes")
+    search_parser.add_argument("--max-results", type=int, help="Stop after this many matching files")
+    search_parser.add_argument("--first-match", action="store_true", help="Report only the first match in each file")
+    search_parser.add_argument(
+        "--in-archives",
+        action="store_true",
+        help="Search resources inside .big files instead of loose files",
+    )
+    search_parser.add_argument("--group", type=_parse_int, action="append", help="Only search this group hash")
+    search_parser.add_argument("--type", dest="resource_type", action="append", help="Only search this resource type")
+    search_parser.add_argument("--cache", type=Path, help="Keep decompressed resources in this directory")
+    search_parser.add_argument(
+        "--clear-cache",
+        action="store_true",
+        help="Delete the payloads kept in the --cache directory before searching",
+    )
 
     model_parser = subparsers.add_parser("model-convert", help="Convert BIN models")
     model_parser.add_argument("input", type=Path)
@@ -49,6 +257,54 @@ def _parse_int(value: str) -> int:
     return int(value, 0)
 
 
+def _parse_count(value: str) -> int:
+    try:
+        count = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected a positive integer, got {value!r}") from None
+    if count < 1:
+        raise argparse.ArgumentTypeError(f"Expected a positive integer, got {value!r}")
+    return count
+
+
+def _parse_replacement(value: str) -> tuple[int, Path]:
+    index, separator, path = value.partition("=")
+    if not separator or not path:
+        raise argparse.ArgumentTypeError(f"Expected INDEX=FILE, got {value!r}")
+    try:
+        return int(index, 0), Path(path)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid resource index: {index!r}") from None
+
+
+def _parse_range(value: str) -> tuple[int, int]:
+    first, separator, last = value.partition("-")
+    try:
+        if not separator:
+            return int(first, 0), int(first, 0)
+        return int(first, 0), int(last, 0)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected FIRST-LAST, got {value!r}") from None
+
+
+def _entry_filter(args: argparse.Namespace) -> EntryFilter | None:
+    if not (args.group or args.resource_type or args.index or args.offset):
+        return None
+    return EntryFilter(
+        group_hashes=frozenset(args.group or ()),
+        resource_types=frozenset(args.resource_type or ()),
+        index_ranges=tuple(args.index or ()),
+        offset_ranges=tuple(args.offset or ()),
+    )
+
+
+def _parse_word_list(value: str) -> tuple[str, Path]:
+    name, separator, path = value.partition("=")
+    if not separator or not name.isidentifier() or not path:
+        raise argparse.ArgumentTypeError(f"Expected NAME=FILE, got {value!r}")
+    return name, Path(path)
+
+
 def _confirm_cleanup(target_dirs: list[Path]) -> bool:
     print("The following output directories will be cleared:")
     for target_dir in target_dirs:
@@ -57,10 +313,227 @@ def _confirm_cleanup(target_dirs: list[Path]) -> bool:
     return answer in {"y", "yes"}
 
 
+def _list_archive(archive_path: Path) -> int:
+    try:
+        with BigArchive(archive_path, use_mmap=True) as archive:
+            archive.parse()
+            print(f"{'index':>7} {'group':>10} {'offset':>10} {'size':>10}  type")
+            for entry in archive.entries:
+                try:
+                    resource_type = detect_entry_type(archive, entry, archive.read_entry_header(entry))
+                except ValueError:
+                    resource_type = "error"
+                print(
+                    f"{entry.index:>7} {entry.group_hash:#010x} {entry.offset:#010x} "
+                    f"{entry.size:>10}  {resource_type}"
+                )
+    except (OSError, ValueError, BigArchiveError) as error:
+        logger.error(f"Failed to list {archive_path.name}: {error}")
+        return 1
+    return 0
+
+
+def _inspect_archives(args: argparse.Namespace) -> int:
+    if args.input.is_dir():
+        archive_paths = find_archives(args.input, recursive=not args.no_recursive)
+    else:
+        archive_paths = [args.input]
+
+    reports: list[ArchiveStats] = []
+    for archive_path in archive_paths:
+        try:
+            reports.append(inspect_archive(archive_path))
+        except (OSError, ValueError) as error:
+            logger.error(f"Failed to inspect {archive_path.name}: {error}")
+
+    if args.json:
+        documents: list[dict[str, object]] = []
+        for report in reports:
+            documents.append(_stats_document(report))
+        document = documents[0] if not args.input.is_dir() and documents else documents
+        print(json.dumps(document, indent=2))
+    else:
+        for report in reports:
+            _print_stats(report)
+    return 0 if len(reports) == len(archive_paths) else 1
+
+
+def _stats_document(stats: ArchiveStats) -> dict[str, object]:
+    document = asdict(stats)
+    document["totals"]["compression_ratio"] = stats.totals.compression_ratio
+    for group_document, group in zip(document["groups"], stats.groups):
+        group_document["compression_ratio"] = group.compression_ratio
+    return document
+
+
+def _print_stats(stats: ArchiveStats) -> None:
+    print(stats.path)
+    print(
+        f"  version {stats.version}, flags {stats.flags:#x}, {stats.toc_count} entries, "
+        f"data at {stats.data_offset:#x}, file size {stats.file_size}"
+    )
+    print(f"  {'group':>10} {'name':<12} {'entries':>8} {'compr':>6} {'refs':>5} {'blocks':>12} {'original':>12}  ratio")
+    for group in stats.groups + [stats.totals]:
+        group_hash = f"{group.group_hash:#010x}" if group is not stats.totals else ""
+        ratio = group.compression_ratio
+        ratio_text = f"{ratio:.3f}" if ratio is not None else "-"
+        print(
+            f"  {group_hash:>10} {group.name:<12} {group.entry_count:>8} {group.compressed_count:>6} "
+            f"{group.ref_count:>5} {group.block_size:>12} {group.original_size:>12}  {ratio_text}"
+        )
+    for issue in stats.issues[:MAX_PRINTED_ISSUES]:
+        index = f" entry {issue.index}" if issue.index is not None else ""
+        print(f"  {issue.kind} at {issue.offset:#x} ({issue.size} bytes){index}: {issue.message}")
+    if len(stats.issues) > MAX_PRINTED_ISSUES:
+        print(f"  ... {len(stats.issues) - MAX_PRINTED_ISSUES} more issues (use --json to list all)")
+
+
+def _cat_entry(archive_path: Path, index: int, output_path: Path | None) -> int:
+    output_written = False
+    try:
+        with BigArchive(archive_path) as archive:
+            with archive.open_entry(index) as entry_stream:
+                if output_path is None:
+                    shutil.copyfileobj(entry_stream, sys.stdout.buffer)
+                    sys.stdout.buffer.flush()
+                else:
+                    with output_path.open("wb") as output:
+                        output_written = True
+                        shutil.copyfileobj(entry_stream, output)
+    except (OSError, IndexError, ValueError, BigArchiveError, zlib.error) as error:
+        logger.error(f"Failed to read resource {index} of {archive_path.name}: {error}")
+        if output_written:
+            output_path.unlink(missing_ok=True)
+        return 1
+    return 0
+
+
+def _repack(args: argparse.Namespace) -> int:
+    try:
+        replacements: dict[int, bytes] = {}
+        for index, path in args.replace:
+            replacements[index] = path.read_bytes()
+        if args.in_place:
+            patch_archive(args.archive, replacements)
+        else:
+            repack_archive(args.archive, args.output, replacements)
+    except (OSError, IndexError, ValueError) as error:
+        logger.error(f"Failed to repack {args.archive.name}: {error}")
+        return 1
+    return 0
+
+
+def _query_index(args: argparse.Namespace) -> int:
+    index_path = args.index
+    if index_path.is_dir():
+        index_path = default_index_path(index_path)
+    if not index_path.is_file():
+        logger.error(f"Index file not found: {index_path}")
+        return 1
+
+    query = EntryQuery(
+        group_hash=args.group,
+        resource_type=args.resource_type,
+        archive=args.archive,
+        min_size=args.size_min,
+        max_size=args.size_max,
+        compressed=args.compressed,
+        block_digest=args.block_digest,
+        limit=args.limit,
+    )
+    with PackageIndex(index_path) as index:
+        entries = index.query(query)
+    print(f"{'archive':<32} {'index':>7} {'group':>10} {'offset':>10} {'size':>10} {'original':>10}  type")
+    for entry in entries:
+        print(
+            f"{entry.archive:<32} {entry.index:>7} {entry.group_hash:#010x} {entry.offset:#010x} "
+            f"{entry.size:>10} {entry.original_size:>10}  {entry.resource_type}"
+        )
+    logger.info(f"{len(entries)} matching resources")
+    return 0
+
+
+def _search_strings(args: argparse.Namespace) -> int:
+    index_path = args.index
+    if index_path.is_dir():
+        index_path = default_string_index_path(index_path)
+    if not index_path.is_file():
+        logger.error(f"String index file not found: {index_path}")
+        return 1
+
+    start_time = time.perf_counter()
+    with StringIndex(index_path) as index:
+        matches = index.search(args.query, args.mode, args.limit)
+    elapsed_ms = (time.perf_counter() - start_time) * 1000
+    for match in matches:
+        print(f"{match.pack}\t{match.resource_id}\t{match.offset:#x}\t{match.text}")
+    logger.info(f"{len(matches)} matching strings in {elapsed_ms:.1f} ms")
+    return 0
+
+
+def _crack_hashes(args: argparse.Namespace) -> int:
+    word_lists: dict[str, list[str]] = {}
+    for path in args.words:
+        word_lists.setdefault("word", []).extend(read_word_list(path))
+    for name, path in args.word_lists:
+        word_lists.setdefault(name, []).extend(read_word_list(path))
+
+    templates = []
+    try:
+        for template in args.template or ["{word}"]:
+            templates.append(expand_template(template, word_lists))
+    except ValueError as error:
+        logger.error(str(error))
+        return 1
+
+    targets = package_hashes(args.input)
+    targets.update(args.hash)
+    found = crack_hashes(templates, targets, ignore_case=args.ignore_case, jobs=args.jobs)
+
+    dictionary_path = args.dictionary or default_dictionary_path(args.input)
+    dictionary = load_dictionary(dictionary_path)
+    new_count = 0
+    for key in sorted(found):
+        for name in sorted(found[key]):
+            logger.info(f"{key:#010x} {name}")
+            if name not in dictionary.setdefault(key, set()):
+                dictionary[key].add(name)
+                new_count += 1
+    save_dictionary(dictionary_path, dictionary)
+    logger.info(f"Added {new_count} names to {dictionary_path}")
+    return 0
+
+
+def _search_in_archives(args: argparse.Namespace, options: SearchOptions, show_patterns: bool) -> None:
+    archive_options = ArchiveSearchOptions(
+        group_hashes=frozenset(args.group or ()),
+        resource_types=frozenset(args.resource_type or ()),
+        cache_dir=args.cache,
+    )
+    if options.mode == "fuzzy":
+        results = search_archives(args.input, options, archive_options, jobs=args.jobs)
+    else:
+        results = iter_archive_search(args.input, options, archive_options, jobs=args.jobs)
+    for result in results:
+        offsets = _format_offsets(result.offsets, result.patterns, show_patterns)
+        logger.info(
+            f"{result.archive} #{result.index} {result.group_hash:#010x} {result.resource_type} "
+            f"[{offsets}] score={result.score}"
+        )
+
+
+def _format_offsets(offsets: tuple[int, ...], patterns: tuple[bytes, ...], show_patterns: bool) -> str:
+    if show_patterns:
+        return ", ".join(f"{hex(offset)}={pattern.hex()}" for offset, pattern in zip(offsets, patterns))
+    return ", ".join(hex(offset) for offset in offsets)
+
+
 def main(argv: list[str] | None = None) -> int:
     """Run the selected command."""
-    init_app_env()
     args = build_parser().parse_args(argv)
+    if args.command in {"ls", "query", "inspect", "strings-search"} or (args.command == "cat" and args.output is None):
+        route_console_to_stderr()
+    init_app_env()
 
     if args.command == "unpack":
         output_dir = args.output or get_output_dir(args.input)
@@ -71,21 +544,71 @@ def main(argv: list[str] | None = None) -> int:
             clean=not args.no_clean,
             assume_yes=args.yes,
             confirm=_confirm_cleanup,
+            jobs=args.jobs,
+            threads=args.threads,
+            use_mmap=args.mmap,
+            incremental=args.incremental,
+            manifest_format=args.manifest,
+            dedup=args.dedup,
+            entry_filter=_entry_filter(args),
+            extract_strings=args.strings,
         )
         failed_count = 0
+        deduplicated_bytes = 0
         for result in results:
             failed_count += result.failed_count
-        return 1 if failed_count else 0
+            deduplicated_bytes += result.deduplicated_bytes
+        if deduplicated_bytes:
+            logger.info(f"Deduplication saved {deduplicated_bytes} bytes in total")
+        failed_archives = len(find_archives(args.input, recursive=not args.no_recursive)) - len(results)
+        if failed_archives:
+            logger.error(f"{failed_archives} archives were not unpacked")
+        return 1 if failed_count or failed_archives else 0
+
+    if args.command == "ls":
+        return _list_archive(args.archive)
+
+    if args.command == "inspect":
+        return _inspect_archives(args)
+
+    if args.command == "cat":
+        return _cat_entry(args.archive, args.index, args.output)
+
+    if args.command == "repack":
+        return _repack(args)
+
+    if args.command == "index":
+        index_path = args.index or default_index_path(args.input)
+        with PackageIndex(index_path) as index:
+            index.update(args.input, recursive=not args.no_recursive, jobs=args.jobs)
+        return 0
+
+    if args.command == "query":
+        return _query_index(args)
+
+    if args.command == "crack-hashes":
+        return _crack_hashes(args)
 
     if args.command == "strings":
         if args.input.is_dir():
-            extract_strings_from_directory(args.input)
+            index_path = None
+            if args.index or args.index_file is not None:
+                index_path = args.index_file or default_string_index_path(args.input)
+            extract_strings_from_directory(args.input, args.jobs, args.merged, args.merged_format, index_path)
         else:
             extractor = ResourceStringExtractor(args.input)
             extractor.write_csv(args.output)
         return 0
 
+    if args.command == "strings-search":
+        return _search_strings(args)
+
     if args.command == "search":
+        if args.clear_cache:
+            if args.cache is None:
+                logger.error("--clear-cache needs --cache")
+                return 1
+            clear_search_cache(args.cache)
         options = SearchOptions(
             target_value=args.value,
             big_endian=not args.little_endian,
@@ -94,10 +617,25 @@ def main(argv: list[str] | None = None) -> int:
             start_offset=args.start_offset,
             size_min=args.size_min,
             size_max=args.size_max,
+            both_endian=args.both_endian,
+            all_widths=args.all_widths,
+            max_results=args.max_results,
+            first_match=args.first_match,
+            value_type=args.value_type,
+            tolerance=args.tolerance,
+            alignment=args.align,
         )
-        results = search_path(args.input, options)
+        plan = build_search_plan(options)
+        show_patterns = bool(plan.matchers) or len(plan.patterns) > 1
+        if args.in_archives or args.input.suffix.lower() == ".big":
+            _search_in_archives(args, options, show_patterns)
+            return 0
+        if options.mode == "fuzzy":
+            results = search_path(args.input, options, jobs=args.jobs)
+        else:
+            results = iter_search(args.input, options, jobs=args.jobs)
         for result in results:
-            offsets = ", ".join(hex(offset) for offset in result.offsets)
+            offsets = _format_offsets(result.offsets, result.patterns, show_patterns)
             logger.info(f"{result.path} [{offsets}] score={result.score}")
         return 0
 
@@ -64,6 +64,14 @@ def setup_logger() -> logging.Logger:
 logger = setup_logger()
 
 
+def route_console_to_stderr() -> None:
+    """Send all terminal logs to standard error so standard output carries only data."""
+    configured_logger = logging.getLogger(LOGGER_NAME)
+    for handler in configured_logger.handlers:
+        if isinstance(handler, logging.StreamHandler) and handler.stream is sys.stdout:
+            handler.setStream(sys.stderr)
+
+
 def add_file_handler(log_path: Path) -> None:
     """Add a file handler and remove stale file handlers."""
     log_path.parent.mkdir(parents=True, exist_ok=True)
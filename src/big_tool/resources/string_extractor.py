@@ -2,31 +2,57 @@
 
 import csv
 import struct
-from dataclasses import dataclass
+import sys
+from array import array
+from bisect import bisect_right
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import ExitStack
+from itertools import repeat
+from operator import add, le, sub
 from pathlib import Path
 
 from big_tool.logger import logger
+from big_tool.resources.string_index import StringIndex
+from big_tool.resources.string_resource import StringResource
+from big_tool.resources.string_table import open_string_writer
 
 
-@dataclass(frozen=True)
-class StringResource:
-    """A string resource and its file location."""
-
-    resource_id: int
-    offset: int
-    length: int
-    text: str
+# Maps a block's last byte to 1 when it is a null terminator.
+_TERMINATOR_TABLE = bytes([1]) + bytes(255)
+# Packs parsed ahead of the merged writer, per worker process.
+PACKS_PER_JOB = 4
 
 
 class ResourceStringExtractor:
     """
     File layout:
-    [Header(8B)] [Offsets(N*2B)] [Offset End(2B)] [Types(N*4B)] [Data]
+    [Magic(2B)] [Count(2B)] [Offset table] [End offset] [Types(N*4B)] [Data]
+
+    The second magic byte holds flags that select the offset table:
+
+    - ``00 a0``: first ID (2B), then N 16-bit start offsets
+    - ``00 e0``: first ID (2B), then N 16-bit start offsets, each followed
+      by 2 reserved bytes
+    - ``00 20``: N pairs of entry ID (2B) and 16-bit start offset
+
+    Each entry ends where the next one starts; the 16-bit end offset closes
+    the last entry and is followed by 2 reserved zero bytes. As in earlier
+    releases, the first entry starts right after the type table. Every
+    string block has a 4-byte prefix and a null terminator.
     """
 
     MAGIC_ID = b"\x00\xa0"
+    SEQUENTIAL_IDS_FLAG = 0x80
+    WIDE_OFFSETS_FLAG = 0x40
+    VARIANTS = (0x20, 0xA0, 0xE0)
     HEADER_SIZE = 8
-    OFFSET_ENTRY_SIZE = 2
+    COUNT_SIZE = 4
+    FIRST_ID_SIZE = 2
+    ENTRY_ID_SIZE = 2
+    OFFSET_SIZE = 2
+    RESERVED_OFFSET_SIZE = 2
     OFFSET_END_PADDING_SIZE = 2
     TYPE_ENTRY_SIZE = 4
     STRING_BLOCK_PREFIX_SIZE = 4
@@ -34,18 +60,25 @@ class ResourceStringExtractor:
 
     def __init__(self, filepath: Path):
         self.filepath = Path(filepath).resolve()
+        self.flags = 0
         self.resource_count = 0
-        self.offset_table: list[int] = []
+        self.first_resource_id = 0
+        self.resource_ids: range | array = range(0)
+        self.offset_table: array = array("H")
         self.extracted_strings: list[StringResource] = []
         self.data_start_offset = 0
 
     def extract(self) -> list[StringResource]:
         """Extract all string resources."""
-        data = self.filepath.read_bytes()
-        self._read_header(data)
-        self._read_offset_table(data)
+        return self.parse(self.filepath.read_bytes())
+
+    def parse(self, data: bytes | memoryview) -> list[StringResource]:
+        """Extract all string resources from the bytes of a string pack."""
+        view = memoryview(data).cast("B")
+        self._read_header(view)
+        self._read_offset_table(view)
         self._calculate_pointers()
-        self._extract_strings(data)
+        self._extract_strings(view)
         return self.extracted_strings
 
     def write_csv(self, output_filepath: Path | None = None) -> Path:
@@ -54,9 +87,7 @@ class ResourceStringExtractor:
             self.extract()
 
         if output_filepath is None:
-            output_filepath = self.filepath.with_name(
-                f"{self.filepath.stem}_Strings.csv"
-            )
+            output_filepath = strings_csv_path(self.filepath)
 
         output_filepath = Path(output_filepath).resolve()
         output_filepath.parent.mkdir(parents=True, exist_ok=True)
@@ -76,96 +107,247 @@ class ResourceStringExtractor:
         logger.info(f"Writing {len(self.extracted_strings)} strings to {output_filepath}")
         return output_filepath
 
-    def _read_header(self, data: bytes) -> None:
+    @property
+    def offset_size(self) -> int:
+        """Return the size of one start offset slot, including its reserved bytes."""
+        if self.flags & self.WIDE_OFFSETS_FLAG:
+            return self.OFFSET_SIZE + self.RESERVED_OFFSET_SIZE
+        return self.OFFSET_SIZE
+
+    @property
+    def table_start(self) -> int:
+        """Return the file offset of the offset table."""
+        if self.flags & self.SEQUENTIAL_IDS_FLAG:
+            return self.COUNT_SIZE + self.FIRST_ID_SIZE
+        return self.COUNT_SIZE
+
+    @property
+    def table_entry_size(self) -> int:
+        """Return the size of one offset table entry."""
+        if self.flags & self.SEQUENTIAL_IDS_FLAG:
+            return self.offset_size
+        return self.ENTRY_ID_SIZE + self.offset_size
+
+    def _read_header(self, data: memoryview) -> None:
         if len(data) < self.HEADER_SIZE:
             raise ValueError("File size is too small for a string resource header")
 
-        header = data[: self.HEADER_SIZE]
-        if header[:2] != self.MAGIC_ID:
+        magic = bytes(data[:2])
+        if magic[0] != 0 or magic[1] not in self.VARIANTS:
             raise ValueError(
-                f"Invalid file signature: expected {self.MAGIC_ID.hex()}, got {header[:2].hex()}"
+                f"Invalid file signature: expected 0020, 00a0, or 00e0, got {magic.hex()}"
             )
+        self.flags = magic[1]
 
-        self.resource_count = struct.unpack("<H", header[2:4])[0]
+        self.resource_count = struct.unpack_from("<H", data, 2)[0]
         if self.resource_count <= 0:
             raise ValueError(f"Invalid resource count: {self.resource_count}")
-
-        first_offset = struct.unpack("<H", header[6:8])[0]
-        self.offset_table = [first_offset]
-
-    def _read_offset_table(self, data: bytes) -> None:
-        table_start = self.HEADER_SIZE
-        table_size = self.resource_count * self.OFFSET_ENTRY_SIZE
-        table_end = table_start + table_size
-        if table_end + self.OFFSET_END_PADDING_SIZE > len(data):
+        if self.flags & self.SEQUENTIAL_IDS_FLAG:
+            self.first_resource_id = struct.unpack_from("<H", data, self.COUNT_SIZE)[0]
+
+    def _read_offset_table(self, data: memoryview) -> None:
+        """Decode the whole offset table, and explicit IDs, with one array."""
+        table_start = self.table_start
+        table_end = table_start + self.resource_count * self.table_entry_size
+        end_offset_end = table_end + self.OFFSET_SIZE
+        if end_offset_end + self.OFFSET_END_PADDING_SIZE > len(data):
             raise ValueError("Offset table data truncated")
 
-        for position in range(table_start, table_end, self.OFFSET_ENTRY_SIZE):
-            offset = struct.unpack("<H", data[position:position + 2])[0]
-            self.offset_table.append(offset)
-
-        padding_start = table_end
-        padding = data[padding_start:padding_start + self.OFFSET_END_PADDING_SIZE]
+        table = _read_array("H", data[table_start:end_offset_end])
+        if not self.flags & self.SEQUENTIAL_IDS_FLAG:
+            offsets = table[1::2]
+            offsets.append(table[-1])
+            self.resource_ids = table[0:-1:2]
+        else:
+            # 00e0 slots hold a reserved 16-bit value after each offset.
+            offsets = table[::self.offset_size // self.OFFSET_SIZE]
+            self.resource_ids = range(self.first_resource_id, self.first_resource_id + self.resource_count)
+        self.offset_table = offsets
+
+        padding = data[end_offset_end:end_offset_end + self.OFFSET_END_PADDING_SIZE]
         if padding != b"\x00\x00":
             logger.warning(
                 f"Offset table padding mismatch: expected 0000, got {padding.hex()}"
             )
 
     def _calculate_pointers(self) -> None:
-        table_size = self.resource_count * self.OFFSET_ENTRY_SIZE
-        type_table_start = self.HEADER_SIZE + table_size + self.OFFSET_END_PADDING_SIZE
-        self.data_start_offset = type_table_start + self.resource_count * self.TYPE_ENTRY_SIZE
-
-    def _extract_strings(self, data: bytes) -> None:
-        current_offset = self.data_start_offset
-        self.extracted_strings = []
-
-        for resource_id in range(self.resource_count):
-            next_offset = self.offset_table[resource_id + 1]
-            declared_length = next_offset - current_offset
-            if declared_length < 0:
-                raise ValueError(f"Invalid string offset at resource {resource_id}")
-
-            block = data[current_offset:next_offset]
-            if len(block) != declared_length:
-                logger.warning(f"String resource {resource_id} is truncated")
-
-            string_body = block[self.STRING_BLOCK_PREFIX_SIZE:]
-            if string_body.endswith(b"\x00"):
-                string_body = string_body[:-1]
-            elif string_body:
-                logger.warning(f"String resource {resource_id} has no null terminator")
-
-            text = string_body.decode(self.STRING_ENCODING, errors="replace")
-            self.extracted_strings.append(
-                StringResource(
-                    resource_id,
-                    current_offset,
-                    len(string_body),
-                    text.replace("\n", "\\n"),
-                )
-            )
-            current_offset = next_offset
+        table_end = self.table_start + self.resource_count * self.table_entry_size
+        table_end += self.OFFSET_SIZE + self.OFFSET_END_PADDING_SIZE
+        self.data_start_offset = table_end + self.resource_count * self.TYPE_ENTRY_SIZE
+
+    def _extract_strings(self, data: memoryview) -> None:
+        """
+        Slice every string body from one buffer.
+
+        Offsets, truncation, and terminators are checked over whole columns
+        of the table rather than string by string.
+        """
+        starts = self.offset_table[:-1]
+        ends = self.offset_table[1:]
+        if starts[0] != self.data_start_offset:
+            logger.debug(f"First string offset {starts[0]:#x} differs from the data start {self.data_start_offset:#x}")
+            starts[0] = self.data_start_offset
+        if not all(map(le, starts, ends)):
+            for resource_id, start, end in zip(self.resource_ids, starts, ends):
+                if end < start:
+                    raise ValueError(f"Invalid string offset at resource {resource_id}")
+
+        if ends[-1] > len(data):
+            truncated = bisect_right(ends, len(data))
+            for index in range(truncated, self.resource_count):
+                logger.warning(f"String resource {self.resource_ids[index]} is truncated")
+                ends[index] = min(ends[index], len(data))
+                starts[index] = min(starts[index], len(data))
+
+        prefix_size = self.STRING_BLOCK_PREFIX_SIZE
+        body_starts = list(map(add, starts, repeat(prefix_size)))
+        if min(map(sub, ends, starts)) < prefix_size:
+            # Blocks shorter than their prefix have an empty body.
+            body_starts = list(map(min, body_starts, ends))
+        last_bytes = bytes(map(data.__getitem__, map(sub, ends, repeat(1))))
+        terminated = last_bytes.translate(_TERMINATOR_TABLE)
+        body_ends = list(map(sub, ends, terminated))
+        if terminated.count(1) != self.resource_count:
+            for index, has_terminator in enumerate(terminated):
+                if body_starts[index] < ends[index] and not has_terminator:
+                    logger.warning(f"String resource {self.resource_ids[index]} has no null terminator")
+
+        # Bodies are joined with null bytes and decoded in one call; a body
+        # with its own null byte splits into extra parts and is decoded alone.
+        bodies = list(map(data.__getitem__, map(slice, body_starts, body_ends)))
+        lengths = list(map(len, bodies))
+        texts = b"\x00".join(bodies).decode(self.STRING_ENCODING, "replace").replace("\n", "\\n").split("\x00")
+        if len(texts) != self.resource_count:
+            texts = []
+            for string_body in bodies:
+                texts.append(str(string_body, self.STRING_ENCODING, "replace").replace("\n", "\\n"))
+        self.extracted_strings = list(map(StringResource, self.resource_ids, starts, lengths, texts))
+
+
+def strings_csv_path(filepath: Path) -> Path:
+    """Return the default CSV path for the strings of a string pack file."""
+    return filepath.with_name(f"{filepath.stem}_Strings.csv")
+
+
+def extract_strings_from_directory(
+    root_dir: Path,
+    jobs: int = 1,
+    merged_path: Path | None = None,
+    merged_format: str | None = None,
+    index_path: Path | None = None,
+) -> list[Path]:
+    """
+    Extract parseable string BIN files recursively.
 
+    With ``jobs`` greater than one, packs are parsed in worker processes.
+    ``merged_path`` also streams every string into one deduplicated table,
+    keyed by the pack path relative to ``root_dir``. Packs are merged in
+    sorted path order, and at most a few packs per worker wait in memory.
 
-def extract_strings_from_directory(root_dir: Path) -> list[Path]:
-    """Extract parseable string BIN files recursively."""
+    ``index_path`` updates a full-text string index (see
+    ``big_tool.resources.string_index``). Packs with an unchanged size and
+    modification time keep their index rows, and packs that are gone or no
+    longer parse are removed from it.
+    """
     root_dir = Path(root_dir).resolve()
     if not root_dir.is_dir():
         raise NotADirectoryError(root_dir)
+    if jobs < 1:
+        raise ValueError(f"Invalid job count: {jobs}")
 
     output_files: list[Path] = []
     files = list(root_dir.rglob("*.bin"))
     files.sort()
-    for filepath in files:
-        if filepath.stat().st_size < ResourceStringExtractor.HEADER_SIZE:
-            logger.warning(f"Skipping small file: {filepath.name}")
-            continue
-
-        try:
-            extractor = ResourceStringExtractor(filepath)
-            output_files.append(extractor.write_csv())
-        except ValueError as error:
-            logger.warning(f"Skipping {filepath.name}: {error}")
+    with ExitStack() as stack:
+        writer = None
+        index = None
+        indexed: dict[str, tuple[int, int]] = {}
+        if merged_path is not None:
+            writer = stack.enter_context(open_string_writer(merged_path, merged_format))
+        if index_path is not None:
+            index = stack.enter_context(StringIndex(index_path))
+            indexed = index.pack_stats()
+
+        packs: list[str] = []
+        file_stats: list[tuple[int, int]] = []
+        keep_strings: list[bool] = []
+        for filepath in files:
+            stat = filepath.stat()
+            pack = filepath.relative_to(root_dir).as_posix()
+            packs.append(pack)
+            file_stats.append((stat.st_size, stat.st_mtime_ns))
+            keep_strings.append(writer is not None or (index is not None and indexed.get(pack) != file_stats[-1]))
+
+        indexed_count = 0
+        results = _extract_packs(files, jobs, keep_strings)
+        for pack, file_stat, (output_file, strings) in zip(packs, file_stats, results):
+            if output_file is None:
+                continue
+            output_files.append(output_file)
+            if writer is not None:
+                writer.write_pack(pack, strings)
+            if index is not None and indexed.pop(pack, None) != file_stat:
+                index.store_pack(pack, file_stat[0], file_stat[1], strings)
+                indexed_count += 1
+
+        if index is not None:
+            removed_count = index.remove_packs(indexed)
+            index.commit()
+            logger.info(
+                f"Indexed strings of {indexed_count} packs, "
+                f"{len(output_files) - indexed_count} unchanged, {removed_count} removed"
+            )
 
+    if writer is not None and writer.pack_count:
+        logger.info(
+            f"Merged {writer.string_count} strings from {writer.pack_count} packs "
+            f"into {writer.text_count} distinct texts in {writer.path}"
+        )
     return output_files
+
+
+def _extract_packs(
+    files: list[Path],
+    jobs: int,
+    keep_strings: list[bool],
+) -> Iterator[tuple[Path | None, list[StringResource]]]:
+    """Yield ``_extract_pack`` of every file in order, with a bounded number of packs in flight."""
+    if jobs == 1 or len(files) < 2:
+        for filepath, keep in zip(files, keep_strings):
+            yield _extract_pack(filepath, keep)
+        return
+
+    pending: deque[Future] = deque()
+    with ProcessPoolExecutor(max_workers=min(jobs, len(files))) as executor:
+        for filepath, keep in zip(files, keep_strings):
+            if len(pending) >= jobs * PACKS_PER_JOB:
+                yield pending.popleft().result()
+            pending.append(executor.submit(_extract_pack, filepath, keep))
+        while pending:
+            yield pending.popleft().result()
+
+
+def _extract_pack(filepath: Path, keep_strings: bool) -> tuple[Path | None, list[StringResource]]:
+    """Write the strings CSV of one file; the path is None when the file is not a string pack."""
+    if filepath.stat().st_size < ResourceStringExtractor.HEADER_SIZE:
+        logger.warning(f"Skipping small file: {filepath.name}")
+        return None, []
+
+    try:
+        extractor = ResourceStringExtractor(filepath)
+        output_file = extractor.write_csv()
+    except ValueError as error:
+        logger.warning(f"Skipping {filepath.name}: {error}")
+        return None, []
+    if not keep_strings:
+        return output_file, []
+    return output_file, extractor.extracted_strings
+
+
+def _read_array(typecode: str, data: memoryview) -> array:
+    """Decode little-endian unsigned integers in one step."""
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
@@ -0,0 +1,311 @@
+"""
+Persistent full-text index of extracted strings.
+
+The index is a SQLite file with two inverted tables: the lowercase words of
+each string answer word and prefix queries, and its lowercase three-character
+substrings (trigrams) narrow substring queries down to a few candidates that
+are then checked directly. Each row of these tables holds the positions of
+one term in one pack, so a pack adds one row per distinct term rather than
+one per occurrence. Packs whose size and modification time are unchanged are
+not indexed again on update.
+"""
+
+import re
+import sqlite3
+import sys
+from array import array
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from big_tool.logger import logger
+from big_tool.resources.string_resource import StringResource
+from big_tool.typed_arrays import UINT32
+
+
+STRING_INDEX_FILE_NAME = "big_tool_strings.sqlite"
+STRING_INDEX_VERSION = 1
+SEARCH_MODES = ("word", "prefix", "substring")
+
+_WORD_PATTERN = re.compile(r"\w+")
+# Sorts after every other character, so a prefix range can end with it.
+_MAX_CHARACTER = "\U0010ffff"
+
+
+@dataclass(frozen=True)
+class StringMatch:
+    """One indexed string that matches a query."""
+
+    pack: str
+    resource_id: int
+    offset: int
+    text: str
+
+
+class StringIndex:
+    """
+    Read and update the SQLite full-text index of extracted strings.
+
+    ``store_pack`` and ``remove_packs`` do not commit; call ``commit`` once
+    after a batch of packs. Closing the index without it discards the batch.
+    """
+
+    CREATE_SQL = (
+        "CREATE TABLE IF NOT EXISTS packs ("
+        "id INTEGER PRIMARY KEY, "
+        "path TEXT NOT NULL UNIQUE, "
+        "size INTEGER NOT NULL, "
+        "mtime_ns INTEGER NOT NULL, "
+        "string_count INTEGER NOT NULL)",
+        "CREATE TABLE IF NOT EXISTS strings ("
+        "pack_id INTEGER NOT NULL, "
+        "position INTEGER NOT NULL, "
+        "resource_id INTEGER NOT NULL, "
+        "offset INTEGER NOT NULL, "
+        "text TEXT NOT NULL, "
+        "PRIMARY KEY (pack_id, position)) WITHOUT ROWID",
+        "CREATE TABLE IF NOT EXISTS words ("
+        "word TEXT NOT NULL, "
+        "pack_id INTEGER NOT NULL, "
+        "positions BLOB NOT NULL, "
+        "PRIMARY KEY (word, pack_id)) WITHOUT ROWID",
+        "CREATE TABLE IF NOT EXISTS trigrams ("
+        "trigram TEXT NOT NULL, "
+        "pack_id INTEGER NOT NULL, "
+        "positions BLOB NOT NULL, "
+        "PRIMARY KEY (trigram, pack_id)) WITHOUT ROWID",
+    )
+    SELECT_STRING_SQL = "SELECT resource_id, offset, text FROM strings WHERE pack_id = ? AND position = ?"
+    SCAN_STRINGS_SQL = "SELECT position, resource_id, offset, text FROM strings WHERE pack_id = ? ORDER BY position"
+    # A pack is read in one scan when more than one in SCAN_RATIO of its strings are candidates.
+    SCAN_RATIO = 16
+
+    # Page cache in KiB; a pack adds terms all over both term tables.
+    CACHE_SIZE_KIB = 64 * 1024
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._connection = sqlite3.connect(self.path)
+        self._connection.execute(f"PRAGMA cache_size = -{self.CACHE_SIZE_KIB}")
+        self._create_schema()
+
+    def __enter__(self) -> "StringIndex":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the index database; changes since the last commit are discarded."""
+        self._connection.close()
+
+    def commit(self) -> None:
+        """Commit the packs stored and removed since the last commit."""
+        self._connection.commit()
+
+    def pack_stats(self) -> dict[str, tuple[int, int]]:
+        """Return the recorded ``(size, mtime_ns)`` of every indexed pack by path."""
+        stats: dict[str, tuple[int, int]] = {}
+        for path, size, mtime_ns in self._connection.execute("SELECT path, size, mtime_ns FROM packs"):
+            stats[path] = (size, mtime_ns)
+        return stats
+
+    def store_pack(self, pack: str, size: int, mtime_ns: int, strings: list[StringResource]) -> None:
+        """Replace the strings of one pack and their index terms."""
+        self._delete_pack(pack)
+        cursor = self._connection.execute(
+            "INSERT INTO packs (path, size, mtime_ns, string_count) VALUES (?, ?, ?, ?)",
+            (pack, size, mtime_ns, len(strings)),
+        )
+        pack_id = cursor.lastrowid
+
+        rows: list[tuple[object, ...]] = []
+        texts: list[str] = []
+        for position, resource in enumerate(strings):
+            rows.append((pack_id, position, resource.resource_id, resource.offset, resource.text))
+            texts.append(resource.text)
+        self._connection.executemany("INSERT INTO strings VALUES (?, ?, ?, ?, ?)", rows)
+
+        words, trigrams = _pack_terms(texts)
+        self._connection.executemany("INSERT INTO words VALUES (?, ?, ?)", _posting_rows(words, pack_id))
+        self._connection.executemany("INSERT INTO trigrams VALUES (?, ?, ?)", _posting_rows(trigrams, pack_id))
+
+    def remove_packs(self, packs: Iterable[str]) -> int:
+        """Remove packs and their strings from the index and return how many were removed."""
+        count = 0
+        for pack in packs:
+            count += self._delete_pack(pack)
+        return count
+
+    def search(self, query: str, mode: str = "substring", limit: int | None = None) -> list[StringMatch]:
+        """
+        Return indexed strings matching ``query``, ordered by pack and position in the pack.
+
+        Matching ignores case. ``word`` needs every word of the query as a
+        whole word, ``prefix`` treats the last word as a prefix, and
+        ``substring`` finds the query anywhere in the text.
+        """
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unsupported search mode: {mode}")
+
+        folded = query.lower()
+        candidates: dict[int, set[int]] | None = None
+        if mode == "substring":
+            for trigram in _trigrams(folded):
+                candidates = _intersect(candidates, self._postings("trigrams", "trigram = ?", (trigram,)))
+        else:
+            words = _WORD_PATTERN.findall(folded)
+            if not words:
+                return []
+            if mode == "prefix":
+                prefix = words.pop()
+                postings = self._postings("words", "word >= ? AND word < ?", (prefix, prefix + _MAX_CHARACTER))
+                candidates = _intersect(candidates, postings)
+            for word in dict.fromkeys(words):
+                candidates = _intersect(candidates, self._postings("words", "word = ?", (word,)))
+        if candidates is None:
+            # Substrings shorter than a trigram check every string.
+            candidates = self._all_positions()
+
+        pack_paths: dict[int, str] = {}
+        string_counts: dict[int, int] = {}
+        for pack_id, path, string_count in self._connection.execute("SELECT id, path, string_count FROM packs"):
+            pack_paths[pack_id] = path
+            string_counts[pack_id] = string_count
+
+        results: list[StringMatch] = []
+        for pack_id in sorted(candidates, key=pack_paths.__getitem__):
+            positions = candidates[pack_id]
+            for resource_id, offset, text in self._candidate_strings(pack_id, positions, string_counts[pack_id]):
+                # Trigrams only narrow the candidates; the text itself decides.
+                if mode == "substring" and folded not in text.lower():
+                    continue
+                results.append(StringMatch(pack_paths[pack_id], resource_id, offset, text))
+                if limit is not None and len(results) >= limit:
+                    return results
+        return results
+
+    def _candidate_strings(
+        self,
+        pack_id: int,
+        positions: set[int],
+        string_count: int,
+    ) -> Iterator[tuple[int, int, str]]:
+        """Yield ``(resource_id, offset, text)`` of the given positions of one pack in order."""
+        if len(positions) * self.SCAN_RATIO < string_count:
+            for position in sorted(positions):
+                yield self._connection.execute(self.SELECT_STRING_SQL, (pack_id, position)).fetchone()
+            return
+
+        for position, resource_id, offset, text in self._connection.execute(self.SCAN_STRINGS_SQL, (pack_id,)):
+            if position in positions:
+                yield resource_id, offset, text
+
+    def _postings(self, table: str, condition: str, parameters: tuple[str, ...]) -> dict[int, set[int]]:
+        """Return the string positions per pack of every term selected by ``condition``."""
+        postings: dict[int, set[int]] = {}
+        for pack_id, positions in self._connection.execute(
+            f"SELECT pack_id, positions FROM {table} WHERE {condition}", parameters
+        ):
+            postings.setdefault(pack_id, set()).update(_unpack_positions(positions))
+        return postings
+
+    def _all_positions(self) -> dict[int, set[int]]:
+        postings: dict[int, set[int]] = {}
+        for pack_id, string_count in self._connection.execute("SELECT id, string_count FROM packs"):
+            postings[pack_id] = set(range(string_count))
+        return postings
+
+    def _create_schema(self) -> None:
+        version = self._connection.execute("PRAGMA user_version").fetchone()[0]
+        if version not in {0, STRING_INDEX_VERSION}:
+            logger.warning(f"Rebuilding string index {self.path.name} with format version {STRING_INDEX_VERSION}")
+            with self._connection:
+                for table in ("trigrams", "words", "strings", "packs"):
+                    self._connection.execute(f"DROP TABLE IF EXISTS {table}")
+
+        with self._connection:
+            for statement in self.CREATE_SQL:
+                self._connection.execute(statement)
+            self._connection.execute(f"PRAGMA user_version = {STRING_INDEX_VERSION}")
+
+    def _delete_pack(self, pack: str) -> int:
+        """Delete one pack; its index terms are recomputed from the stored texts and deleted by key."""
+        existing = self._connection.execute("SELECT id FROM packs WHERE path = ?", (pack,)).fetchone()
+        if existing is None:
+            return 0
+
+        pack_id = existing[0]
+        texts: list[str] = []
+        for (text,) in self._connection.execute("SELECT text FROM strings WHERE pack_id = ?", existing):
+            texts.append(text)
+        words, trigrams = _pack_terms(texts)
+        word_keys: list[tuple[str, int]] = []
+        for word in words:
+            word_keys.append((word, pack_id))
+        trigram_keys: list[tuple[str, int]] = []
+        for trigram in trigrams:
+            trigram_keys.append((trigram, pack_id))
+        self._connection.executemany("DELETE FROM words WHERE word = ? AND pack_id = ?", word_keys)
+        self._connection.executemany("DELETE FROM trigrams WHERE trigram = ? AND pack_id = ?", trigram_keys)
+        self._connection.execute("DELETE FROM strings WHERE pack_id = ?", existing)
+        self._connection.execute("DELETE FROM packs WHERE id = ?", existing)
+        return 1
+
+
+def default_string_index_path(root_dir: Path) -> Path:
+    """Return the default string index location of an extraction output directory."""
+    return Path(root_dir).resolve() / STRING_INDEX_FILE_NAME
+
+
+def _pack_terms(texts: list[str]) -> tuple[dict[str, list[int]], dict[str, list[int]]]:
+    """Return the string positions of every word and every trigram in the texts of one pack."""
+    words: dict[str, list[int]] = {}
+    trigrams: dict[str, list[int]] = {}
+    for position, text in enumerate(texts):
+        folded = text.lower()
+        for word in set(_WORD_PATTERN.findall(folded)):
+            words.setdefault(word, []).append(position)
+        for trigram in _trigrams(folded):
+            trigrams.setdefault(trigram, []).append(position)
+    return words, trigrams
+
+
+def _trigrams(folded: str) -> set[str]:
+    return set(map("".join, zip(folded, folded[1:], folded[2:])))
+
+
+def _posting_rows(terms: dict[str, list[int]], pack_id: int) -> list[tuple[str, int, bytes]]:
+    # Sorted rows fill each B-tree page in turn instead of jumping between pages.
+    rows: list[tuple[str, int, bytes]] = []
+    for term in sorted(terms):
+        rows.append((term, pack_id, _pack_positions(terms[term])))
+    return rows
+
+
+def _pack_positions(positions: list[int]) -> bytes:
+    values = array(UINT32, positions)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values.tobytes()
+
+
+def _unpack_positions(data: bytes) -> array:
+    values = array(UINT32)
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def _intersect(candidates: dict[int, set[int]] | None, postings: dict[int, set[int]]) -> dict[int, set[int]]:
+    """Return the positions found in both, per pack; None ``candidates`` means no filter yet."""
+    if candidates is None:
+        return postings
+
+    result: dict[int, set[int]] = {}
+    for pack_id, positions in candidates.items():
+        common = positions.intersection(postings.get(pack_id, ()))
+        if common:
+            result[pack_id] = common
+    return result
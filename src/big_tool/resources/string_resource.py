@@ -0,0 +1,13 @@
+"""String resource records shared by the extractor, merged tables, and index."""
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class StringResource:
+    """A string resource and its file location."""
+
+    resource_id: int
+    offset: int
+    length: int
+    text: str
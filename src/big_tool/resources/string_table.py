@@ -0,0 +1,176 @@
+"""
+Merged string tables.
+
+Merged rows are keyed by pack and resource ID and point into a table of
+distinct texts, so a text shared by many packs or locales is stored once.
+Rows are written pack by pack as packs are parsed.
+"""
+
+import csv
+import hashlib
+import sqlite3
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, TextIO
+
+from big_tool.resources.string_resource import StringResource
+
+
+MERGED_FORMATS = ("csv", "sqlite")
+STRING_HEADERS = ["pack", "id", "offset", "length", "text_id"]
+TEXT_HEADERS = ["text_id", "String"]
+
+
+class MergedStringWriter(ABC):
+    """Stream the strings of many packs into one deduplicated table."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.pack_count = 0
+        self.string_count = 0
+        self.text_count = 0
+
+    def __enter__(self) -> "MergedStringWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def write_pack(self, pack: str, strings: list[StringResource]) -> None:
+        """Append the strings of one pack."""
+        if self.pack_count == 0:
+            self._open()
+        self._write(pack, strings)
+        self.pack_count += 1
+        self.string_count += len(strings)
+
+    def close(self) -> None:
+        """Flush and close the output."""
+
+    @abstractmethod
+    def _open(self) -> None:
+        """Create the output before the first pack is written."""
+
+    @abstractmethod
+    def _write(self, pack: str, strings: list[StringResource]) -> None:
+        """Write the rows of one pack."""
+
+
+class CsvStringWriter(MergedStringWriter):
+    """
+    Write string rows to ``<path>`` and distinct texts to ``<stem>_texts.csv``.
+
+    Text IDs are looked up by a 16-byte digest of each distinct text, so
+    memory grows with the number of distinct texts; the SQLite writer keeps
+    no such state.
+    """
+
+    def __init__(self, path: Path):
+        super().__init__(path)
+        self.texts_path = self.path.with_name(f"{self.path.stem}_texts.csv")
+        self._text_ids: dict[bytes, int] = {}
+        self._files: list[TextIO] = []
+        self._string_writer: Any = None
+        self._text_writer: Any = None
+
+    def close(self) -> None:
+        for file in self._files:
+            file.close()
+        self._files = []
+
+    def _open(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        string_file = self.path.open("w", newline="", encoding="utf-8")
+        text_file = self.texts_path.open("w", newline="", encoding="utf-8")
+        self._files = [string_file, text_file]
+        self._string_writer = csv.writer(string_file)
+        self._string_writer.writerow(STRING_HEADERS)
+        self._text_writer = csv.writer(text_file)
+        self._text_writer.writerow(TEXT_HEADERS)
+
+    def _write(self, pack: str, strings: list[StringResource]) -> None:
+        rows: list[tuple[object, ...]] = []
+        texts: list[tuple[int, str]] = []
+        for resource in strings:
+            digest = hashlib.blake2b(resource.text.encode("utf-8"), digest_size=16).digest()
+            text_id = self._text_ids.get(digest)
+            if text_id is None:
+                text_id = self._text_ids[digest] = len(self._text_ids)
+                texts.append((text_id, resource.text))
+            rows.append((pack, resource.resource_id, hex(resource.offset), resource.length, text_id))
+        self._string_writer.writerows(rows)
+        self._text_writer.writerows(texts)
+        self.text_count += len(texts)
+
+
+class SqliteStringWriter(MergedStringWriter):
+    """
+    Write a ``strings`` table keyed by ``(pack, resource_id)`` and a ``texts`` table.
+
+    Texts are deduplicated by a unique index, so memory use does not grow
+    with the number of packs or texts. The ``pack_strings`` view joins both.
+    """
+
+    CREATE_SQL = (
+        "CREATE TABLE texts (id INTEGER PRIMARY KEY, text TEXT NOT NULL UNIQUE)",
+        "CREATE TABLE strings ("
+        "pack TEXT NOT NULL, "
+        "resource_id INTEGER NOT NULL, "
+        "offset INTEGER NOT NULL, "
+        "length INTEGER NOT NULL, "
+        "text_id INTEGER NOT NULL REFERENCES texts (id), "
+        "PRIMARY KEY (pack, resource_id)) WITHOUT ROWID",
+        "CREATE INDEX strings_text_id ON strings (text_id)",
+        "CREATE VIEW pack_strings AS "
+        "SELECT pack, resource_id, offset, length, text FROM strings JOIN texts ON texts.id = strings.text_id",
+    )
+    INSERT_TEXT_SQL = "INSERT OR IGNORE INTO texts (text) VALUES (?)"
+    INSERT_STRING_SQL = "INSERT OR REPLACE INTO strings SELECT ?, ?, ?, ?, id FROM texts WHERE text = ?"
+
+    def __init__(self, path: Path):
+        super().__init__(path)
+        self._connection: sqlite3.Connection | None = None
+
+    def close(self) -> None:
+        if self._connection is None:
+            return
+
+        self._connection.commit()
+        self._connection.close()
+        self._connection = None
+
+    def _open(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.unlink(missing_ok=True)
+        self._connection = sqlite3.connect(self.path)
+        for statement in self.CREATE_SQL:
+            self._connection.execute(statement)
+        self._connection.commit()
+
+    def _write(self, pack: str, strings: list[StringResource]) -> None:
+        texts: list[tuple[str]] = []
+        rows: list[tuple[object, ...]] = []
+        for resource in strings:
+            texts.append((resource.text,))
+            rows.append((pack, resource.resource_id, resource.offset, resource.length, resource.text))
+        cursor = self._connection.executemany(self.INSERT_TEXT_SQL, texts)
+        self.text_count += cursor.rowcount
+        self._connection.executemany(self.INSERT_STRING_SQL, rows)
+        self._connection.commit()
+
+
+def open_string_writer(path: Path, merged_format: str | None = None) -> MergedStringWriter:
+    """
+    Create the merged string writer for ``path``.
+
+    Without ``merged_format``, a ``.sqlite`` or ``.db`` suffix selects SQLite
+    and anything else selects CSV.
+    """
+    path = Path(path).resolve()
+    if merged_format is None:
+        merged_format = "sqlite" if path.suffix.lower() in {".sqlite", ".db"} else "csv"
+    if merged_format == "csv":
+        return CsvStringWriter(path)
+    if merged_format == "sqlite":
+        return SqliteStringWriter(path)
+    raise ValueError(f"Unsupported merged string format: {merged_format}")
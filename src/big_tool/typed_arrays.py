@@ -0,0 +1,7 @@
+"""Type codes for the fixed-width ``array`` columns used across big-tool."""
+
+from array import array
+
+
+# Array type code for 32-bit unsigned integers on this platform.
+UINT32 = "I" if array("I").itemsize == 4 else "L"
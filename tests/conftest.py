@@ -0,0 +1,38 @@
+"""Shared fixtures built on the synthetic archive generator."""
+
+from pathlib import Path
+
+import pytest
+
+from big_tool.big_archive.big_format import BigArchive
+from big_tool.big_archive.synthetic import generate_package
+
+
+@pytest.fixture
+def package_dir(tmp_path: Path) -> Path:
+    """A small asset package with every synthetic resource type."""
+    directory = tmp_path / "package"
+    generate_package(directory, archive_count=3, entries_per_archive=40, payload_size=512)
+    return directory
+
+
+def read_payloads(archive_path: Path) -> dict[int, bytes]:
+    """Return the decompressed payload of every non-reference entry by index."""
+    payloads: dict[int, bytes] = {}
+    with BigArchive(archive_path) as archive:
+        archive.parse()
+        for entry in archive.entries:
+            if archive.read_entry_header(entry).is_ref:
+                continue
+            with archive.open_entry(entry.index) as reader:
+                payloads[entry.index] = reader.read()
+    return payloads
+
+
+def extracted_files(output_dir: Path) -> dict[str, bytes]:
+    """Return the contents of every extracted resource file by relative path."""
+    files: dict[str, bytes] = {}
+    for path in sorted(output_dir.rglob("*")):
+        if path.is_file() and path.parent.name.startswith("0x"):
+            files[path.relative_to(output_dir).as_posix()] = path.read_bytes()
+    return files
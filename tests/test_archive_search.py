@@ -0,0 +1,58 @@
+"""Typed searches inside archives."""
+
+import struct
+from pathlib import Path
+
+from big_tool.analysis import ArchiveSearchOptions, SearchOptions, search_archives
+from big_tool.big_archive.synthetic import BIN_GROUP, PNG_GROUP, SyntheticResource, write_archive
+
+
+def _write_search_archive(path: Path) -> Path:
+    values = bytes(16) + struct.pack("<i", -123456) + bytes(12) + struct.pack("<f", 2.5) + bytes(12)
+    resources = [
+        SyntheticResource(PNG_GROUP, b"\x89PNG\r\n\x1a\n" + bytes(64)),
+        SyntheticResource(BIN_GROUP, values, compressed=True),
+        SyntheticResource(BIN_GROUP, values, compressed=False),
+    ]
+    return write_archive(path, resources)
+
+
+def test_integer_search_finds_values_in_compressed_and_stored_entries(tmp_path: Path) -> None:
+    archive_path = _write_search_archive(tmp_path / "search.big")
+    options = SearchOptions("-123456", big_endian=False, value_type="int32")
+
+    results = search_archives(archive_path, options)
+
+    assert [(result.index, result.offsets) for result in results] == [(1, (16,)), (2, (16,))]
+
+
+def test_integer_range_search_respects_alignment(tmp_path: Path) -> None:
+    archive_path = _write_search_archive(tmp_path / "search.big")
+    options = SearchOptions("-123457..-123455", big_endian=False, value_type="int32", alignment=8)
+
+    results = search_archives(archive_path, options)
+
+    assert [result.offsets for result in results] == [(16,), (16,)]
+
+
+def test_float_search_with_tolerance_and_group_filter(tmp_path: Path) -> None:
+    archive_path = _write_search_archive(tmp_path / "search.big")
+    options = SearchOptions("2.501", big_endian=False, value_type="float32", tolerance=0.01)
+    archive_options = ArchiveSearchOptions(group_hashes=frozenset({BIN_GROUP}), resource_types=frozenset({"bin"}))
+
+    results = search_archives(archive_path, options, archive_options)
+
+    assert [(result.index, result.offsets) for result in results] == [(1, (32,)), (2, (32,))]
+    assert {result.resource_type for result in results} == {"bin"}
+
+
+def test_search_cache_serves_repeated_searches(package_dir: Path, tmp_path: Path) -> None:
+    options = SearchOptions("0x6d616e6966657374")
+    archive_options = ArchiveSearchOptions(cache_dir=tmp_path / "cache")
+
+    first = search_archives(package_dir, options, archive_options, jobs=2)
+    second = search_archives(package_dir, options, archive_options)
+
+    assert first
+    assert first == second
+    assert any((tmp_path / "cache").rglob("*.bin"))
@@ -0,0 +1,81 @@
+"""Archive summaries and layout checks from headers alone."""
+
+import json
+import struct
+from pathlib import Path
+
+import pytest
+
+from big_tool.big_archive.archive_stats import inspect_archive
+from big_tool.big_archive.big_format import BigArchive
+from big_tool.big_archive.synthetic import BIN_GROUP, MANIFEST_GROUP, SyntheticResource, write_archive
+from big_tool.cli import main
+
+
+def _issue_kinds(path: Path) -> list[str]:
+    return [issue.kind for issue in inspect_archive(path).issues]
+
+
+def test_synthetic_archive_totals_match_its_entries(package_dir: Path) -> None:
+    archive_path = package_dir / "synthetic_0.big"
+
+    stats = inspect_archive(archive_path)
+
+    assert stats.issues == []
+    assert stats.toc_count == stats.totals.entry_count == 40
+    assert stats.totals.ref_count == 4
+    assert stats.totals.block_size == stats.file_size - stats.data_offset
+    with BigArchive(archive_path) as archive:
+        archive.parse()
+        compressed = 0
+        for entry in archive.entries:
+            compressed += archive.read_entry_header(entry).is_compressed
+    assert stats.totals.compressed_count == compressed
+    assert sum(group.entry_count for group in stats.groups) == 40
+    manifest_group = next(group for group in stats.groups if group.group_hash == MANIFEST_GROUP)
+    assert manifest_group.name == "manifest"
+
+
+def test_gap_after_a_compressed_payload_is_reported(tmp_path: Path) -> None:
+    resources = [
+        SyntheticResource(BIN_GROUP, b"compressed" * 20, compressed=True),
+        SyntheticResource(BIN_GROUP, b"stored" * 20, compressed=False),
+    ]
+    path = write_archive(tmp_path / "a.big", resources)
+    data = bytearray(path.read_bytes())
+    first_offset = struct.unpack_from("<I", data, BigArchive.HEADER_SIZE + 4)[0]
+    compressed_size = struct.unpack_from("<I", data, first_offset + 8)[0]
+    struct.pack_into("<I", data, first_offset + 8, compressed_size - 3)
+    path.write_bytes(bytes(data))
+
+    issues = inspect_archive(path).issues
+
+    assert [(issue.kind, issue.size, issue.index) for issue in issues] == [("gap", 3, 0)]
+
+
+def test_wrong_header_sizes_are_reported(tmp_path: Path) -> None:
+    path = write_archive(tmp_path / "a.big", [SyntheticResource(BIN_GROUP, b"payload" * 10)])
+    data = bytearray(path.read_bytes())
+    struct.pack_into("<I", data, 28, 1)  # data_size
+    footer_offset = BigArchive.HEADER_SIZE + BigArchive.ENTRY_SIZE
+    struct.pack_into("<I", data, footer_offset + 4, len(data) + 4)
+    path.write_bytes(bytes(data))
+
+    assert sorted(_issue_kinds(path)) == ["data_size", "file_size"]
+
+
+def test_inspect_command_prints_json(package_dir: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    archive_path = package_dir / "synthetic_1.big"
+
+    assert main(["inspect", str(archive_path), "--json"]) == 0
+
+    document = json.loads(capsys.readouterr().out)
+    assert document["path"] == str(archive_path.resolve())
+    assert document["totals"]["entry_count"] == 40
+    assert 0 < document["totals"]["compression_ratio"] < 1
+
+
+def test_inspect_command_fails_on_a_malformed_archive(tmp_path: Path) -> None:
+    (tmp_path / "broken.big").write_bytes(b"FGIB")
+
+    assert main(["inspect", str(tmp_path)]) == 1
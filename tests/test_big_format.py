@@ -0,0 +1,101 @@
+"""Parsing the BIG table of contents into sorted typed columns."""
+
+import struct
+from pathlib import Path
+
+import pytest
+
+from big_tool.big_archive.big_format import ArchiveEntry, BigArchive, BigArchiveError
+
+
+def _raw_archive(path: Path, rows: list[tuple[int, int]], data_size: int, file_size: int | None = None) -> Path:
+    """Write a header, a TOC with ``rows`` in the given order, and zeroed data."""
+    toc_offset = BigArchive.HEADER_SIZE
+    data_offset = toc_offset + len(rows) * BigArchive.ENTRY_SIZE + BigArchive.FOOTER_SIZE
+    total_size = data_offset + data_size
+    header = struct.pack(
+        BigArchive.HEADER_FORMAT, b"FGIB", 1, 0, 0, 0, toc_offset, len(rows), data_offset, data_size
+    )
+    toc = b"".join(struct.pack(BigArchive.ENTRY_FORMAT, group_hash, offset) for group_hash, offset in rows)
+    footer = struct.pack("<II", 0, total_size if file_size is None else file_size)
+    path.write_bytes(header + toc + footer + bytes(data_size))
+    return path
+
+
+def _data_offset(row_count: int) -> int:
+    return BigArchive.HEADER_SIZE + row_count * BigArchive.ENTRY_SIZE + BigArchive.FOOTER_SIZE
+
+
+def test_toc_is_sorted_by_offset_with_sizes_from_the_next_offset(tmp_path: Path) -> None:
+    start = _data_offset(3)
+    rows = [(0xC, start + 40), (0xA, start), (0xB, start + 16)]
+    path = _raw_archive(tmp_path / "a.big", rows, data_size=100)
+
+    with BigArchive(path) as archive:
+        toc = archive.parse().entries
+
+    assert list(toc.group_hashes) == [0xA, 0xB, 0xC]
+    assert list(toc.offsets) == [start, start + 16, start + 40]
+    assert list(toc.sizes) == [16, 24, 60]
+    assert list(toc) == [
+        ArchiveEntry(0, 0xA, start, 16),
+        ArchiveEntry(1, 0xB, start + 16, 24),
+        ArchiveEntry(2, 0xC, start + 40, 60),
+    ]
+    assert toc[-1] == toc[2]
+    assert archive.get_entry_data_info(1) == (start + 16, 24)
+
+
+def test_toc_slices_keep_entry_indexes(tmp_path: Path) -> None:
+    start = _data_offset(4)
+    rows = [(hash_value, start + 8 * hash_value) for hash_value in range(4)]
+    path = _raw_archive(tmp_path / "a.big", rows, data_size=32)
+
+    with BigArchive(path) as archive:
+        toc = archive.parse().entries
+
+    tail = toc[2:]
+    assert len(tail) == 2
+    assert [entry.index for entry in tail] == [2, 3]
+    assert tail[0] == toc[2]
+    with pytest.raises(ValueError):
+        toc[::2]
+    with pytest.raises(IndexError):
+        toc[4]
+
+
+def test_toc_rows_that_share_an_offset_have_an_empty_first_block(tmp_path: Path) -> None:
+    start = _data_offset(2)
+    path = _raw_archive(tmp_path / "a.big", [(0x2, start), (0x1, start)], data_size=8)
+
+    with BigArchive(path) as archive:
+        toc = archive.parse().entries
+
+    assert sorted(toc.group_hashes) == [0x1, 0x2]
+    assert sorted(toc.sizes) == [0, 8]
+
+
+def test_offset_past_the_end_of_the_file_is_rejected(tmp_path: Path) -> None:
+    start = _data_offset(2)
+    path = _raw_archive(tmp_path / "a.big", [(0x1, start), (0x2, start + 1000)], data_size=8)
+
+    with BigArchive(path) as archive, pytest.raises(BigArchiveError, match="Invalid resource offset"):
+        archive.parse()
+
+
+def test_toc_count_past_the_end_of_the_file_is_rejected(tmp_path: Path) -> None:
+    path = _raw_archive(tmp_path / "a.big", [(0x1, _data_offset(1))], data_size=8)
+    data = bytearray(path.read_bytes())
+    struct.pack_into("<I", data, 20, 1000)  # toc_count
+    path.write_bytes(bytes(data))
+
+    with BigArchive(path) as archive, pytest.raises(BigArchiveError):
+        archive.parse()
+
+
+def test_truncated_header_is_rejected(tmp_path: Path) -> None:
+    path = tmp_path / "a.big"
+    path.write_bytes(b"FGIB")
+
+    with BigArchive(path) as archive, pytest.raises(BigArchiveError, match="too small"):
+        archive.parse()
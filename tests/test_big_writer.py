@@ -0,0 +1,163 @@
+"""Repacking and patching archives."""
+
+import bisect
+import struct
+from pathlib import Path
+
+from conftest import read_payloads
+
+from big_tool.big_archive.big_format import BigArchive
+from big_tool.big_archive.big_writer import patch_archive, repack_archive
+from big_tool.big_archive.synthetic import BIN_GROUP, PNG_GROUP, SyntheticResource, write_archive
+
+
+def _write_mixed_archive(path: Path) -> Path:
+    resources = [
+        SyntheticResource(PNG_GROUP, b"\x89PNG\r\n\x1a\n" + bytes(200), compressed=True),
+        SyntheticResource(BIN_GROUP, b"stored one" * 20, compressed=False),
+        SyntheticResource(BIN_GROUP, b"compressed two" * 20, compressed=True),
+        SyntheticResource(BIN_GROUP, b"compressed three" * 20, compressed=True),
+        SyntheticResource(BIN_GROUP, b"stored four" * 20, compressed=False),
+    ]
+    return write_archive(path, resources)
+
+
+def _write_aliased_archive(path: Path) -> Path:
+    """Write blocks for hashes 0x10-0x13, then point the row of 0x12 at the block of 0x11."""
+    resources = [
+        SyntheticResource(0x10, b"first" * 20, compressed=True),
+        SyntheticResource(0x11, b"shared" * 20, compressed=True),
+        SyntheticResource(0x12, b"dropped" * 20, compressed=True),
+        SyntheticResource(0x13, b"last" * 20, compressed=False),
+    ]
+    write_archive(path, resources)
+    data = bytearray(path.read_bytes())
+    rows = _raw_rows(bytes(data))
+    row = list(rows).index(0x12)
+    struct.pack_into("<I", data, BigArchive.HEADER_SIZE + row * BigArchive.ENTRY_SIZE + 4, rows[0x11])
+    path.write_bytes(bytes(data))
+    return path
+
+
+def _raw_rows(data: bytes) -> dict[int, int]:
+    """Return the stored offset of each group hash, in TOC row order."""
+    toc_count = struct.unpack_from("<I", data, 20)[0]
+    rows: dict[int, int] = {}
+    for row in range(toc_count):
+        group_hash, offset = struct.unpack_from("<II", data, BigArchive.HEADER_SIZE + row * BigArchive.ENTRY_SIZE)
+        rows[group_hash] = offset
+    return rows
+
+
+def _payloads_by_hash(path: Path) -> dict[int, bytes]:
+    """Return the payload of every row, reading a shared block through the entry that holds its size."""
+    payloads: dict[int, bytes] = {}
+    with BigArchive(path) as archive:
+        archive.parse()
+        for entry in archive.entries:
+            block_index = bisect.bisect_right(archive.entries.offsets, entry.offset) - 1
+            with archive.open_entry(block_index) as reader:
+                payloads[entry.group_hash] = reader.read()
+    return payloads
+
+
+def test_repack_without_replacements_copies_every_block(package_dir: Path, tmp_path: Path) -> None:
+    source = package_dir / "synthetic_0.big"
+
+    output = repack_archive(source, tmp_path / "copy.big", {})
+
+    assert output.read_bytes() == source.read_bytes()
+
+
+def test_repack_replaces_only_selected_entries(tmp_path: Path) -> None:
+    source = _write_mixed_archive(tmp_path / "source.big")
+    original = read_payloads(source)
+    replacements = {1: b"new stored payload", 3: b"new compressed payload" * 10}
+
+    output = repack_archive(source, tmp_path / "repacked.big", replacements)
+
+    expected = dict(original)
+    expected.update(replacements)
+    assert read_payloads(output) == expected
+    assert read_payloads(source) == original
+    with BigArchive(source) as before, BigArchive(output) as after:
+        before.parse()
+        after.parse()
+        for old_entry, new_entry in zip(before.entries, after.entries):
+            assert old_entry.group_hash == new_entry.group_hash
+            assert before.read_entry_header(old_entry).is_compressed == after.read_entry_header(new_entry).is_compressed
+
+
+def test_patch_appends_blocks_after_compressed_entries(tmp_path: Path) -> None:
+    archive_path = _write_mixed_archive(tmp_path / "patched.big")
+    original = read_payloads(archive_path)
+
+    moved = patch_archive(archive_path, {3: b"patched payload" * 10})
+
+    assert moved == [3]
+    payloads = read_payloads(archive_path)
+    expected = [original[0], original[1], original[2], original[4], b"patched payload" * 10]
+    assert sorted(payloads.values()) == sorted(expected)
+
+
+def test_patch_repacks_when_a_stored_block_would_absorb_the_old_slot(tmp_path: Path) -> None:
+    archive_path = _write_mixed_archive(tmp_path / "patched.big")
+    original = read_payloads(archive_path)
+
+    moved = patch_archive(archive_path, {2: b"patched payload"})
+
+    assert moved == []
+    expected = dict(original)
+    expected[2] = b"patched payload"
+    assert read_payloads(archive_path) == expected
+    assert not archive_path.with_name(f"{archive_path.name}.tmp").exists()
+
+
+def test_repack_keeps_rows_that_share_a_block_on_one_copy(tmp_path: Path) -> None:
+    source = _write_aliased_archive(tmp_path / "source.big")
+    original = _payloads_by_hash(source)
+
+    output = repack_archive(source, tmp_path / "copy.big", {})
+
+    assert output.read_bytes() == source.read_bytes()
+    assert _payloads_by_hash(output) == original
+    assert original[0x11] == original[0x12] == b"shared" * 20
+
+
+def _aliased_index(path: Path, group_hash: int) -> int:
+    with BigArchive(path) as archive:
+        archive.parse()
+        for entry in archive.entries:
+            if entry.group_hash == group_hash:
+                return entry.index
+    raise AssertionError(f"No entry with hash {group_hash:#x}")
+
+
+def test_repack_moves_only_the_replaced_row_of_a_shared_block(tmp_path: Path) -> None:
+    source = _write_aliased_archive(tmp_path / "source.big")
+    original = _payloads_by_hash(source)
+
+    for group_hash, other_hash in ((0x11, 0x12), (0x12, 0x11)):
+        index = _aliased_index(source, group_hash)
+        output = repack_archive(source, tmp_path / f"repacked_{group_hash:x}.big", {index: b"replaced" * 10})
+
+        expected = dict(original)
+        expected[group_hash] = b"replaced" * 10
+        assert _payloads_by_hash(output) == expected
+        rows = _raw_rows(output.read_bytes())
+        assert rows[group_hash] != rows[other_hash]
+
+
+def test_patch_moves_only_the_replaced_row_of_a_shared_block(tmp_path: Path) -> None:
+    for group_hash, other_hash in ((0x11, 0x12), (0x12, 0x11)):
+        archive_path = _write_aliased_archive(tmp_path / f"patched_{group_hash:x}.big")
+        original = _payloads_by_hash(archive_path)
+        shared_offset = _raw_rows(archive_path.read_bytes())[other_hash]
+
+        moved = patch_archive(archive_path, {_aliased_index(archive_path, group_hash): b"patched" * 10})
+
+        assert len(moved) == 1
+        expected = dict(original)
+        expected[group_hash] = b"patched" * 10
+        assert _payloads_by_hash(archive_path) == expected
+        assert _raw_rows(archive_path.read_bytes())[other_hash] == shared_offset
@@ -0,0 +1,72 @@
+"""The ls and cat commands."""
+
+from pathlib import Path
+
+import pytest
+
+from big_tool.big_archive.big_format import COMPRESSED_HEADER_SIZE, BigArchive
+from big_tool.big_archive.synthetic import BIN_GROUP, PNG_GROUP, SyntheticResource, write_archive
+from big_tool.cli import main
+
+
+PAYLOAD = b"compressed payload " * 64
+
+
+def _write_archive(path: Path) -> Path:
+    resources = [
+        SyntheticResource(PNG_GROUP, b"\x89PNG\r\n\x1a\n" + bytes(32), compressed=False),
+        SyntheticResource(BIN_GROUP, PAYLOAD, compressed=True),
+    ]
+    return write_archive(path, resources)
+
+
+def _corrupt_compressed_data(archive_path: Path) -> None:
+    with BigArchive(archive_path) as archive:
+        archive.parse()
+        entry = archive.entries[1]
+    data = bytearray(archive_path.read_bytes())
+    start = entry.offset + COMPRESSED_HEADER_SIZE
+    data[start:start + 16] = b"\xff" * 16
+    archive_path.write_bytes(bytes(data))
+
+
+def test_cat_writes_the_decompressed_payload(tmp_path: Path) -> None:
+    archive_path = _write_archive(tmp_path / "test.big")
+    output_path = tmp_path / "entry.bin"
+
+    assert main(["cat", str(archive_path), "1", "--output", str(output_path)]) == 0
+    assert output_path.read_bytes() == PAYLOAD
+
+
+def test_cat_reports_a_corrupt_entry_and_removes_the_partial_output(tmp_path: Path) -> None:
+    archive_path = _write_archive(tmp_path / "test.big")
+    _corrupt_compressed_data(archive_path)
+    output_path = tmp_path / "entry.bin"
+
+    assert main(["cat", str(archive_path), "1", "--output", str(output_path)]) == 1
+    assert not output_path.exists()
+
+
+def test_cat_rejects_an_index_outside_the_archive(tmp_path: Path) -> None:
+    archive_path = _write_archive(tmp_path / "test.big")
+
+    assert main(["cat", str(archive_path), "2", "--output", str(tmp_path / "entry.bin")]) == 1
+
+
+def test_ls_prints_only_the_listing_to_stdout(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    archive_path = _write_archive(tmp_path / "test.big")
+
+    assert main(["ls", str(archive_path)]) == 0
+
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].split() == ["index", "group", "offset", "size", "type"]
+    assert [line.split()[-1] for line in lines[1:]] == ["png", "bin"]
+
+
+@pytest.mark.parametrize("content", [None, b"FGIB" + bytes(8)])
+def test_ls_reports_missing_and_malformed_archives(tmp_path: Path, content: bytes | None) -> None:
+    archive_path = tmp_path / "broken.big"
+    if content is not None:
+        archive_path.write_bytes(content)
+
+    assert main(["ls", str(archive_path)]) == 1
@@ -0,0 +1,67 @@
+"""Extracting selected entries."""
+
+from pathlib import Path
+
+import pytest
+
+from big_tool.big_archive.big_extractor import EntryFilter, unpack_directory
+from big_tool.big_archive.big_format import ArchiveEntry
+from big_tool.big_archive.synthetic import PNG_GROUP, WAV_GROUP
+from big_tool.cli import main
+
+
+def _extracted_names(output_dir: Path) -> list[str]:
+    names: list[str] = []
+    for path in sorted((output_dir / "synthetic_0").rglob("*")):
+        if path.is_file() and path.parent.name.startswith("0x"):
+            names.append(path.name)
+    return names
+
+
+def _is_even(entry: ArchiveEntry) -> bool:
+    return entry.index % 2 == 0
+
+
+def test_group_filter_extracts_only_that_group(package_dir: Path, tmp_path: Path) -> None:
+    entry_filter = EntryFilter(group_hashes=frozenset({WAV_GROUP}))
+
+    results = unpack_directory(package_dir, tmp_path / "out", assume_yes=True, entry_filter=entry_filter)
+
+    assert [result.extracted_count for result in results] == [4, 4, 4]
+    assert {path.parent.name for path in (tmp_path / "out").rglob("*.wav")} == {hex(WAV_GROUP)}
+    assert not list((tmp_path / "out").rglob("*.png"))
+
+
+def test_type_and_index_filters_combine(package_dir: Path, tmp_path: Path) -> None:
+    entry_filter = EntryFilter(resource_types=frozenset({"png"}), index_ranges=((0, 15),))
+
+    unpack_directory(package_dir, tmp_path / "out", assume_yes=True, entry_filter=entry_filter)
+
+    names = _extracted_names(tmp_path / "out")
+    indexes = [name.split("_")[2] for name in names]
+    assert indexes == ["0000", "0001", "0010", "0011"]
+    assert all(name.endswith(".png") for name in names)
+
+
+def test_predicate_runs_in_a_serial_unpack(package_dir: Path, tmp_path: Path) -> None:
+    entry_filter = EntryFilter(group_hashes=frozenset({PNG_GROUP}), predicate=_is_even)
+
+    results = unpack_directory(package_dir, tmp_path / "out", assume_yes=True, entry_filter=entry_filter)
+
+    assert [result.extracted_count for result in results] == [4, 4, 4]
+
+
+def test_predicate_is_rejected_with_worker_processes(package_dir: Path, tmp_path: Path) -> None:
+    entry_filter = EntryFilter(predicate=_is_even)
+
+    with pytest.raises(ValueError, match="predicate"):
+        unpack_directory(package_dir, tmp_path / "out", assume_yes=True, jobs=2, entry_filter=entry_filter)
+
+
+def test_unpack_exits_non_zero_when_archives_fail(package_dir: Path, tmp_path: Path) -> None:
+    for archive_path in package_dir.glob("*.big"):
+        archive_path.write_bytes(b"FGIB" + bytes(8))
+
+    status = main(["unpack", str(package_dir), "--output", str(tmp_path / "out"), "--yes", "--jobs", "2"])
+
+    assert status == 1
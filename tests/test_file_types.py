@@ -0,0 +1,65 @@
+"""Resource type detection from payload signatures."""
+
+import random
+import struct
+
+import pytest
+
+from big_tool.big_archive.file_types import PEEK_SIZE, detect_signature
+from big_tool.big_archive.synthetic import MANIFEST_GROUP, build_binary, build_model, build_png, build_wav
+
+
+def _model_header(index_count: int, bone_names: list[bytes], frame_count: int, vertex_count: int) -> bytes:
+    header = struct.pack("<BIBHH", 1, index_count, len(bone_names), frame_count, vertex_count)
+    return header + b"".join(bytes([len(name)]) + name for name in bone_names)
+
+
+def test_magic_signatures_are_detected() -> None:
+    rng = random.Random(0)
+
+    assert detect_signature(build_png(64, rng)).name == "png"
+    assert detect_signature(build_wav(64, rng)).name == "wav"
+    assert detect_signature(b"RIFF\x00\x00\x00\x00WEBPVP8 ").name == "webp"
+    assert detect_signature(b"\x00\x00\x00\x18ftypmp42").name == "mp4"
+    assert detect_signature(b"plain text", MANIFEST_GROUP).extension == ".txt"
+
+
+@pytest.mark.parametrize("vertex_count", [4, 64, 300])
+def test_synthetic_models_are_detected(vertex_count: int) -> None:
+    data = build_model(random.Random(vertex_count), vertex_count, vertex_count * 3 // 2)
+
+    assert detect_signature(data).name == "model"
+    assert detect_signature(data[:PEEK_SIZE]).name == "model"
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_loose_binaries_are_not_models(seed: int) -> None:
+    data = build_binary(512, random.Random(seed))
+
+    assert detect_signature(data).name == "bin"
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        # Plausible counts with no bones and no body.
+        _model_header(5, [], 1, 1) + bytes(16),
+        # Bone names that run past the end of the data.
+        _model_header(3, [b"root"], 1, 4)[:-2],
+        # A whole header whose body is missing.
+        _model_header(3, [b"root"], 1, 4) + bytes(6),
+        # Indices that do not name a vertex.
+        _model_header(3, [b"root"], 1, 4) + struct.pack("<3H", 0, 1, 9) + bytes(4 * 8 + 4 + 28 + 4 * 12),
+        # A bone name that is not an identifier.
+        _model_header(3, [b"ro ot"], 1, 4) + bytes(2 * 3 + 4 * 8 + 4 + 28 + 4 * 12),
+    ],
+    ids=["no-bones", "truncated-names", "missing-body", "bad-index", "bad-name"],
+)
+def test_headers_without_a_complete_model_fall_back_to_bin(data: bytes) -> None:
+    assert detect_signature(data).name == "bin"
+
+
+def test_smallest_complete_model_is_detected() -> None:
+    data = _model_header(3, [b"root"], 1, 4) + struct.pack("<3H", 0, 1, 3) + bytes(4 * 8 + 4 + 28 + 4 * 12)
+
+    assert detect_signature(data).name == "model"
@@ -0,0 +1,65 @@
+"""Batch name hashing and recovering names from package hashes."""
+
+import itertools
+import json
+from pathlib import Path
+
+import pytest
+
+from big_tool.analysis.hash_cracker import crack_hashes, default_dictionary_path, expand_template
+from big_tool.analysis.hashing import cstring_to_key, cstring_to_keys
+from big_tool.cli import main
+
+
+NAMES = ["", "a", "ui/button.png", "UI/Button_Pressed.PNG", "sounds/loop_0012.wav", "café", "x" * 40]
+
+
+@pytest.mark.parametrize("ignore_case", [False, True])
+def test_batch_keys_match_single_keys(ignore_case: bool) -> None:
+    expected = [cstring_to_key(name, ignore_case) for name in NAMES]
+
+    assert cstring_to_keys(NAMES, ignore_case) == expected
+
+
+def test_expand_template_splits_literals_and_word_lists() -> None:
+    pieces = expand_template("ui/{word}_{n}.png{{x}}", {"word": ["ok", "cancel"], "n": ["0", "1"]})
+
+    names = {"".join(parts) for parts in itertools.product(*pieces)}
+    assert names == {"ui/ok_0.png{x}", "ui/ok_1.png{x}", "ui/cancel_0.png{x}", "ui/cancel_1.png{x}"}
+
+
+def test_expand_template_rejects_unknown_lists() -> None:
+    with pytest.raises(ValueError):
+        expand_template("{missing}.png", {})
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_crack_hashes_finds_every_matching_candidate(jobs: int) -> None:
+    words = [f"icon_{number}" for number in range(500)]
+    pieces = expand_template("ui/{word}/{size}.png", {"word": words, "size": ["small", "large"]})
+    wanted = ["ui/icon_7/small.png", "ui/icon_499/large.png"]
+    targets = {cstring_to_key(name) for name in wanted}
+
+    found = crack_hashes([pieces], targets, jobs=jobs)
+
+    names = set()
+    for key, matches in found.items():
+        assert key in targets
+        names.update(matches)
+    assert set(wanted) <= names
+
+
+def test_crack_hashes_command_writes_the_dictionary_next_to_the_input(package_dir: Path, tmp_path: Path) -> None:
+    words = tmp_path / "words.txt"
+    words.write_text("alpha\nbeta\n", encoding="utf-8")
+    before = sorted(path.name for path in package_dir.iterdir())
+    key = cstring_to_key("sfx/beta.wav")
+    arguments = ["crack-hashes", str(package_dir), "--words", str(words), "--template", "sfx/{word}.wav"]
+
+    assert main(arguments + ["--hash", hex(key)]) == 0
+
+    assert sorted(path.name for path in package_dir.iterdir()) == before
+    dictionary_path = default_dictionary_path(package_dir)
+    assert dictionary_path.parent == package_dir.parent / "package_out"
+    hashes = json.loads(dictionary_path.read_text(encoding="utf-8"))["hashes"]
+    assert hashes[f"0x{key:08x}"] == ["sfx/beta.wav"]
@@ -0,0 +1,83 @@
+"""CSV and SQLite resource manifests."""
+
+import csv
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+import pytest
+
+from big_tool.big_archive.big_extractor import unpack_directory
+from big_tool.big_archive.manifest import SqliteManifestWriter, manifest_path, open_manifest_writer
+
+
+def _csv_rows(path: Path) -> list[dict[str, str]]:
+    with path.open(newline="", encoding="utf-8-sig") as file:
+        return list(csv.DictReader(file))
+
+
+def _sqlite_rows(path: Path) -> list[sqlite3.Row]:
+    with closing(sqlite3.connect(path)) as connection:
+        connection.row_factory = sqlite3.Row
+        return connection.execute("SELECT * FROM resources ORDER BY id").fetchall()
+
+
+def _row(index: int) -> dict[str, object]:
+    return {
+        "id": index,
+        "section": "main",
+        "sub_group": "0x00000001",
+        "type": "bin",
+        "Offset": hex(0x100 + 16 * index),
+        "compressed?": "F",
+        "compressed size": 0,
+        "original size": 12,
+        "error": "",
+    }
+
+
+@pytest.mark.parametrize("dedup", [False, True])
+def test_sqlite_manifest_matches_the_csv_manifest(package_dir: Path, tmp_path: Path, dedup: bool) -> None:
+    csv_results = unpack_directory(package_dir, tmp_path / "csv", assume_yes=True, dedup=dedup)
+    sqlite_results = unpack_directory(
+        package_dir, tmp_path / "sqlite", assume_yes=True, manifest_format="sqlite", dedup=dedup
+    )
+
+    for csv_result, sqlite_result in zip(csv_results, sqlite_results):
+        expected = _csv_rows(manifest_path("csv", csv_result.output_dir, csv_result.archive))
+        rows = _sqlite_rows(manifest_path("sqlite", sqlite_result.output_dir, sqlite_result.archive))
+        assert len(rows) == len(expected) == 40
+        for row, expected_row in zip(rows, expected):
+            assert row["archive"] == sqlite_result.archive.name
+            assert str(row["id"]) == expected_row["id"]
+            assert row["sub_group"] == expected_row["sub_group"]
+            assert row["type"] == expected_row["type"]
+            assert row["offset"] == int(expected_row["Offset"], 16)
+            assert str(row["original_size"]) == expected_row["original size"]
+            assert (row["deduplicated"] is not None) == dedup
+
+
+def test_sqlite_manifest_flushes_every_batch(tmp_path: Path) -> None:
+    path = tmp_path / "a_resources.sqlite"
+    row_count = SqliteManifestWriter.BATCH_SIZE * 2 + 7
+
+    with SqliteManifestWriter(path, "a.big") as writer:
+        for index in range(row_count):
+            writer.write_row(_row(index))
+
+    rows = _sqlite_rows(path)
+    assert len(rows) == writer.row_count == row_count
+    assert rows[-1]["offset"] == 0x100 + 16 * (row_count - 1)
+
+
+@pytest.mark.parametrize("manifest_format", ["csv", "sqlite"])
+def test_manifest_without_rows_leaves_no_file(tmp_path: Path, manifest_format: str) -> None:
+    with open_manifest_writer(manifest_format, tmp_path, tmp_path / "empty.big") as writer:
+        pass
+
+    assert not writer.path.exists()
+
+
+def test_unknown_manifest_format_is_rejected(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="Unsupported manifest format"):
+        open_manifest_writer("json", tmp_path, tmp_path / "a.big")
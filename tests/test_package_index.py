@@ -0,0 +1,68 @@
+"""Building, updating, and querying the package index."""
+
+import os
+from pathlib import Path
+
+from big_tool.big_archive.package_index import EntryQuery, PackageIndex, default_index_path
+from big_tool.big_archive.synthetic import PNG_GROUP, STRING_PACK_GROUP
+from big_tool.cli import main
+
+
+def test_index_command_leaves_the_input_directory_unchanged(package_dir: Path) -> None:
+    before = sorted(path.name for path in package_dir.iterdir())
+
+    assert main(["index", str(package_dir)]) == 0
+
+    assert sorted(path.name for path in package_dir.iterdir()) == before
+    assert default_index_path(package_dir) == package_dir.parent / "package_out" / "big_tool_index.sqlite"
+    assert default_index_path(package_dir).is_file()
+    assert main(["query", str(package_dir), "--type", "png", "--limit", "1"]) == 0
+
+
+def test_query_filters_by_group_type_archive_and_size(package_dir: Path, tmp_path: Path) -> None:
+    with PackageIndex(tmp_path / "index.sqlite") as index:
+        update = index.update(package_dir)
+        assert (update.indexed_archives, update.entry_count) == (3, 120)
+
+        pngs = index.query(EntryQuery(group_hash=PNG_GROUP, archive="synthetic_1.big"))
+        assert len(pngs) == 8
+        assert {entry.resource_type for entry in pngs} == {"png"}
+
+        packs = index.query(EntryQuery(resource_type="string_pack", min_size=1))
+        assert {entry.group_hash for entry in packs} == {STRING_PACK_GROUP}
+        assert all(entry.original_size >= 1 for entry in packs)
+
+        first = pngs[0]
+        same_block = index.query(EntryQuery(block_digest=first.block_digest))
+        assert first in same_block
+        assert index.query(EntryQuery(limit=5)) == index.query(EntryQuery())[:5]
+
+
+def test_update_reads_only_changed_archives_and_drops_removed_ones(package_dir: Path, tmp_path: Path) -> None:
+    with PackageIndex(tmp_path / "index.sqlite") as index:
+        index.update(package_dir)
+        changed = package_dir / "synthetic_0.big"
+        stat = changed.stat()
+        os.utime(changed, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        (package_dir / "synthetic_2.big").unlink()
+
+        update = index.update(package_dir, jobs=2)
+
+        assert (update.indexed_archives, update.unchanged_archives, update.removed_archives) == (1, 1, 1)
+        archives = {entry.archive for entry in index.query(EntryQuery())}
+        assert archives == {"synthetic_0.big", "synthetic_1.big"}
+
+
+def test_update_retries_archives_that_failed_to_index(package_dir: Path, tmp_path: Path) -> None:
+    broken = package_dir / "synthetic_1.big"
+    original = broken.read_bytes()
+    broken.write_bytes(original[:16] + b"\xff\xff\xff\xff" + original[20:])
+    stat = broken.stat()
+    with PackageIndex(tmp_path / "index.sqlite") as index:
+        assert index.update(package_dir).entry_count == 80
+
+        broken.write_bytes(original)
+        os.utime(broken, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        update = index.update(package_dir)
+
+        assert (update.indexed_archives, update.entry_count) == (1, 40)
@@ -0,0 +1,74 @@
+"""Searching files for many byte patterns in one pass."""
+
+import random
+from pathlib import Path
+
+import pytest
+
+from big_tool.analysis import search
+from big_tool.analysis.search import SearchOptions, find_patterns, parse_value_patterns, search_path
+
+
+def _naive_matches(data: bytes, patterns: list[bytes]) -> list[tuple[int, bytes]]:
+    matches: list[tuple[int, bytes]] = []
+    for pattern in set(patterns):
+        offset = data.find(pattern)
+        while offset != -1:
+            matches.append((offset, pattern))
+            offset = data.find(pattern, offset + 1)
+    return sorted(matches)
+
+
+@pytest.mark.parametrize("pattern_count", [3, search.MULTI_PATTERN_THRESHOLD + 10])
+def test_find_patterns_matches_a_naive_search_across_windows(
+    monkeypatch: pytest.MonkeyPatch, pattern_count: int
+) -> None:
+    monkeypatch.setattr(search, "SCAN_WINDOW_SIZE", 64)
+    rng = random.Random(pattern_count)
+    data = bytearray(rng.randbytes(2000))
+    patterns = [rng.randbytes(4) for _ in range(pattern_count)] + [b"\xab\xcd", b"longer pattern"]
+    for pattern in patterns:
+        for _ in range(3):
+            position = rng.randrange(len(data) - len(pattern))
+            data[position:position + len(pattern)] = pattern
+    # A match that straddles the first window boundary.
+    data[62:76] = b"longer pattern"
+
+    assert find_patterns(bytes(data), patterns) == _naive_matches(bytes(data), patterns)
+
+
+def test_find_patterns_first_only_returns_the_earliest_match(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(search, "SCAN_WINDOW_SIZE", 16)
+    data = bytes(40) + b"late" + bytes(10) + b"early"
+
+    assert find_patterns(data, [b"early", b"late"], first_only=True) == [(40, b"late")]
+
+
+def test_value_patterns_cover_both_byte_orders_and_widths() -> None:
+    patterns = parse_value_patterns("0x1234", both_endian=True, all_widths=True)
+
+    assert sorted(patterns) == sorted(
+        [
+            b"\x12\x34",
+            b"\x34\x12",
+            b"\x00\x00\x12\x34",
+            b"\x34\x12\x00\x00",
+            b"\x00\x00\x00\x00\x00\x00\x12\x34",
+            b"\x34\x12\x00\x00\x00\x00\x00\x00",
+        ]
+    )
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_search_path_reports_which_value_matched(tmp_path: Path, jobs: int) -> None:
+    (tmp_path / "a.bin").write_bytes(b"\x00\x11\x22" + b"\x33\x44" + bytes(4))
+    (tmp_path / "b.bin").write_bytes(bytes(5) + b"\x33\x44")
+    (tmp_path / "c.bin").write_bytes(bytes(8))
+    options = SearchOptions(["0x1122", "0x3344"], file_extension=".bin")
+
+    results = search_path(tmp_path, options, jobs=jobs)
+
+    assert [(result.path.name, result.offsets, result.patterns) for result in results] == [
+        ("a.bin", (1, 3), (b"\x11\x22", b"\x33\x44")),
+        ("b.bin", (5,), (b"\x33\x44",)),
+    ]
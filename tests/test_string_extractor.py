@@ -0,0 +1,127 @@
+"""Parsing string packs of every header variant."""
+
+import struct
+from pathlib import Path
+
+import pytest
+
+from big_tool.big_archive.file_types import detect_signature
+from big_tool.big_archive.synthetic import STRING_RESOURCE_TYPE, build_string_pack
+from big_tool.resources.string_extractor import ResourceStringExtractor
+
+
+def _baseline_strings(data: bytes) -> list[tuple[int, int, int, str]]:
+    """The per-string 00a0 parser that shipped before bulk parsing."""
+    count = struct.unpack_from("<H", data, 2)[0]
+    offsets = [struct.unpack_from("<H", data, 6)[0]]
+    for position in range(8, 8 + 2 * count, 2):
+        offsets.append(struct.unpack_from("<H", data, position)[0])
+    current = 8 + 2 * count + 2 + 4 * count
+    strings: list[tuple[int, int, int, str]] = []
+    for resource_id in range(count):
+        following = offsets[resource_id + 1]
+        body = data[current:following][4:]
+        if body.endswith(b"\x00"):
+            body = body[:-1]
+        text = body.decode("utf-8", errors="replace").replace("\n", "\\n")
+        strings.append((resource_id, current, len(body), text))
+        current = following
+    return strings
+
+
+def _parsed(data: bytes) -> list[tuple[int, int, int, str]]:
+    parsed: list[tuple[int, int, int, str]] = []
+    for resource in ResourceStringExtractor(Path("pack.bin")).parse(data):
+        parsed.append((resource.resource_id, resource.offset, resource.length, resource.text))
+    return parsed
+
+
+def _blocks(bodies: list[bytes]) -> list[bytes]:
+    blocks: list[bytes] = []
+    for body in bodies:
+        blocks.append(b"\x00\x00\x00\x00" + body)
+    return blocks
+
+
+def _pack(flags: int, blocks: list[bytes], first_id: int = 0, entry_ids: list[int] | None = None) -> bytes:
+    """Build a pack laid out as string_pack.bt describes, with nonzero reserved words."""
+    count = len(blocks)
+    if flags == 0x20:
+        table_size = 4 * count
+    elif flags == 0xE0:
+        table_size = 2 + 4 * count
+    else:
+        table_size = 2 + 2 * count
+    position = 4 + table_size + 4 + 4 * count
+    starts: list[int] = []
+    for block in blocks:
+        starts.append(position)
+        position += len(block)
+
+    table = b""
+    for number, start in enumerate(starts):
+        if flags == 0x20:
+            table += struct.pack("<HH", entry_ids[number], start)
+        elif flags == 0xE0:
+            table += struct.pack("<HH", start, 0xBEEF)
+        else:
+            table += struct.pack("<H", start)
+    if flags != 0x20:
+        table = struct.pack("<H", first_id) + table
+    types = struct.pack(f"<{count}I", *([STRING_RESOURCE_TYPE] * count))
+    header = bytes([0, flags]) + struct.pack("<H", count)
+    return header + table + struct.pack("<HH", position, 0) + types + b"".join(blocks)
+
+
+BASELINE_CASES = {
+    "synthetic": build_string_pack(["Alpha", "", "Line one\nLine two", "Ünïcödé ✓"]),
+    "missing terminator": _pack(0xA0, _blocks([b"first\x00", b"no terminator", b"last\x00"])),
+    "short block": _pack(0xA0, [b"\x01\x02", b"\x00\x00\x00\x00ok\x00"]),
+    "embedded null": _pack(0xA0, _blocks([b"split\x00here\x00", b"\xff\xfe invalid\x00"])),
+    "truncated": _pack(0xA0, _blocks([b"complete\x00", b"cut off here\x00"]))[:-5],
+}
+
+
+@pytest.mark.parametrize("data", BASELINE_CASES.values(), ids=BASELINE_CASES.keys())
+def test_00a0_output_matches_the_baseline_parser(data: bytes) -> None:
+    assert _parsed(data) == _baseline_strings(data)
+
+
+def test_00a0_first_string_starts_after_the_type_table_whatever_the_first_offset() -> None:
+    data = bytearray(build_string_pack(["first", "second"]))
+    struct.pack_into("<H", data, 6, 4)
+
+    assert _parsed(bytes(data)) == _baseline_strings(bytes(data))
+
+
+def test_00a0_ids_start_at_the_first_id() -> None:
+    data = _pack(0xA0, _blocks([b"one\x00", b"two\x00"]), first_id=0x100)
+
+    assert [resource[0] for resource in _parsed(data)] == [0x100, 0x101]
+
+
+def test_00e0_reads_16_bit_offsets_and_skips_the_reserved_words() -> None:
+    data = _pack(0xE0, _blocks([b"wide one\x00", b"wide two\x00"]), first_id=7)
+
+    assert [(resource[0], resource[3]) for resource in _parsed(data)] == [(7, "wide one"), (8, "wide two")]
+
+
+def test_0020_uses_explicit_entry_ids() -> None:
+    data = _pack(0x20, _blocks([b"left\x00", b"right\x00"]), entry_ids=[0x30, 0x12])
+
+    assert [(resource[0], resource[3]) for resource in _parsed(data)] == [(0x30, "left"), (0x12, "right")]
+
+
+@pytest.mark.parametrize("flags", [0x20, 0xA0, 0xE0])
+def test_every_variant_is_detected_as_a_string_pack(flags: int) -> None:
+    data = _pack(flags, _blocks([b"detected\x00"]), entry_ids=[1])
+
+    assert detect_signature(data).name == "string_pack"
+
+
+def test_unknown_variants_are_rejected() -> None:
+    data = bytearray(build_string_pack(["text"]))
+    data[1] = 0x60
+
+    with pytest.raises(ValueError, match="signature"):
+        _parsed(bytes(data))
@@ -0,0 +1,66 @@
+"""Updating and searching the string index."""
+
+import os
+from pathlib import Path
+
+from big_tool.big_archive.synthetic import build_string_pack
+from big_tool.resources.string_extractor import extract_strings_from_directory
+from big_tool.resources.string_index import StringIndex
+from big_tool.resources.string_resource import StringResource
+
+
+def _texts(index: StringIndex, query: str, mode: str = "substring") -> list[tuple[str, str]]:
+    matches = []
+    for match in index.search(query, mode):
+        matches.append((match.pack, match.text))
+    return matches
+
+
+def test_store_pack_replaces_earlier_strings(tmp_path: Path) -> None:
+    with StringIndex(tmp_path / "strings.sqlite") as index:
+        index.store_pack("a.bin", 10, 1, [StringResource(1, 0, 5, "Hello World"), StringResource(2, 5, 5, "Goodbye")])
+        index.commit()
+        assert _texts(index, "world", "word") == [("a.bin", "Hello World")]
+
+        index.store_pack("a.bin", 12, 2, [StringResource(1, 0, 6, "Hello There")])
+        index.commit()
+
+        assert _texts(index, "world", "word") == []
+        assert _texts(index, "good") == []
+        assert _texts(index, "hello th", "prefix") == [("a.bin", "Hello There")]
+        assert index.pack_stats() == {"a.bin": (12, 2)}
+
+
+def test_remove_packs_drops_strings_and_terms(tmp_path: Path) -> None:
+    with StringIndex(tmp_path / "strings.sqlite") as index:
+        index.store_pack("a.bin", 10, 1, [StringResource(1, 0, 5, "shared text")])
+        index.store_pack("b.bin", 10, 1, [StringResource(1, 0, 5, "shared words")])
+        index.commit()
+
+        assert index.remove_packs(["a.bin", "missing.bin"]) == 1
+        index.commit()
+
+        assert _texts(index, "shared") == [("b.bin", "shared words")]
+        assert list(index.pack_stats()) == ["b.bin"]
+
+
+def test_directory_update_reindexes_changed_and_removes_missing_packs(tmp_path: Path) -> None:
+    root = tmp_path / "strings"
+    root.mkdir()
+    index_path = tmp_path / "strings.sqlite"
+    (root / "kept.bin").write_bytes(build_string_pack(["Unchanged entry"]))
+    (root / "changed.bin").write_bytes(build_string_pack(["Old caption"]))
+    (root / "removed.bin").write_bytes(build_string_pack(["Removed caption"]))
+    extract_strings_from_directory(root, index_path=index_path)
+
+    changed = root / "changed.bin"
+    changed.write_bytes(build_string_pack(["New caption", "Second line"]))
+    stat = changed.stat()
+    os.utime(changed, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    (root / "removed.bin").unlink()
+    extract_strings_from_directory(root, jobs=2, index_path=index_path)
+
+    with StringIndex(index_path) as index:
+        assert _texts(index, "caption", "word") == [("changed.bin", "New caption")]
+        assert _texts(index, "unchanged", "word") == [("kept.bin", "Unchanged entry")]
+        assert sorted(index.pack_stats()) == ["changed.bin", "kept.bin"]
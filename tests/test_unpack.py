@@ -0,0 +1,144 @@
+"""Unpacking packages serially, in parallel, and incrementally."""
+
+import csv
+import os
+import re
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+import pytest
+from conftest import extracted_files, read_payloads
+
+from big_tool.big_archive.big_extractor import unpack_directory
+from big_tool.big_archive.big_format import BigArchive
+from big_tool.big_archive.big_writer import patch_archive
+
+
+_INDEX_PATTERN = re.compile(r"_(\d{4})_0x[0-9a-f]+\.\w+$")
+
+
+def _files_by_index(output_dir: Path, archive_path: Path) -> dict[int, bytes]:
+    files: dict[int, bytes] = {}
+    for path in (output_dir / archive_path.stem).rglob("*"):
+        match = _INDEX_PATTERN.search(path.name)
+        if match is not None:
+            files[int(match.group(1))] = path.read_bytes()
+    return files
+
+
+def _assert_payloads_extracted(package_dir: Path, output_dir: Path) -> None:
+    for archive_path in sorted(package_dir.glob("*.big")):
+        files = _files_by_index(output_dir, archive_path)
+        for index, payload in read_payloads(archive_path).items():
+            assert files[index] == payload, f"{archive_path.name} entry {index}"
+
+
+@pytest.mark.parametrize(("jobs", "threads"), [(1, 1), (2, 1), (1, 2)])
+def test_unpack_round_trip(package_dir: Path, tmp_path: Path, jobs: int, threads: int) -> None:
+    output_dir = tmp_path / "out"
+    results = unpack_directory(package_dir, output_dir, assume_yes=True, jobs=jobs, threads=threads)
+
+    assert [result.archive.name for result in results] == ["synthetic_0.big", "synthetic_1.big", "synthetic_2.big"]
+    for result in results:
+        assert result.failed_count == 0
+        assert result.extracted_count == 40
+    _assert_payloads_extracted(package_dir, output_dir)
+
+
+def test_parallel_unpack_matches_serial(package_dir: Path, tmp_path: Path) -> None:
+    unpack_directory(package_dir, tmp_path / "serial", assume_yes=True)
+    unpack_directory(package_dir, tmp_path / "parallel", assume_yes=True, jobs=2, threads=2, use_mmap=True)
+
+    assert extracted_files(tmp_path / "serial") == extracted_files(tmp_path / "parallel")
+
+
+def test_incremental_rerun_keeps_unchanged_archives(package_dir: Path, tmp_path: Path) -> None:
+    output_dir = tmp_path / "out"
+    unpack_directory(package_dir, output_dir, incremental=True)
+    first = extracted_files(output_dir)
+
+    results = unpack_directory(package_dir, output_dir, incremental=True)
+
+    assert len(results) == 3
+    for result in results:
+        assert result.extracted_count == 0
+    assert extracted_files(output_dir) == first
+
+
+def test_incremental_rewrites_changed_resources(package_dir: Path, tmp_path: Path) -> None:
+    output_dir = tmp_path / "out"
+    unpack_directory(package_dir, output_dir, incremental=True)
+    archive_path = package_dir / "synthetic_1.big"
+    with BigArchive(archive_path) as archive:
+        archive.parse()
+        compressed = []
+        for entry in archive.entries:
+            header = archive.read_entry_header(entry)
+            if header.is_compressed and not header.is_ref:
+                compressed.append(entry.index)
+    patch_archive(archive_path, {compressed[-1]: b"changed payload"})
+    _touch(archive_path)
+
+    results = unpack_directory(package_dir, output_dir, incremental=True)
+
+    changed = {result.archive.name: result for result in results}["synthetic_1.big"]
+    assert changed.failed_count == 0
+    assert changed.skipped_count > 0
+    _assert_payloads_extracted(package_dir, output_dir)
+
+
+@pytest.mark.parametrize(("first_dedup", "second_dedup"), [(True, False), (False, True)])
+def test_incremental_switching_dedup(
+    package_dir: Path,
+    tmp_path: Path,
+    first_dedup: bool,
+    second_dedup: bool,
+) -> None:
+    output_dir = tmp_path / "out"
+    unpack_directory(package_dir, output_dir, incremental=True, dedup=first_dedup)
+    for archive_path in package_dir.glob("*.big"):
+        _touch(archive_path)
+
+    results = unpack_directory(package_dir, output_dir, incremental=True, dedup=second_dedup)
+
+    assert len(results) == 3
+    for result in results:
+        assert result.failed_count == 0
+        with (result.output_dir / f"{result.archive.stem}_resources.csv").open(newline="", encoding="utf-8") as file:
+            rows = list(csv.DictReader(file))
+        assert len(rows) == 40
+        assert ("blob" in rows[0]) == second_dedup
+    _assert_payloads_extracted(package_dir, output_dir)
+
+
+def _touch(path: Path) -> None:
+    """Move the modification time forward so incremental runs read the archive again."""
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_incremental_restores_deleted_outputs(package_dir: Path, tmp_path: Path) -> None:
+    output_dir = tmp_path / "out"
+    unpack_directory(package_dir, output_dir, incremental=True)
+    deleted = sorted((output_dir / "synthetic_0").rglob("*.png"))[0]
+    deleted.unlink()
+
+    results = unpack_directory(package_dir, output_dir, incremental=True)
+
+    assert deleted.is_file()
+    assert [result.extracted_count for result in results] == [1, 0, 0]
+    _assert_payloads_extracted(package_dir, output_dir)
+
+
+def test_incremental_writes_a_manifest_in_the_new_format(package_dir: Path, tmp_path: Path) -> None:
+    output_dir = tmp_path / "out"
+    unpack_directory(package_dir, output_dir, incremental=True)
+
+    results = unpack_directory(package_dir, output_dir, incremental=True, manifest_format="sqlite")
+
+    for result in results:
+        assert result.extracted_count == 0
+        manifest = result.output_dir / f"{result.archive.stem}_resources.sqlite"
+        with closing(sqlite3.connect(manifest)) as connection:
+            assert connection.execute("SELECT COUNT(*) FROM resources").fetchone()[0] == 40